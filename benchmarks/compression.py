@@ -0,0 +1,47 @@
+"""Compare the per-packet compression cost with the default zlib settings and with a small window and memlevel.
+
+Each compressed packet uses a new zlib compressor, the setup of which (allocating and initializing it's internal
+state) scales with the window size and the memlevel. For small packets, this setup is a part of the cost.
+
+Run with ``poetry run python benchmarks/compression.py`` (mcproto needs to be installed).
+"""
+from __future__ import annotations
+
+import os
+import timeit
+from collections.abc import Callable
+
+from mcproto.packets.compression import PacketCompressor
+
+# Packet payloads of various sizes, half random (incompressible) and half repetitive data
+SIZES = [64, 256, 1024, 16 * 1024, 256 * 1024]
+LEVEL = 6
+SMALL_WBITS = 10
+SMALL_MEMLEVEL = 4
+
+
+def _payload(size: int) -> bytes:
+    return os.urandom(size // 2) + b"minecraft" * (size // 18) + bytes(size - size // 2 - 9 * (size // 18))
+
+
+def _time(func: Callable[[], object], number: int) -> float:
+    """Best average time of a single call out of a few repeats, in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    default = PacketCompressor(0, level=LEVEL)
+    small = PacketCompressor(0, level=LEVEL, wbits=SMALL_WBITS, memlevel=SMALL_MEMLEVEL)
+
+    print(f"{'size':>8} | {'default':>16} | {'small window':>16} | {'speedup':>7}")
+    for size in SIZES:
+        data = _payload(size)
+        number = max(10, 2_000_000 // size)
+
+        default_time = _time(lambda: default.compress(data), number)  # noqa: B023
+        small_time = _time(lambda: small.compress(data), number)  # noqa: B023
+        print(f"{size:>8} | {default_time:>13.2f} us | {small_time:>13.2f} us | {default_time / small_time:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Measure the AES/CFB8 throughput (in MB/s, on a single core) of each installed cipher backend.
+
+The data is ciphered both in big batches (as done by the encrypted connections, which cipher whole read-ahead
+and write buffers at once) and in small chunks (as it would be if each small read was ciphered separately).
+
+Run with ``poetry run python benchmarks/encryption.py`` (mcproto needs to be installed).
+"""
+from __future__ import annotations
+
+import os
+import timeit
+
+from mcproto.encryption import CIPHER_BACKENDS
+
+TOTAL_SIZE = 4 * 1024 * 1024
+CHUNK_SIZES = [65536, 1024, 16, 4]
+
+
+def main() -> None:
+    secret = os.urandom(16)
+    data = os.urandom(TOTAL_SIZE)
+
+    print(f"{'backend':>14} | {'chunk size':>10} | {'throughput':>12}")
+    for name, factory in CIPHER_BACKENDS.items():
+        try:
+            encrypt, _ = factory(secret, secret)
+        except ImportError:
+            print(f"{name:>14} | {'not installed':>10}")
+            continue
+
+        for chunk_size in CHUNK_SIZES:
+            # Use less data for the small chunks, as they're really slow
+            size = min(TOTAL_SIZE, chunk_size * 65536)
+            chunks = [data[i : i + chunk_size] for i in range(0, size, chunk_size)]
+
+            def run() -> None:
+                for chunk in chunks:  # noqa: B023
+                    encrypt(chunk)  # noqa: B023
+
+            elapsed = min(timeit.repeat(run, number=1, repeat=3))
+            print(f"{name:>14} | {chunk_size:>10} | {size / elapsed / 1e6:>7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Measure the packet construction and deserialization rate, compared to a plain slotted class.
+
+Packets are constructed for every deserialized packet, so the overhead of the packet class instantiation
+(over the plain slotted object) directly limits the packet reading throughput.
+
+Run with ``poetry run python benchmarks/packet_construction.py`` (mcproto needs to be installed).
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from mcproto.buffer import Buffer
+from mcproto.packets.status.ping import PingPong
+
+PACKETS = 1_000_000
+REPEAT = 5
+
+
+class PlainPingPong:
+    """Plain slotted class, with the same initialization as :class:`PingPong`, used as a baseline."""
+
+    __slots__ = ("payload",)
+
+    def __init__(self, payload: int):
+        self.payload = payload
+
+
+def _construct(packet_class: Callable[[int], object]) -> None:
+    for i in range(PACKETS):
+        packet_class(i)
+
+
+def _deserialize(data: Buffer) -> None:
+    deserialize = PingPong.deserialize
+    for _ in range(PACKETS):
+        data.pos = 0
+        deserialize(data)
+
+
+def _measure(func: Callable[[], None]) -> float:
+    """Best packets per second rate out of a few repeats."""
+    best = 0.0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = max(best, PACKETS / (time.perf_counter() - start))
+    return best
+
+
+def main() -> None:
+    data = PingPong(123).serialize()
+
+    plain = _measure(lambda: _construct(PlainPingPong))
+    packet = _measure(lambda: _construct(PingPong))
+    deserialize = _measure(lambda: _deserialize(data))
+
+    print(f"Plain slotted object: {plain:>12,.0f} objects/s")
+    print(f"Packet construction:  {packet:>12,.0f} packets/s ({packet / plain:.2f}x of plain)")
+    print(f"Packet deserialize:   {deserialize:>12,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
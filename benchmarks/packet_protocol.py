@@ -0,0 +1,76 @@
+"""Compare the packet receiving throughput of :class:`AsyncPacketConnection` and :class:`TCPAsyncConnection`.
+
+The peer sends a stream of small packets over a local socket pair, as fast as it can, with each connection
+reading all of them (as the deserialized packet objects).
+
+Run with ``poetry run python benchmarks/packet_protocol.py`` (mcproto needs to be installed).
+"""
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+from collections.abc import Awaitable, Callable
+
+from mcproto.connection import TCPAsyncConnection
+from mcproto.packets.connection import AsyncPacketConnection, PacketProtocol
+from mcproto.packets.framer import PacketFramer
+from mcproto.packets.interactions import async_read_packet
+from mcproto.packets.packet import GameState, PacketDirection
+from mcproto.packets.packet_map import generate_packet_map
+from mcproto.packets.status.ping import PingPong
+
+PACKETS = 200_000
+REPEAT = 5
+
+
+def _packet_data() -> bytes:
+    framer = PacketFramer(PacketDirection.SERVERBOUND, game_state=GameState.STATUS)
+    return b"".join(bytes(framer.send_packet(PingPong(i))) for i in range(PACKETS))
+
+
+async def _send(sock: socket.socket, data: bytes) -> None:
+    await asyncio.get_running_loop().sock_sendall(sock, data)
+    sock.close()
+
+
+async def _read_stream_reader(sock: socket.socket) -> None:
+    reader, writer = await asyncio.open_connection(sock=sock)
+    conn = TCPAsyncConnection(reader, writer, timeout=5)
+    packet_map = generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS)
+    for _ in range(PACKETS):
+        await async_read_packet(conn, packet_map)
+    await conn.close()
+
+
+async def _read_protocol(sock: socket.socket) -> None:
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    transport, protocol = await asyncio.get_running_loop().create_connection(lambda: PacketProtocol(framer), sock=sock)
+    conn = AsyncPacketConnection(transport, protocol, timeout=5)
+    for _ in range(PACKETS):
+        await conn.read_packet()
+    await conn.close()
+
+
+async def _measure(read: Callable[[socket.socket], Awaitable[None]], data: bytes) -> float:
+    """Best packets per second rate out of a few repeats."""
+    best = 0.0
+    for _ in range(REPEAT):
+        sock, peer = socket.socketpair()
+        peer.setblocking(False)
+        start = time.perf_counter()
+        await asyncio.gather(_send(peer, data), read(sock))
+        best = max(best, PACKETS / (time.perf_counter() - start))
+    return best
+
+
+async def main() -> None:
+    data = _packet_data()
+    stream_reader = await _measure(_read_stream_reader, data)
+    protocol = await _measure(_read_protocol, data)
+    print(f"{'StreamReader':>14} | {stream_reader:>12,.0f} packets/s")
+    print(f"{'Protocol':>14} | {protocol:>12,.0f} packets/s | {protocol / stream_reader:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
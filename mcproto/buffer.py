@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from mcproto.protocol.base_io import BaseSyncReader, BaseSyncWriter
+from typing import Any, Literal, Optional, overload
+
+from mcproto.protocol.base_io import (
+    BaseSyncReader,
+    BaseSyncWriter,
+    FLOAT_FORMATS_TYPE,
+    INT_FORMATS_TYPE,
+    StructFormat,
+    _STRUCTS,
+    _compile_struct,
+    _decode_varint_array,
+)
 
 __all__ = ["Buffer"]
 
@@ -34,6 +45,46 @@ class Buffer(BaseSyncWriter, BaseSyncReader, bytearray):
             error message in the :exc:`IOError`. This behavior is here to mimic reading from a real
             socket connection.
         """
+        end = self._advance(length)
+        return self[end - length : end]
+
+    def read_view(self, length: int) -> memoryview:
+        """Read data stored in the buffer, without copying it.
+
+        This works just like :meth:`.read`, except that instead of returning a new :class:`bytearray` with
+        a copy of the requested data, a :class:`memoryview` pointing directly into the buffer's storage is
+        returned, which makes this read zero-copy.
+
+        .. warning::
+            As long as the returned view (or any view derived from it) exists, the buffer can't be resized,
+            which means any attempt to write into it, or clear it, will fail with :exc:`BufferError`. The view
+            should therefore be released (see :meth:`memoryview.release`, or use it as a context manager) as
+            soon as it's no longer needed. If the data needs to be kept around for longer, use :meth:`.read`.
+
+        :param length:
+            Amount of bytes to be read.
+
+            If the requested amount can't be read, an :exc:`IOError` will be raised, in the same way as
+            with :meth:`.read`.
+        """
+        end = self._advance(length)
+        with memoryview(self) as view:
+            return view[end - length : end]
+
+    def read_into(self, view: memoryview, /) -> None:
+        """Read data stored in the buffer into given (writable) ``view``, copying it over directly.
+
+        If the view can't be filled, an :exc:`IOError` will be raised, in the same way as with :meth:`.read`.
+        """
+        with self.read_view(len(view)) as data:
+            view[:] = data
+
+    def _advance(self, length: int) -> int:
+        """Move the position forward by ``length`` bytes, returning the new position.
+
+        If there isn't enough data remaining in the buffer, the position is moved to the end of the buffer,
+        and an :exc:`IOError` is raised, containing the partial data that was depleted.
+        """
         end = self.pos + length
 
         if end > len(self):
@@ -45,10 +96,134 @@ class Buffer(BaseSyncWriter, BaseSyncReader, bytearray):
                 f" Read {bytes_read} bytes: {data}, out of {length} requested bytes."
             )
 
+        self.pos = end
+        return end
+
+    @overload
+    def read_value(self, fmt: INT_FORMATS_TYPE, /) -> int:
+        ...
+
+    @overload
+    def read_value(self, fmt: FLOAT_FORMATS_TYPE, /) -> float:
+        ...
+
+    @overload
+    def read_value(self, fmt: Literal[StructFormat.BOOL], /) -> bool:
+        ...
+
+    @overload
+    def read_value(self, fmt: Literal[StructFormat.CHAR], /) -> str:
+        ...
+
+    def read_value(self, fmt: StructFormat, /) -> object:
+        """Read a value into given struct format in big-endian mode.
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader.read_value`, which
+        unpacks the value directly from the buffer's storage, without making an intermediate copy of it.
+        """
+        compiled = _STRUCTS[fmt]
+        end = self._advance(compiled.size)
+        return compiled.unpack_from(self, end - compiled.size)[0]
+
+    def read_values(self, fmts: tuple[StructFormat, ...], /) -> tuple[Any, ...]:
+        """Read a run of fixed-width values, as given struct formats (``fmts``) in big-endian mode.
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader.read_values`, which
+        unpacks all of the values at once, directly from the buffer's storage.
+        """
+        compiled = _compile_struct(fmts)
+        end = self._advance(compiled.size)
+        return compiled.unpack_from(self, end - compiled.size)
+
+    def _read_varuint(self, *, max_bits: Optional[int] = None) -> int:
+        """Read an arbitrarily big unsigned integer in a variable length format.
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader._read_varuint`, which
+        decodes the varint by scanning the buffer's storage in place, rather than reading it byte by byte.
+        """
+        value_max = (1 << (max_bits)) - 1 if max_bits is not None else float("inf")
+        end = len(self)
+        pos = self.pos
+
+        result = 0
+        shift = 0
+        while True:
+            if pos >= end:
+                self._advance(pos - self.pos + 1)  # Deplete the buffer, raising the appropriate IOError
+            byte = self[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+
+            if result > value_max:
+                self.pos = pos
+                raise IOError(f"Received varint was outside the range of {max_bits}-bit int.")
+
+            if not byte & 0x80:
+                break
+            shift += 7
+
+        self.pos = pos
+        return result
+
+    def _read_varint_array(self, *, bits: int) -> list[int]:
+        """Read a sequence of signed integers of given amount of ``bits``, prefixed with a varint of it's size.
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader._read_varint_array`, which
+        decodes all of the varints at once, directly from the buffer's storage. If NumPy is installed, the decoding
+        of larger arrays will be vectorized.
+
+        If the array can't be read fully (or holds invalid values), an :exc:`IOError` is raised, and the buffer will
+        be depleted.
+        """
+        count = self.read_varint()
+        if count < 0:
+            raise IOError(f"Received negative varint array size ({count}).")
+
+        # Every varint takes up at least 1 byte, we can fail early without allocating anything
+        if count > self.remaining:
+            self._advance(count)
+
         try:
-            return self[self.pos : end]
-        finally:
-            self.pos = end
+            values, self.pos = _decode_varint_array(self, self.pos, count, bits=bits)
+        except IOError:
+            self.pos = len(self)
+            raise
+        return values
+
+    def read_ascii(self) -> str:
+        """Read ISO-8859-1 encoded string, until we encounter NULL (0x00) at the end indicating string end.
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader.read_ascii`, which
+        searches for the NULL byte in the buffer's storage directly, rather than reading byte by byte.
+
+        If there is no NULL byte in the remaining data, an :exc:`IOError` is raised, and the buffer is depleted.
+        """
+        end = self.find(0, self.pos)
+        if end == -1:
+            self._advance(self.remaining + 1)  # Deplete the buffer, raising the appropriate IOError
+
+        with self.read_view(end - self.pos) as data:
+            chars = str(data, "ISO-8859-1")
+        self.pos += 1  # Skip over the NULL byte
+        return chars
+
+    def read_utf(self) -> str:
+        """Read a UTF-8 encoded string, prefixed with a varint of it's size (in bytes).
+
+        This is an optimized version of :meth:`~mcproto.protocol.base_io.BaseSyncReader.read_utf`, which
+        decodes the string directly from the buffer's storage, without making an intermediate copy of it.
+        """
+        length = self.read_varint()
+        if length > 131068:
+            raise IOError(f"Maximum read limit for utf strings is 131068 bytes, got {length}.")
+
+        with self.read_view(length) as data:
+            chars = str(data, "utf-8")
+
+        if len(chars) > 32767:
+            raise IOError(f"Maximum read limit for utf strings is 32767 characters, got {len(chars)}.")
+
+        return chars
 
     def clear(self, only_already_read: bool = False) -> None:
         """Clear out the stored data and reset position.
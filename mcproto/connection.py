@@ -4,13 +4,19 @@ import asyncio
 import errno
 import socket
 from abc import ABC, abstractmethod
-from typing import Generic, Optional, TypeVar
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Generic, Optional, TYPE_CHECKING, TypeVar, cast
 
-import asyncio_dgram
 from typing_extensions import ParamSpec, Self
 
 from mcproto.protocol.base_io import BaseAsyncReader, BaseAsyncWriter, BaseSyncReader, BaseSyncWriter
 
+if TYPE_CHECKING:
+    import asyncio_dgram
+
+    from mcproto.buffer import Buffer
+
 __all__ = [
     "AsyncConnection",
     "SyncConnection",
@@ -25,7 +31,10 @@ R = TypeVar("R")
 T_SOCK = TypeVar("T_SOCK", bound=socket.socket)
 T_STREAMREADER = TypeVar("T_STREAMREADER", bound=asyncio.StreamReader)
 T_STREAMWRITER = TypeVar("T_STREAMWRITER", bound=asyncio.StreamWriter)
-T_DATAGRAM_CLIENT = TypeVar("T_DATAGRAM_CLIENT", bound=asyncio_dgram.aio.DatagramClient)
+T_DATAGRAM_CLIENT = TypeVar("T_DATAGRAM_CLIENT", bound="asyncio_dgram.aio.DatagramClient")
+
+# Maximum amount of segments sent with a single sendmsg call (the smallest common IOV_MAX limit)
+_SENDMSG_MAX_SEGMENTS = 1024
 
 
 class SyncConnection(BaseSyncReader, BaseSyncWriter, ABC):
@@ -54,6 +63,31 @@ class SyncConnection(BaseSyncReader, BaseSyncWriter, ABC):
         """Close the underlying connection."""
         raise NotImplementedError
 
+    def read_some(self, max_length: int, /) -> bytearray:
+        """Receive at least 1, and at most ``max_length`` bytes, without waiting for more data than necessary.
+
+        This allows receiving all of the already available data at once, without knowing it's exact size.
+        By default, this only receives a single byte, connections should override this to receive more.
+        """
+        return self.read(1)
+
+    def flush(self) -> None:
+        """Send out any written data, which is still being held in the write buffer.
+
+        Connections which don't buffer the written data don't need to do anything here.
+        """
+
+    @contextmanager
+    def cork(self) -> Iterator[None]:
+        """Hold back all of the data written within this context, and only send it out once it's exited.
+
+        This allows multiple writes (such as all of the writes needed to send a packet) to be grouped, and sent
+        together, rather than one by one.
+
+        Connections which don't buffer the written data simply send it right away.
+        """
+        yield
+
     def close(self) -> None:
         """Close the connection (it cannot be used after this)."""
         self._close()
@@ -94,6 +128,31 @@ class AsyncConnection(BaseAsyncReader, BaseAsyncWriter, ABC):
         """Close the underlying connection."""
         raise NotImplementedError
 
+    async def read_some(self, max_length: int, /) -> bytearray:
+        """Receive at least 1, and at most ``max_length`` bytes, without waiting for more data than necessary.
+
+        This allows receiving all of the already available data at once, without knowing it's exact size.
+        By default, this only receives a single byte, connections should override this to receive more.
+        """
+        return await self.read(1)
+
+    async def flush(self) -> None:
+        """Wait until the written data is sent out, or at least until the write buffer is small enough.
+
+        Connections which don't buffer the written data don't need to do anything here.
+        """
+
+    @asynccontextmanager
+    async def cork(self) -> AsyncIterator[None]:
+        """Group all of the writes within this context, and only flush them once it's exited.
+
+        This allows multiple writes (such as all of the writes needed to send a packet) to be grouped, only
+        waiting for the written data to be sent out once, rather than after each write.
+
+        Connections which don't buffer the written data simply send it right away.
+        """
+        yield
+
     async def close(self) -> None:
         """Close the connection (it cannot be used after this)."""
         await self._close()
@@ -109,16 +168,67 @@ class AsyncConnection(BaseAsyncReader, BaseAsyncWriter, ABC):
 
 
 class TCPSyncConnection(SyncConnection, Generic[T_SOCK]):
-    """Synchronous connection using a TCP :class:`~socket.socket`."""
-
-    __slots__ = ("socket",)
-
-    def __init__(self, socket: T_SOCK):
+    """Synchronous connection using a TCP :class:`~socket.socket`.
+
+    By default, every read is performed directly on the socket. Optionally, a read-ahead buffer can be used,
+    in which case the data will be received in bigger chunks (using :meth:`~socket.socket.recv_into`), and
+    the reads will be served from this buffer, only receiving more data once the buffer gets drained.
+
+    Written data is held in a write buffer while within the :meth:`.cork` context (used when writing packets),
+    and sent out all at once when the context is exited. With :attr:`.autoflush` disabled, the written data is
+    always held in the write buffer, until :meth:`.flush` is called explicitly.
+    """
+
+    __slots__ = (
+        "socket",
+        "autoflush",
+        "_read_buffer",
+        "_read_view",
+        "_read_start",
+        "_read_end",
+        "_write_buffer",
+        "_corked",
+    )
+
+    def __init__(self, socket: T_SOCK, *, read_buffer_size: Optional[int] = None, autoflush: bool = True):
+        """
+        :param socket: The underlying (connected) TCP socket.
+        :param read_buffer_size:
+            Size of the preallocated read-ahead buffer (in bytes). If not set, read-ahead buffering is disabled,
+            and every read is performed directly on the socket.
+        :param autoflush:
+            Whether to send out the written data automatically. If enabled, data is sent out right away, or once
+            the outermost :meth:`.cork` context is exited. If disabled, the data is only sent out on :meth:`.flush`.
+        """
         super().__init__()
         self.socket = socket
+        self.autoflush = autoflush
+
+        self._write_buffer: list[bytes] = []
+        self._corked = 0
+
+        if read_buffer_size is not None:
+            if read_buffer_size <= 0:
+                raise ValueError(f"Read buffer size must be a positive number, got {read_buffer_size}.")
+            self._read_buffer: Optional[bytearray] = bytearray(read_buffer_size)
+            self._read_view: Optional[memoryview] = memoryview(self._read_buffer)
+        else:
+            self._read_buffer = None
+            self._read_view = None
+
+        # Unread data in the read-ahead buffer is located within [_read_start:_read_end]
+        self._read_start = 0
+        self._read_end = 0
 
     @classmethod
-    def make_client(cls, address: tuple[str, int], timeout: float) -> Self:
+    def make_client(
+        cls,
+        address: tuple[str, int],
+        timeout: float,
+        *,
+        read_buffer_size: Optional[int] = None,
+        autoflush: bool = True,
+    ) -> Self:
         """Construct a client connection (Client -> Server) to given server ``address``.
 
         :param address: Address of the server to connection to.
@@ -126,10 +236,19 @@ class TCPSyncConnection(SyncConnection, Generic[T_SOCK]):
             Amount of seconds to wait for the connection to be established.
             If connection can't be established within this time, :exc:`TimeoutError` will be raised.
             This timeout is then also used for any further data receiving.
+        :param read_buffer_size:
+            Size of the read-ahead buffer (in bytes), if not set, read-ahead buffering is disabled.
+        :param autoflush:
+            Whether to send out the written data automatically, if disabled, :meth:`.flush` needs to be called.
         """
         sock = socket.create_connection(address, timeout=timeout)
         sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-        return cls(sock)
+        return cls(sock, read_buffer_size=read_buffer_size, autoflush=autoflush)
+
+    @property
+    def buffered(self) -> int:
+        """Get the amount of received bytes, held in the read-ahead buffer, that weren't yet read."""
+        return self._read_end - self._read_start
 
     def read(self, length: int) -> bytearray:
         """Receive data sent through the connection.
@@ -139,6 +258,74 @@ class TCPSyncConnection(SyncConnection, Generic[T_SOCK]):
             (server didn't send that much data/server didn't send any data), an :exc:`IOError`
             will be raised.
         """
+        if self._read_buffer is None:
+            return self._recv(length)
+
+        start = self._read_start
+        if self._read_end - start >= length:
+            self._read_start = start + length
+            return self._read_buffer[start : start + length]
+
+        if length > len(self._read_buffer):
+            # The requested data wouldn't fit into the read-ahead buffer, only take what's already buffered
+            # and receive the rest directly
+            result = self._read_buffer[start : self._read_end]
+            self._read_start = self._read_end = 0
+            try:
+                result.extend(self._recv(length - len(result)))
+            except IOError as exc:
+                raise IOError(
+                    f"Server stopped responding (got {len(result)} bytes, but expected {length} bytes)."
+                ) from exc
+            return result
+
+        self._fill(length)
+        start = self._read_start
+        self._read_start = start + length
+        return self._read_buffer[start : start + length]
+
+    def read_into(self, view: memoryview, /) -> None:
+        """Receive exactly ``len(view)`` bytes directly into given (writable) ``view``.
+
+        Unlike :meth:`.read`, the data is received (or copied from the read-ahead buffer) right into the view,
+        without any intermediate copies.
+        """
+        length = len(view)
+        received = 0
+        if self._read_buffer is not None:
+            if length <= len(self._read_buffer):
+                self._fill(length)
+            # Take what's buffered (everything, if the requested data wouldn't fit into the read-ahead buffer),
+            # and receive the rest directly
+            start = self._read_start
+            received = min(self._read_end - start, length)
+            view[:received] = cast(memoryview, self._read_view)[start : start + received]
+            self._read_start = start + received
+
+        self._recv_into(view, received)
+
+    def read_some(self, max_length: int, /) -> bytearray:
+        """Receive at least 1, and at most ``max_length`` bytes, without waiting for more data than necessary.
+
+        In buffered mode, the data is served from the read-ahead buffer, receiving more only once it's drained.
+        Otherwise, this performs a single receive call on the socket.
+        """
+        if self._read_buffer is None:
+            data = self.socket.recv(max_length)
+            if len(data) == 0:
+                raise IOError("Server did not respond with any information.")
+            return bytearray(data)
+
+        if self._read_start == self._read_end:
+            self._fill(1)
+
+        start = self._read_start
+        end = min(self._read_end, start + max_length)
+        self._read_start = end
+        return self._read_buffer[start:end]
+
+    def _recv(self, length: int) -> bytearray:
+        """Receive exactly ``length`` bytes directly from the socket."""
         result = bytearray()
         while len(result) < length:
             new = self.socket.recv(length - len(result))
@@ -155,36 +342,273 @@ class TCPSyncConnection(SyncConnection, Generic[T_SOCK]):
 
         return result
 
+    def _recv_into(self, view: memoryview, received: int = 0) -> None:
+        """Receive data directly from the socket into given ``view``, until it's filled.
+
+        :param received: Amount of bytes at the start of the view, which were already received.
+        """
+        length = len(view)
+        while received < length:
+            new = self.socket.recv_into(view[received:])
+            if new == 0:
+                # No information at all
+                if received == 0:
+                    raise IOError("Server did not respond with any information.")
+                # Only sent a few bytes, but we requested more
+                raise IOError(
+                    f"Server stopped responding (got {received} bytes, but expected {length} bytes)."
+                    f" Partial obtained data: {bytearray(view[:received])!r}"
+                )
+            received += new
+
+    def _fill(self, length: int) -> None:
+        """Make sure there are at least ``length`` unread bytes in the read-ahead buffer, receiving more if needed.
+
+        The ``length`` can't be bigger than the size of the read-ahead buffer.
+        """
+        # This is only ever called in buffered mode
+        buffer = cast(bytearray, self._read_buffer)
+        view = cast(memoryview, self._read_view)
+
+        unread = self._read_end - self._read_start
+        if unread >= length:
+            return
+
+        # Move the unread data to the start of the buffer, making space for the new data
+        if self._read_start != 0:
+            view[:unread] = view[self._read_start : self._read_end]
+            self._read_start = 0
+            self._read_end = unread
+
+        while self._read_end < length:
+            received = self.socket.recv_into(view[self._read_end :])
+            if received == 0:
+                partial = buffer[: self._read_end]
+                self._read_start = self._read_end = 0
+                # No information at all
+                if len(partial) == 0:
+                    raise IOError("Server did not respond with any information.")
+                # Only sent a few bytes, but we requested more
+                raise IOError(
+                    f"Server stopped responding (got {len(partial)} bytes, but expected {length} bytes)."
+                    f" Partial obtained data: {partial!r}"
+                )
+            self._read_end += received
+
+    def _read_varuint(self, *, max_bits: Optional[int] = None) -> int:
+        """Read an arbitrarily big unsigned integer in a variable length format.
+
+        In buffered mode, this decodes the varint directly from the read-ahead buffer, only receiving more data
+        from the socket once the buffer gets drained. Otherwise, the varint is read byte by byte.
+
+        For more information about variable length format check
+        :meth:`~mcproto.protocol.base_io.BaseSyncReader._read_varuint`.
+        """
+        if self._read_buffer is None:
+            return super()._read_varuint(max_bits=max_bits)
+
+        buffer = self._read_buffer
+        value_max = (1 << (max_bits)) - 1 if max_bits is not None else float("inf")
+
+        result = 0
+        shift = 0
+        while True:
+            if self._read_start == self._read_end:
+                self._fill(1)
+            byte = buffer[self._read_start]
+            self._read_start += 1
+            result |= (byte & 0x7F) << shift
+
+            if result > value_max:
+                raise IOError(f"Received varint was outside the range of {max_bits}-bit int.")
+
+            if not byte & 0x80:
+                return result
+            shift += 7
+
+    def read_ascii(self) -> str:
+        """Read ISO-8859-1 encoded string, until we encounter NULL (0x00) at the end indicating string end.
+
+        In buffered mode, the NULL byte is searched for in the read-ahead buffer directly, only receiving more
+        data from the socket once the buffer gets drained. Otherwise, the string is read byte by byte.
+        """
+        if self._read_buffer is None:
+            return super().read_ascii()
+
+        buffer = self._read_buffer
+        result = bytearray()
+        while True:
+            if self._read_start == self._read_end:
+                self._fill(1)
+
+            end = buffer.find(0, self._read_start, self._read_end)
+            if end != -1:
+                result += buffer[self._read_start : end]
+                self._read_start = end + 1  # Skip over the NULL byte
+                return result.decode("ISO-8859-1")
+
+            # No NULL byte in the buffered data yet, consume all of it, and receive more
+            result += buffer[self._read_start : self._read_end]
+            self._read_start = self._read_end
+
     def write(self, data: bytes) -> None:
-        """Send given ``data`` over the connection."""
-        self.socket.send(data)
+        """Send given ``data`` over the connection.
+
+        If the connection is corked (see :meth:`.cork`), or :attr:`.autoflush` is disabled, the data will
+        only be stored in the write buffer, and sent out later.
+        """
+        if self.autoflush and not self._corked:
+            self.socket.sendall(data)
+            return
+
+        # The data will only be sent later, make sure it can't be changed in the meantime
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._write_buffer.append(data)
+
+    def flush(self) -> None:
+        """Send out all of the data held in the write buffer.
+
+        Multiple buffered writes are sent together, using a single scatter-gather (:meth:`~socket.socket.sendmsg`)
+        call where available, or joined and sent with :meth:`~socket.socket.sendall` otherwise.
+        """
+        segments = self._write_buffer
+        if not segments:
+            return
+        self._write_buffer = []
+
+        if len(segments) == 1:
+            self.socket.sendall(segments[0])
+        elif hasattr(self.socket, "sendmsg"):
+            self._sendmsg_all(segments)
+        else:  # pragma: no cover # sendmsg isn't available on Windows
+            self.socket.sendall(b"".join(segments))
+
+    def _sendmsg_all(self, segments: list[bytes]) -> None:
+        """Send all of the given ``segments``, using scatter-gather :meth:`~socket.socket.sendmsg` calls.
+
+        Just like :meth:`~socket.socket.sendall`, this keeps sending until all of the data was sent, since
+        :meth:`~socket.socket.sendmsg` may only send a part of the data.
+        """
+        views = [memoryview(segment) for segment in segments]
+        index = 0
+        while index < len(views):
+            sent = self.socket.sendmsg(views[index : index + _SENDMSG_MAX_SEGMENTS])
+            # Skip over all of the fully sent segments, and cut off the sent part of the partially sent one
+            while index < len(views) and sent >= len(views[index]):
+                sent -= len(views[index])
+                index += 1
+            if sent:
+                views[index] = views[index][sent:]
+
+    @contextmanager
+    def cork(self) -> Iterator[None]:
+        """Hold back all of the data written within this context, and only send it out once it's exited.
+
+        This allows multiple writes (such as all of the writes needed to send a packet) to be grouped, and sent
+        together, rather than one by one. Corking can be nested, in which case the data is sent out once the
+        outermost context is exited. If :attr:`.autoflush` is disabled, the data is held until :meth:`.flush`.
+
+        If an exception occurs within the context, the data written within it is discarded, and never sent out.
+        """
+        write_buffer = self._write_buffer
+        start = len(write_buffer)
+        self._corked += 1
+        try:
+            yield
+        except BaseException:
+            # Don't leave a partially written packet in the buffer, only the data written before this context.
+            # If the buffer was flushed within the context, everything in the new buffer was written within it.
+            if self._write_buffer is write_buffer:
+                del write_buffer[start:]
+            else:
+                self._write_buffer = []
+            raise
+        finally:
+            self._corked -= 1
+
+        if not self._corked and self.autoflush:
+            self.flush()
 
     def _close(self) -> None:
         """Close the underlying connection."""
-        # Gracefully end the connection first (shutdown), informing the other side
-        # we're disconnecting, and waiting for them to disconnect cleanly (TCP FIN)
         try:
-            self.socket.shutdown(socket.SHUT_RDWR)
-        except OSError as exc:
-            if exc.errno != errno.ENOTCONN:
-                raise
+            # Make sure we don't lose any of the buffered written data
+            self.flush()
 
-        self.socket.close()
+            # Gracefully end the connection first (shutdown), informing the other side
+            # we're disconnecting, and waiting for them to disconnect cleanly (TCP FIN)
+            try:
+                self.socket.shutdown(socket.SHUT_RDWR)
+            except OSError as exc:
+                if exc.errno != errno.ENOTCONN:
+                    raise
+        finally:
+            self.socket.close()
 
 
 class TCPAsyncConnection(AsyncConnection, Generic[T_STREAMREADER, T_STREAMWRITER]):
-    """Asynchronous TCP connection using :class:`~asyncio.StreamWriter` and :class:`~asyncio.StreamReader`."""
-
-    __slots__ = ("reader", "writer", "timeout")
-
-    def __init__(self, reader: T_STREAMREADER, writer: T_STREAMWRITER, timeout: float):
+    """Asynchronous TCP connection using :class:`~asyncio.StreamWriter` and :class:`~asyncio.StreamReader`.
+
+    Reads which can be satisfied with the data already buffered by the :class:`~asyncio.StreamReader` are
+    performed without any waiting. Only when the data isn't yet available, a timeout is set up, and the read
+    waits for it. By default, every such read has it's own timeout, however all reads performed within the
+    :meth:`.deadline` context share a single deadline (which is also used for reading whole packets).
+
+    Writes are flow controlled. Once the amount of data in the transport's write buffer goes over the high
+    water mark, writing will wait until the buffer is drained down to the low water mark. By default, this
+    happens after every write, or once per group of writes within the :meth:`.cork` context (used when writing
+    packets). With :attr:`.autoflush` disabled, this only happens on explicit :meth:`.flush` calls, which allows
+    draining once per a whole batch of packets.
+    """
+
+    __slots__ = ("reader", "writer", "timeout", "autoflush", "_deadline", "_corked")
+
+    def __init__(
+        self,
+        reader: T_STREAMREADER,
+        writer: T_STREAMWRITER,
+        timeout: float,
+        *,
+        write_high_water: Optional[int] = None,
+        write_low_water: Optional[int] = None,
+        autoflush: bool = True,
+    ):
+        """
+        :param reader: The stream reader, used to receive data.
+        :param writer: The stream writer, used to send data.
+        :param timeout: Amount of seconds to wait for the data when reading.
+        :param write_high_water:
+            Amount of bytes in the transport's write buffer, above which writing will wait for the buffer to get
+            drained. If not set, asyncio's default limits are used.
+        :param write_low_water:
+            Amount of bytes in the transport's write buffer, down to which it needs to be drained, before writing
+            can continue. If not set, asyncio's default limits are used (derived from the high water mark).
+        :param autoflush:
+            Whether to flush (wait for the write buffer to drain) automatically after every write, or after the
+            outermost :meth:`.cork` context is exited. If disabled, :meth:`.flush` needs to be called explicitly.
+        """
         super().__init__()
         self.reader = reader
         self.writer = writer
         self.timeout = timeout
+        self.autoflush = autoflush
+        self._deadline: Optional[float] = None
+        self._corked = 0
+
+        if write_high_water is not None or write_low_water is not None:
+            self.writer.transport.set_write_buffer_limits(high=write_high_water, low=write_low_water)
 
     @classmethod
-    async def make_client(cls, address: tuple[str, int], timeout: float) -> Self:
+    async def make_client(
+        cls,
+        address: tuple[str, int],
+        timeout: float,
+        *,
+        write_high_water: Optional[int] = None,
+        write_low_water: Optional[int] = None,
+        autoflush: bool = True,
+    ) -> Self:
         """Construct a client connection (Client -> Server) to given server ``address``.
 
         :param address: Address of the server to connection to.
@@ -192,10 +616,61 @@ class TCPAsyncConnection(AsyncConnection, Generic[T_STREAMREADER, T_STREAMWRITER
             Amount of seconds to wait for the connection to be established.
             If connection can't be established within this time, :exc:`TimeoutError` will be raised.
             This timeout is then also used for any further data receiving.
+        :param write_high_water: High water mark of the write buffer (in bytes), see :meth:`.__init__`.
+        :param write_low_water: Low water mark of the write buffer (in bytes), see :meth:`.__init__`.
+        :param autoflush:
+            Whether to wait for the write buffer to drain automatically, if disabled, :meth:`.flush` needs to be
+            called explicitly.
         """
         conn = asyncio.open_connection(address[0], address[1])
         reader, writer = await asyncio.wait_for(conn, timeout=timeout)
-        return cls(reader, writer, timeout)
+        return cls(
+            reader,
+            writer,
+            timeout,
+            write_high_water=write_high_water,
+            write_low_water=write_low_water,
+            autoflush=autoflush,
+        )
+
+    @contextmanager
+    def deadline(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """Share a single deadline between all of the reads performed within this context.
+
+        Rather than each read having it's own timeout, all of the reads performed within this context together
+        need to finish within ``timeout`` seconds (defaulting to :attr:`.timeout`). Once the deadline passes, any
+        further reads which would need to wait for more data will raise :exc:`asyncio.TimeoutError`.
+
+        If this context is entered while already within another deadline context, the outer deadline is kept.
+        """
+        if self._deadline is not None:
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        self._deadline = loop.time() + (self.timeout if timeout is None else timeout)
+        try:
+            yield
+        finally:
+            self._deadline = None
+
+    def _buffered(self) -> bytes:
+        """Get the data already received and buffered by the stream reader, but not yet read.
+
+        This relies on an implementation detail of :class:`~asyncio.StreamReader`, if the buffer isn't available,
+        an empty bytes object is returned, meaning all reads will simply wait for the data.
+        """
+        return getattr(self.reader, "_buffer", b"")
+
+    def _remaining_time(self) -> float:
+        """Get the amount of seconds a read can wait for more data for."""
+        if self._deadline is None:
+            return self.timeout
+
+        remaining = self._deadline - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("Deadline for reading data from the connection has passed.")
+        return remaining
 
     async def read(self, length: int) -> bytearray:
         """Receive data sent through the connection.
@@ -205,25 +680,135 @@ class TCPAsyncConnection(AsyncConnection, Generic[T_STREAMREADER, T_STREAMWRITER
             (server didn't send that much data/server didn't send any data), an :exc:`IOError`
             will be raised.
         """
-        result = bytearray()
-        while len(result) < length:
-            new = await asyncio.wait_for(self.reader.read(length - len(result)), timeout=self.timeout)
-            if len(new) == 0:
-                # No information at all
-                if len(result) == 0:
-                    raise IOError("Server did not respond with any information.")
-                # Only sent a few bytes, but we requested more
-                raise IOError(
-                    f"Server stopped responding (got {len(result)} bytes, but expected {length} bytes)."
-                    f" Partial obtained data: {result!r}"
-                )
-            result.extend(new)
+        return bytearray(await self._readexactly(length))
+
+    async def read_into(self, view: memoryview, /) -> None:
+        """Receive exactly ``len(view)`` bytes into given (writable) ``view``.
+
+        The received data is copied into the view directly, without converting it into a :class:`bytearray`
+        first, like :meth:`.read` does.
+        """
+        view[:] = await self._readexactly(len(view))
+
+    async def _readexactly(self, length: int) -> bytes:
+        """Receive exactly ``length`` bytes from the stream reader, raising :exc:`IOError` if it hits EOF."""
+        try:
+            if len(self._buffered()) >= length:
+                # All of the data is already available, this read won't need to wait, avoid setting up a timeout
+                data = await self.reader.readexactly(length)
+            else:
+                data = await asyncio.wait_for(self.reader.readexactly(length), timeout=self._remaining_time())
+        except asyncio.IncompleteReadError as exc:
+            partial = exc.partial
+            # No information at all
+            if len(partial) == 0:
+                raise IOError("Server did not respond with any information.") from exc
+            # Only sent a few bytes, but we requested more
+            raise IOError(
+                f"Server stopped responding (got {len(partial)} bytes, but expected {length} bytes)."
+                f" Partial obtained data: {bytearray(partial)!r}"
+            ) from exc
+
+        return data
+
+    async def read_some(self, max_length: int, /) -> bytearray:
+        """Receive at least 1, and at most ``max_length`` bytes, without waiting for more data than necessary.
+
+        If the stream reader already has some buffered data, it is returned right away, otherwise this waits
+        until some data is received (respecting the timeout, or the shared deadline, see :meth:`.deadline`).
+        """
+        if self._buffered():
+            data = await self.reader.read(max_length)
+        else:
+            data = await asyncio.wait_for(self.reader.read(max_length), timeout=self._remaining_time())
+
+        if len(data) == 0:
+            raise IOError("Server did not respond with any information.")
+        return bytearray(data)
+
+    async def _read_varuint(self, *, max_bits: Optional[int] = None) -> int:
+        """Read an arbitrarily big unsigned integer in a variable length format.
 
+        If the whole varint is already buffered by the stream reader, it is decoded from there directly, and
+        consumed with a single read call, rather than reading it byte by byte.
+
+        For more information about variable length format check
+        :meth:`~mcproto.protocol.base_io.BaseAsyncReader._read_varuint`.
+        """
+        buffered = self._buffered()
+        # Only look as far as the longest possible varint of max_bits could go
+        max_size = (max_bits + 6) // 7 if max_bits is not None else len(buffered)
+
+        # Find the last byte of the varint (first one without the continuation bit set)
+        size = next((i for i, byte in enumerate(buffered[:max_size], start=1) if not byte & 0x80), None)
+        if size is None:
+            # The whole varint isn't buffered yet (or it's invalid), fall back to reading byte by byte
+            return await super()._read_varuint(max_bits=max_bits)
+
+        data = await self.reader.readexactly(size)
+
+        result = 0
+        for i, byte in enumerate(data):
+            result |= (byte & 0x7F) << (7 * i)
+
+        if max_bits is not None and result >= 1 << max_bits:
+            raise IOError(f"Received varint was outside the range of {max_bits}-bit int.")
         return result
 
+    async def read_bytearray(self) -> bytearray:
+        """Read an arbitrary sequence of bytes, prefixed with a varint of it's size.
+
+        Both the size and the data are read under a single shared deadline (see :meth:`.deadline`).
+        """
+        with self.deadline():
+            return await super().read_bytearray()
+
+    async def read_buffer(self) -> Buffer:
+        """Read an arbitrary sequence of bytes, prefixed with a varint of it's size, into a new buffer.
+
+        Both the size and the data are read under a single shared deadline (see :meth:`.deadline`).
+        """
+        with self.deadline():
+            return await super().read_buffer()
+
     async def write(self, data: bytes) -> None:
-        """Send given ``data`` over the connection."""
+        """Send given ``data`` over the connection.
+
+        Unless the connection is corked (see :meth:`.cork`), or :attr:`.autoflush` is disabled, this will
+        also wait for the write buffer to drain, if it went over the high water mark (see :meth:`.flush`).
+        """
         self.writer.write(data)
+        if self.autoflush and not self._corked:
+            await self.writer.drain()
+
+    async def flush(self) -> None:
+        """Wait until the write buffer is drained down to the low water mark, if it went over the high water mark.
+
+        If the write buffer is below the high water mark, this doesn't wait at all.
+        """
+        await self.writer.drain()
+
+    @asynccontextmanager
+    async def cork(self) -> AsyncIterator[None]:
+        """Group all of the writes within this context, and only flush them once it's exited.
+
+        This means the write buffer is allowed to go over the high water mark within this context, and is only
+        drained once, after all of the writes. Corking can be nested, in which case the flushing happens once the
+        outermost context is exited. If :attr:`.autoflush` is disabled, it only happens on explicit :meth:`.flush`.
+        """
+        self._corked += 1
+        try:
+            yield
+        finally:
+            self._corked -= 1
+
+        if not self._corked and self.autoflush:
+            await self.flush()
+
+    @property
+    def write_buffer_size(self) -> int:
+        """Get the current amount of bytes held in the transport's write buffer, waiting to be sent out."""
+        return self.writer.transport.get_write_buffer_size()
 
     async def _close(self) -> None:
         """Close the underlying connection."""
@@ -307,6 +892,9 @@ class UDPAsyncConnection(AsyncConnection, Generic[T_DATAGRAM_CLIENT]):
             If connection can't be established within this time, :exc:`TimeoutError` will be raised.
             This timeout is then also used for any further data receiving.
         """
+        # Only imported once needed, so that importing this module doesn't require importing asyncio_dgram
+        import asyncio_dgram
+
         conn = asyncio_dgram.connect(address)
         stream = await asyncio.wait_for(conn, timeout=timeout)
         return cls(stream, timeout)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Optional
+
+from typing_extensions import Self, TypeAlias
+
+from mcproto.buffer import Buffer
+from mcproto.connection import AsyncConnection, SyncConnection
+
+__all__ = [
+    "AESCipher",
+    "CIPHER_BACKENDS",
+    "EncryptedAsyncConnection",
+    "EncryptedSyncConnection",
+]
+
+# Function performing the encryption or decryption of given data, continuing the cipher stream
+CipherFunction: TypeAlias = "Callable[[bytes], bytes]"
+
+
+def _cryptography_backend(key: bytes, iv: bytes) -> tuple[CipherFunction, CipherFunction]:
+    """Create AES/CFB8 encrypt and decrypt functions using the ``cryptography`` library."""
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms
+
+    try:
+        # CFB8 was moved into the "decrepit" module in newer versions of cryptography
+        from cryptography.hazmat.decrepit.ciphers.modes import CFB8
+    except ImportError:
+        from cryptography.hazmat.primitives.ciphers.modes import CFB8
+
+    cipher = Cipher(algorithms.AES(key), CFB8(iv))
+    return cipher.encryptor().update, cipher.decryptor().update
+
+
+def _pycryptodome_backend(key: bytes, iv: bytes) -> tuple[CipherFunction, CipherFunction]:
+    """Create AES/CFB8 encrypt and decrypt functions using the ``pycryptodome`` library."""
+    from Crypto.Cipher import AES  # pyright: ignore[reportMissingImports]
+
+    encryptor = AES.new(key, AES.MODE_CFB, iv=iv, segment_size=8)
+    decryptor = AES.new(key, AES.MODE_CFB, iv=iv, segment_size=8)
+    return encryptor.encrypt, decryptor.decrypt
+
+
+# Supported cipher backends, in the order of preference (fastest first)
+CIPHER_BACKENDS: dict[str, Callable[[bytes, bytes], tuple[CipherFunction, CipherFunction]]] = {
+    "cryptography": _cryptography_backend,
+    "pycryptodome": _pycryptodome_backend,
+}
+
+
+@lru_cache(maxsize=None)
+def _get_default_backend() -> str:
+    """Get the name of the most preferred cipher backend, which is installed.
+
+    The cipher backend libraries are optional dependencies, only imported once needed.
+    """
+    for name, factory in CIPHER_BACKENDS.items():
+        try:
+            factory(bytes(16), bytes(16))
+        except ImportError:
+            continue
+        return name
+
+    raise ImportError(
+        f"Encryption requires one of the cipher backend libraries to be installed: {', '.join(CIPHER_BACKENDS)}."
+    )
+
+
+class AESCipher:
+    """AES/CFB8 stream cipher, as used for the encryption of the connection (after the encryption request).
+
+    This holds the state of both the encryption (of the sent data) and the decryption (of the received data)
+    streams, which means that a single instance can only be used with a single connection. Since CFB8 is
+    a stream cipher, the data can be encrypted/decrypted in arbitrarily sized chunks, however each call has
+    a fixed overhead, which makes ciphering bigger chunks (rather than each small read) much faster.
+    """
+
+    __slots__ = ("backend", "_encrypt", "_decrypt")
+
+    def __init__(self, shared_secret: bytes, *, backend: Optional[str] = None):
+        """
+        :param shared_secret:
+            The shared secret (as sent in :class:`~mcproto.packets.login.login.LoginEncryptionResponse`),
+            used as both the key and the initialization vector.
+        :param backend:
+            Name of the cipher backend to use (see :data:`.CIPHER_BACKENDS`). If not set, the most preferred
+            (fastest) installed backend will be used.
+        """
+        if backend is None:
+            backend = _get_default_backend()
+        elif backend not in CIPHER_BACKENDS:
+            raise ValueError(f"Unknown cipher backend {backend!r}, available: {', '.join(CIPHER_BACKENDS)}.")
+
+        self.backend = backend
+        self._encrypt, self._decrypt = CIPHER_BACKENDS[backend](shared_secret, shared_secret)
+
+    def encrypt(self, data: bytes) -> bytes:
+        """Encrypt given ``data``, continuing the encryption stream."""
+        return self._encrypt(data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        """Decrypt given ``data``, continuing the decryption stream."""
+        return self._decrypt(data)
+
+
+class EncryptedSyncConnection(SyncConnection):
+    """Synchronous connection wrapper, encrypting all of the sent data, and decrypting all of the received data.
+
+    Rather than decrypting the data for each read, the received data is read ahead (receiving all of the already
+    available data, up to :attr:`.READ_AHEAD` bytes), and decrypted in a single call, with the reads then being
+    served from the decrypted data. Similarly, all of the data written within the :meth:`.cork` context is
+    encrypted in a single call, once the context is exited.
+    """
+
+    __slots__ = ("connection", "cipher", "_read_buffer", "_write_buffer", "_corked")
+
+    READ_AHEAD = 65536
+
+    def __init__(self, connection: SyncConnection, cipher: AESCipher):
+        """
+        :param connection: The underlying connection, over which the encrypted data is sent/received.
+        :param cipher: The cipher used to encrypt/decrypt the data.
+        """
+        super().__init__()
+        self.connection = connection
+        self.cipher = cipher
+        self._read_buffer = Buffer()
+        self._write_buffer: list[bytes] = []
+        self._corked = 0
+
+    @classmethod
+    def make_client(cls, address: tuple[str, int], timeout: float) -> Self:
+        """Encrypted connections can't be created directly, wrap an existing connection instead.
+
+        :raises TypeError: Always, as the encryption is only enabled during the login.
+        """
+        raise TypeError(
+            f"{cls.__name__} can't be created directly, as the encryption is only enabled during the login."
+            f" Wrap an already established connection instead: {cls.__name__}(connection, cipher)."
+        )
+
+    def read(self, length: int) -> bytearray:
+        """Receive and decrypt data sent through the connection.
+
+        :param length:
+            Amount of bytes to be received. If the requested amount can't be received
+            (server didn't send that much data/server didn't send any data), an :exc:`IOError`
+            will be raised.
+        """
+        self._fill(length)
+        return self._read_buffer.read(length)
+
+    def read_into(self, view: memoryview, /) -> None:
+        """Receive and decrypt exactly ``len(view)`` bytes, copying the decrypted data into given ``view``."""
+        self._fill(len(view))
+        self._read_buffer.read_into(view)
+
+    def _fill(self, length: int) -> None:
+        """Make sure there are at least ``length`` decrypted bytes in the read buffer, receiving more if needed."""
+        buffer = self._read_buffer
+        if buffer.remaining < length:
+            # Drop the already read data, so that the buffer doesn't keep growing
+            buffer.clear(only_already_read=True)
+            while buffer.remaining < length:
+                data = self.connection.read_some(max(length - buffer.remaining, self.READ_AHEAD))
+                buffer.write(self.cipher.decrypt(data))
+
+    def read_some(self, max_length: int, /) -> bytearray:
+        """Receive and decrypt at least 1, and at most ``max_length`` bytes."""
+        buffer = self._read_buffer
+        if buffer.remaining == 0:
+            buffer.clear()
+            buffer.write(self.cipher.decrypt(self.connection.read_some(max(max_length, self.READ_AHEAD))))
+
+        return buffer.read(min(max_length, buffer.remaining))
+
+    def write(self, data: bytes) -> None:
+        """Encrypt and send given ``data`` over the connection.
+
+        If the connection is corked (see :meth:`.cork`), the data will only be encrypted and sent out once
+        the outermost cork context is exited.
+        """
+        if not self._corked:
+            self.connection.write(self.cipher.encrypt(data))
+            return
+
+        # The data will only be sent later, make sure it can't be changed in the meantime
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._write_buffer.append(data)
+
+    def flush(self) -> None:
+        """Encrypt and send out all of the data held in the write buffer, and flush the underlying connection."""
+        if self._write_buffer:
+            data = b"".join(self._write_buffer)
+            self._write_buffer = []
+            self.connection.write(self.cipher.encrypt(data))
+        self.connection.flush()
+
+    @contextmanager
+    def cork(self) -> Iterator[None]:
+        """Hold back all of the data written within this context, and encrypt and send it out once it's exited.
+
+        Corking can be nested, in which case the data is sent out once the outermost context is exited.
+        If an exception occurs within the context, the data written within it is discarded, and never encrypted
+        or sent out, so that it can't desynchronize the cipher stream with the other side.
+        """
+        write_buffer = self._write_buffer
+        start = len(write_buffer)
+        self._corked += 1
+        try:
+            yield
+        except BaseException:
+            if self._write_buffer is write_buffer:
+                del write_buffer[start:]
+            else:
+                self._write_buffer = []
+            raise
+        finally:
+            self._corked -= 1
+
+        if not self._corked:
+            self.flush()
+
+    def _close(self) -> None:
+        """Close the underlying connection."""
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+
+class EncryptedAsyncConnection(AsyncConnection):
+    """Asynchronous connection wrapper, encrypting all of the sent data, and decrypting all of the received data.
+
+    Rather than decrypting the data for each read, the received data is read ahead (receiving all of the already
+    available data, up to :attr:`.READ_AHEAD` bytes), and decrypted in a single call, with the reads then being
+    served from the decrypted data. Similarly, all of the data written within the :meth:`.cork` context is
+    encrypted in a single call, once the context is exited.
+    """
+
+    __slots__ = ("connection", "cipher", "_read_buffer", "_write_buffer", "_corked")
+
+    READ_AHEAD = 65536
+
+    def __init__(self, connection: AsyncConnection, cipher: AESCipher):
+        """
+        :param connection: The underlying connection, over which the encrypted data is sent/received.
+        :param cipher: The cipher used to encrypt/decrypt the data.
+        """
+        super().__init__()
+        self.connection = connection
+        self.cipher = cipher
+        self._read_buffer = Buffer()
+        self._write_buffer: list[bytes] = []
+        self._corked = 0
+
+    @classmethod
+    async def make_client(cls, address: tuple[str, int], timeout: float) -> Self:
+        """Encrypted connections can't be created directly, wrap an existing connection instead.
+
+        :raises TypeError: Always, as the encryption is only enabled during the login.
+        """
+        raise TypeError(
+            f"{cls.__name__} can't be created directly, as the encryption is only enabled during the login."
+            f" Wrap an already established connection instead: {cls.__name__}(connection, cipher)."
+        )
+
+    async def read(self, length: int) -> bytearray:
+        """Receive and decrypt data sent through the connection.
+
+        :param length:
+            Amount of bytes to be received. If the requested amount can't be received
+            (server didn't send that much data/server didn't send any data), an :exc:`IOError`
+            will be raised.
+        """
+        await self._fill(length)
+        return self._read_buffer.read(length)
+
+    async def read_into(self, view: memoryview, /) -> None:
+        """Receive and decrypt exactly ``len(view)`` bytes, copying the decrypted data into given ``view``."""
+        await self._fill(len(view))
+        self._read_buffer.read_into(view)
+
+    async def _fill(self, length: int) -> None:
+        """Make sure there are at least ``length`` decrypted bytes in the read buffer, receiving more if needed."""
+        buffer = self._read_buffer
+        if buffer.remaining < length:
+            # Drop the already read data, so that the buffer doesn't keep growing
+            buffer.clear(only_already_read=True)
+            while buffer.remaining < length:
+                data = await self.connection.read_some(max(length - buffer.remaining, self.READ_AHEAD))
+                buffer.write(self.cipher.decrypt(data))
+
+    async def read_some(self, max_length: int, /) -> bytearray:
+        """Receive and decrypt at least 1, and at most ``max_length`` bytes."""
+        buffer = self._read_buffer
+        if buffer.remaining == 0:
+            buffer.clear()
+            buffer.write(self.cipher.decrypt(await self.connection.read_some(max(max_length, self.READ_AHEAD))))
+
+        return buffer.read(min(max_length, buffer.remaining))
+
+    async def write(self, data: bytes) -> None:
+        """Encrypt and send given ``data`` over the connection.
+
+        If the connection is corked (see :meth:`.cork`), the data will only be encrypted and sent out once
+        the outermost cork context is exited.
+        """
+        if not self._corked:
+            await self.connection.write(self.cipher.encrypt(data))
+            return
+
+        # The data will only be sent later, make sure it can't be changed in the meantime
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        self._write_buffer.append(data)
+
+    async def flush(self) -> None:
+        """Encrypt and send out all of the data held in the write buffer, and flush the underlying connection."""
+        if self._write_buffer:
+            data = b"".join(self._write_buffer)
+            self._write_buffer = []
+            await self.connection.write(self.cipher.encrypt(data))
+        await self.connection.flush()
+
+    @asynccontextmanager
+    async def cork(self) -> AsyncIterator[None]:
+        """Hold back all of the data written within this context, and encrypt and send it out once it's exited.
+
+        Corking can be nested, in which case the data is sent out once the outermost context is exited.
+        If an exception occurs within the context, the data written within it is discarded, and never encrypted
+        or sent out, so that it can't desynchronize the cipher stream with the other side.
+        """
+        write_buffer = self._write_buffer
+        start = len(write_buffer)
+        self._corked += 1
+        try:
+            yield
+        except BaseException:
+            if self._write_buffer is write_buffer:
+                del write_buffer[start:]
+            else:
+                self._write_buffer = []
+            raise
+        finally:
+            self._corked -= 1
+
+        if not self._corked:
+            await self.flush()
+
+    async def _close(self) -> None:
+        """Close the underlying connection."""
+        try:
+            await self.flush()
+        finally:
+            await self.connection.close()
@@ -1,18 +1,99 @@
 from __future__ import annotations
 
-from mcproto.packets.interactions import async_read_packet, async_write_packet, sync_read_packet, sync_write_packet
-from mcproto.packets.packet import ClientBoundPacket, GameState, Packet, PacketDirection, ServerBoundPacket
-from mcproto.packets.packet_map import generate_packet_map
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcproto.packets.compression import PacketCompressor
+    from mcproto.packets.connection import AsyncPacketConnection, PacketProtocol
+    from mcproto.packets.dispatch import PacketDispatcher
+    from mcproto.packets.framer import PacketFrame, PacketFramer
+    from mcproto.packets.interactions import (
+        async_read_lazy_packet,
+        async_read_packet,
+        async_read_raw_packet,
+        async_write_packet,
+        sync_read_lazy_packet,
+        sync_read_packet,
+        sync_read_raw_packet,
+        sync_write_packet,
+    )
+    from mcproto.packets.packet import (
+        ClientBoundPacket,
+        GameState,
+        LazyPacket,
+        Packet,
+        PacketDirection,
+        RawPacket,
+        ServerBoundPacket,
+    )
+    from mcproto.packets.packet_map import generate_packet_map
 
 __all__ = [
+    "AsyncPacketConnection",
     "ClientBoundPacket",
     "GameState",
+    "LazyPacket",
     "Packet",
+    "PacketCompressor",
     "PacketDirection",
+    "PacketDispatcher",
+    "PacketFrame",
+    "PacketFramer",
+    "PacketProtocol",
+    "RawPacket",
     "ServerBoundPacket",
+    "async_read_lazy_packet",
     "async_read_packet",
+    "async_read_raw_packet",
     "async_write_packet",
+    "generate_packet_map",
+    "sync_read_lazy_packet",
     "sync_read_packet",
+    "sync_read_raw_packet",
     "sync_write_packet",
-    "generate_packet_map",
 ]
+
+# Modules defining the attributes of this package. These are only imported once the attribute is first accessed,
+# so that importing this package (which also happens when importing any of it's submodules) doesn't import all of
+# the packet modules, along with all of their dependencies.
+_LAZY_ATTRIBUTES = {
+    "AsyncPacketConnection": "mcproto.packets.connection",
+    "ClientBoundPacket": "mcproto.packets.packet",
+    "GameState": "mcproto.packets.packet",
+    "LazyPacket": "mcproto.packets.packet",
+    "Packet": "mcproto.packets.packet",
+    "PacketCompressor": "mcproto.packets.compression",
+    "PacketDirection": "mcproto.packets.packet",
+    "PacketDispatcher": "mcproto.packets.dispatch",
+    "PacketFrame": "mcproto.packets.framer",
+    "PacketFramer": "mcproto.packets.framer",
+    "PacketProtocol": "mcproto.packets.connection",
+    "RawPacket": "mcproto.packets.packet",
+    "ServerBoundPacket": "mcproto.packets.packet",
+    "async_read_lazy_packet": "mcproto.packets.interactions",
+    "async_read_packet": "mcproto.packets.interactions",
+    "async_read_raw_packet": "mcproto.packets.interactions",
+    "async_write_packet": "mcproto.packets.interactions",
+    "sync_read_lazy_packet": "mcproto.packets.interactions",
+    "sync_read_packet": "mcproto.packets.interactions",
+    "sync_read_raw_packet": "mcproto.packets.interactions",
+    "sync_write_packet": "mcproto.packets.interactions",
+    "generate_packet_map": "mcproto.packets.packet_map",
+}
+
+
+def __getattr__(name: str) -> object:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name), name)
+    # Store the attribute in the module, so that any further lookups don't need to go through here
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
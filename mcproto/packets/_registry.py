@@ -0,0 +1,41 @@
+"""Precomputed registry of all of the packet classes, used to build the packet maps.
+
+This file is generated by walking through all of the packet modules, do not edit it manually!
+To regenerate it, run ``poetry run task packet-registry``.
+"""
+from __future__ import annotations
+
+from mcproto.packets.packet import GameState, PacketDirection
+
+__all__ = ["PACKET_REGISTRY"]
+
+# Import paths ("module:ClassName") of the packet classes, for each game state, direction and the first protocol
+# version of a range of protocol versions with the same packets (the range lasts until the next one starts)
+PACKET_REGISTRY: dict[tuple[GameState, PacketDirection, int], dict[int, str]] = {
+    (GameState.HANDSHAKING, PacketDirection.SERVERBOUND, 0): {
+        0x00: "mcproto.packets.handshaking.handshake:Handshake",
+    },
+    (GameState.HANDSHAKING, PacketDirection.CLIENTBOUND, 0): {},
+    (GameState.STATUS, PacketDirection.SERVERBOUND, 0): {
+        0x00: "mcproto.packets.status.status:StatusRequest",
+        0x01: "mcproto.packets.status.ping:PingPong",
+    },
+    (GameState.STATUS, PacketDirection.CLIENTBOUND, 0): {
+        0x00: "mcproto.packets.status.status:StatusResponse",
+        0x01: "mcproto.packets.status.ping:PingPong",
+    },
+    (GameState.LOGIN, PacketDirection.SERVERBOUND, 0): {
+        0x00: "mcproto.packets.login.login:LoginStart",
+        0x01: "mcproto.packets.login.login:LoginEncryptionResponse",
+        0x02: "mcproto.packets.login.login:LoginPluginResponse",
+    },
+    (GameState.LOGIN, PacketDirection.CLIENTBOUND, 0): {
+        0x00: "mcproto.packets.login.login:LoginDisconnect",
+        0x01: "mcproto.packets.login.login:LoginEncryptionRequest",
+        0x02: "mcproto.packets.login.login:LoginSuccess",
+        0x03: "mcproto.packets.login.login:LoginSetCompression",
+        0x04: "mcproto.packets.login.login:LoginPluginRequest",
+    },
+    (GameState.PLAY, PacketDirection.SERVERBOUND, 0): {},
+    (GameState.PLAY, PacketDirection.CLIENTBOUND, 0): {},
+}
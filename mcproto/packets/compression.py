@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+import zlib
+from collections.abc import Callable
+from typing import Optional, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ["MAX_DATA_LENGTH", "OFFLOAD_THRESHOLD", "PacketCompressor"]
+
+R = TypeVar("R")
+
+# Default maximum (uncompressed) data length of compressed packets, matching the limit of the vanilla
+# implementation. This prevents a peer from making us decompress a small packet into a huge amount of data.
+MAX_DATA_LENGTH = 2**23
+
+# Default size of the data, from which the async compression/decompression gets offloaded into a thread pool
+OFFLOAD_THRESHOLD = 2**16
+
+# Maximum amount of offloaded jobs submitted to the thread pool at once (from a single event loop), any further
+# jobs will wait for a free slot, so that the pool's queue can't grow without limit
+_OFFLOAD_WORKERS = os.cpu_count() or 1
+_OFFLOAD_MAX_PENDING = 2 * _OFFLOAD_WORKERS
+
+_offload_executor: Optional[ThreadPoolExecutor] = None
+_offload_executor_lock = threading.Lock()
+_offload_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]
+_offload_slots = weakref.WeakKeyDictionary()
+
+
+def _get_offload_executor() -> ThreadPoolExecutor:
+    """Get the (per-process) thread pool used for offloading compression, creating it on first use."""
+    # Only imported once needed, as it's a costly import, which isn't needed without the offloading
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _offload_executor
+    with _offload_executor_lock:
+        if _offload_executor is None:
+            _offload_executor = ThreadPoolExecutor(_OFFLOAD_WORKERS, thread_name_prefix="mcproto-compression")
+        return _offload_executor
+
+
+def _reset_offload_executor() -> None:
+    """Drop the offload thread pool (and it's lock) inherited from the parent process.
+
+    Only the forking thread survives a fork, so the inherited thread pool wouldn't have any worker threads
+    to run the submitted work (and the lock might've been held by another thread at the time of the fork).
+    """
+    global _offload_executor, _offload_executor_lock
+    _offload_executor = None
+    _offload_executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):  # Not available on Windows (where fork isn't supported at all)
+    os.register_at_fork(after_in_child=_reset_offload_executor)
+
+
+async def _offload(func: Callable[..., R], /, *args: object) -> R:
+    """Run given function in the offload thread pool, waiting for a free slot if too many jobs are pending.
+
+    As zlib releases the GIL while (de)compressing, this allows the work to run on other cores,
+    without blocking the event loop.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    slots = _offload_slots.get(loop)
+    if slots is None:
+        slots = _offload_slots[loop] = asyncio.Semaphore(_OFFLOAD_MAX_PENDING)
+
+    async with slots:
+        return await loop.run_in_executor(_get_offload_executor(), func, *args)
+
+
+class PacketCompressor:
+    """Zlib compression settings for compressed packets of a single connection.
+
+    The protocol requires every compressed packet to be a complete zlib stream, so each packet is compressed
+    with a new zlib compressor. The setup of the compressor has to allocate and initialize all of it's internal
+    state, the size of which depends on ``wbits`` and ``memlevel``. For small packets, this can take as much time
+    as the compression itself, so lowering these can noticeably reduce the compression cost of such packets.
+    """
+
+    __slots__ = (
+        "threshold",
+        "level",
+        "wbits",
+        "memlevel",
+        "max_data_length",
+        "offload_threshold",
+    )
+
+    def __init__(
+        self,
+        threshold: int,
+        *,
+        level: int = -1,
+        wbits: int = zlib.MAX_WBITS,
+        memlevel: int = zlib.DEF_MEM_LEVEL,
+        max_data_length: int = MAX_DATA_LENGTH,
+        offload_threshold: int = OFFLOAD_THRESHOLD,
+    ):
+        """
+        :param threshold:
+            Compression threshold, as set by :class:`~mcproto.packets.login.login.LoginSetCompression`.
+            Packets of this size or bigger will be compressed, smaller ones will be sent uncompressed.
+        :param level: Zlib compression level (0-9, or -1 for zlib's default level).
+        :param wbits:
+            Base two logarithm of the compression window size (9-15). Smaller windows are cheaper to
+            set up and use less memory, at the cost of compression ratio for packets larger than the window.
+            The decompression always supports the full window size, so this only affects our compression.
+        :param memlevel: Amount of memory used for the internal compression state (1-9).
+        :param max_data_length:
+            Maximum allowed uncompressed size of received compressed packets. Packets declaring a bigger size
+            are rejected before anything gets decompressed.
+        :param offload_threshold:
+            Size of the (uncompressed) data, from which the async methods (:meth:`.async_compress` and
+            :meth:`.async_decompress`) run the work in a thread pool, rather than blocking the event loop.
+        """
+        if threshold < 0:
+            raise ValueError(f"Compression threshold can't be negative, got {threshold}.")
+        if not 9 <= wbits <= zlib.MAX_WBITS:
+            raise ValueError(f"Compression wbits must be within 9 and {zlib.MAX_WBITS}, got {wbits}.")
+
+        self.threshold = threshold
+        self.level = level
+        self.wbits = wbits
+        self.memlevel = memlevel
+        self.max_data_length = max_data_length
+        self.offload_threshold = offload_threshold
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress given ``data`` into a complete zlib stream."""
+        # Same as zlib.compress, which however doesn't support setting the memlevel (nor wbits, before python 3.11)
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, self.wbits, self.memlevel)
+        return compressor.compress(data) + compressor.flush()
+
+    async def async_compress(self, data: bytes) -> bytes:
+        """Compress given ``data`` into a complete zlib stream.
+
+        If the ``data`` is at least :attr:`.offload_threshold` bytes long, the compression will run in
+        a thread pool, so that it doesn't block the event loop. Otherwise, this is the same as :meth:`.compress`.
+        """
+        if len(data) < self.offload_threshold:
+            return self.compress(data)
+        return await _offload(self.compress, data)
+
+    async def async_decompress(self, data: bytes, data_length: int) -> bytes:
+        """Decompress zlib compressed ``data``, producing exactly ``data_length`` bytes.
+
+        If the ``data_length`` is at least :attr:`.offload_threshold`, the decompression will run in
+        a thread pool, so that it doesn't block the event loop. Otherwise, this is the same as :meth:`.decompress`.
+        """
+        if data_length < self.offload_threshold:
+            return self.decompress(data, data_length)
+        return await _offload(self.decompress, data, data_length)
+
+    def decompress_head(self, data: bytes, length: int) -> bytes:
+        """Decompress only (at most) the first ``length`` bytes of zlib compressed ``data``.
+
+        This is much cheaper than decompressing all of the data, when only it's start is needed (such as
+        the packet id). Note that the rest of the data isn't validated in any way.
+
+        :raises IOError: If the start of the compressed data is malformed.
+        """
+        try:
+            return zlib.decompressobj().decompress(data, length)
+        except zlib.error as exc:
+            raise IOError(f"Received malformed compressed packet data: {exc}") from exc
+
+    def decompress(self, data: bytes, data_length: int) -> bytes:
+        """Decompress zlib compressed ``data``, producing exactly ``data_length`` bytes.
+
+        The declared ``data_length`` bounds the decompression, so that no more than this amount of data will
+        ever get allocated, even if the compressed data would decompress into something much larger.
+
+        :raises IOError:
+            If the declared ``data_length`` is under the compression threshold, or above the maximum data
+            length, or if the decompressed data doesn't match it.
+        """
+        if data_length < self.threshold:
+            raise IOError(
+                f"Received compressed packet with data length of {data_length}, which is below"
+                f" the compression threshold of {self.threshold}."
+            )
+        if data_length > self.max_data_length:
+            raise IOError(
+                f"Received compressed packet with data length of {data_length}, which is above"
+                f" the maximum allowed data length of {self.max_data_length}."
+            )
+
+        # Unlike compression, setting up a new decompressor is cheap (the window is only allocated once needed)
+        decompressor = zlib.decompressobj()
+        try:
+            decompressed = decompressor.decompress(data, data_length)
+            # The output might've got filled up before the end of the zlib stream (the checksum) was processed,
+            # make sure that there really isn't anything more to decompress (allowing at most 1 extra byte).
+            extra = b"" if decompressor.eof else decompressor.decompress(decompressor.unconsumed_tail, 1)
+        except zlib.error as exc:
+            raise IOError(f"Received malformed compressed packet data: {exc}") from exc
+
+        # If the decompressor didn't reach the end of the zlib stream, the data is larger than declared
+        if extra or not decompressor.eof or len(decompressed) != data_length:
+            raise IOError(
+                f"Received compressed packet with declared data length of {data_length}, which doesn't match"
+                " the actual length of the decompressed data."
+            )
+        return decompressed
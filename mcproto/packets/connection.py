@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+from typing import Optional, Union, cast
+
+from typing_extensions import Self
+
+from mcproto.packets.framer import PacketFramer
+from mcproto.packets.packet import Packet, PacketDirection, RawPacket
+
+__all__ = ["AsyncPacketConnection", "PacketProtocol"]
+
+
+class PacketProtocol(asyncio.BufferedProtocol):
+    """Asyncio buffered protocol, receiving the data into a preallocated buffer, and framing it into packets.
+
+    Unlike with :class:`~asyncio.StreamReader`, the received data isn't first collected into a stream buffer,
+    from which it would then be read (with an await for each read). Instead, the transport receives the data
+    directly into a preallocated buffer, which is passed to a :class:`~mcproto.packets.framer.PacketFramer`
+    right away, producing all of the complete packets at once.
+
+    The received packets are either passed to the ``on_packet`` callback, or held in a queue, from which they
+    can be obtained with :meth:`.read_packet`. Once the queue is full, the transport stops reading, until the
+    queued packets are consumed.
+    """
+
+    __slots__ = (
+        "framer",
+        "transport",
+        "max_queued",
+        "_on_packet",
+        "_buffer",
+        "_packets",
+        "_waiters",
+        "_exception",
+        "_eof",
+        "_reading_paused",
+        "_drain_waiters",
+        "_writing_paused",
+    )
+
+    def __init__(
+        self,
+        framer: PacketFramer,
+        *,
+        buffer_size: int = 65536,
+        max_queued: int = 1024,
+        on_packet: Optional[Callable[[Packet], object]] = None,
+    ):
+        """
+        :param framer: The packet framer, holding the state of the connection.
+        :param buffer_size: Size of the preallocated buffer, into which the data gets received.
+        :param max_queued: Maximum amount of queued packets, after which the transport stops reading.
+        :param on_packet:
+            Callback called with each received packet. If set, the packets aren't queued, and :meth:`.read_packet`
+            can't be used.
+        """
+        if buffer_size <= 0:
+            raise ValueError(f"Buffer size must be a positive number, got {buffer_size}.")
+
+        self.framer = framer
+        self.transport: Optional[asyncio.Transport] = None
+        self.max_queued = max_queued
+        self._on_packet = on_packet
+        self._buffer = memoryview(bytearray(buffer_size))
+        self._packets: deque[Packet] = deque()
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._exception: Optional[BaseException] = None
+        self._eof = False
+        self._reading_paused = False
+        self._drain_waiters: deque[asyncio.Future[None]] = deque()
+        self._writing_paused = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = cast(asyncio.Transport, transport)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        # The framer copies the received data out of the buffer right away, so the same buffer can always be reused
+        return self._buffer
+
+    def buffer_updated(self, nbytes: int) -> None:
+        try:
+            packets = self.framer.receive_packets(self._buffer[:nbytes])
+        except Exception as exc:
+            self._set_exception(exc)
+            cast(asyncio.Transport, self.transport).close()
+            return
+
+        if self._on_packet is not None:
+            for packet in packets:
+                self._on_packet(packet)
+            return
+
+        self._packets.extend(packets)
+        if packets:
+            self._wakeup()
+        if len(self._packets) >= self.max_queued and not self._reading_paused:
+            self._reading_paused = True
+            cast(asyncio.Transport, self.transport).pause_reading()
+
+    def eof_received(self) -> None:
+        self._eof = True
+        self._wakeup()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self._eof = True
+        if exc is not None:
+            self._set_exception(exc)
+        self._wakeup()
+
+        # Wake up the writers too, they will find out about the closed connection once they try to write
+        self._wakeup_drain()
+
+    def pause_writing(self) -> None:
+        self._writing_paused = True
+
+    def resume_writing(self) -> None:
+        self._writing_paused = False
+        self._wakeup_drain()
+
+    @property
+    def queued_packets(self) -> int:
+        """Get the amount of received packets, waiting in the queue to be read with :meth:`.read_packet`."""
+        return len(self._packets)
+
+    async def read_packet(self) -> Packet:
+        """Get the next received packet, waiting for it if it wasn't received yet.
+
+        Multiple readers can wait for a packet at once, each of them will get a different packet.
+
+        :raises IOError: If the connection was closed before another packet was received.
+        """
+        while not self._packets:
+            if self._exception is not None:
+                raise self._exception
+            if self._eof:
+                raise IOError("Connection was closed before another packet was received.")
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            finally:
+                self._waiters.remove(waiter)
+
+        packet = self._packets.popleft()
+        if self._reading_paused and len(self._packets) <= self.max_queued // 2:
+            self._reading_paused = False
+            cast(asyncio.Transport, self.transport).resume_reading()
+        return packet
+
+    def write_packet(self, packet: Union[Packet, RawPacket]) -> None:
+        """Send given ``packet`` (without waiting for the write buffer to drain, see :meth:`.drain`)."""
+        if self.transport is None or self.transport.is_closing():
+            raise IOError("Connection is closed.")
+        self.transport.write(self.framer.send_packet(packet))
+
+    async def drain(self) -> None:
+        """Wait until the transport's write buffer is drained, if it went over the high water mark.
+
+        Multiple writers can wait for the drain at once, all of them are woken up once the buffer is drained.
+        """
+        if not self._writing_paused:
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            self._drain_waiters.remove(waiter)
+
+    def _wakeup(self) -> None:
+        # Wake up all of the readers, the ones which don't get a packet will simply wait again
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _wakeup_drain(self) -> None:
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _set_exception(self, exc: BaseException) -> None:
+        self._exception = exc
+        self._wakeup()
+
+
+class AsyncPacketConnection:
+    """Asynchronous packet connection, using :class:`.PacketProtocol`.
+
+    Unlike :class:`~mcproto.connection.TCPAsyncConnection` (which works with raw data), this connection
+    works with whole packets, framed by a :class:`~mcproto.packets.framer.PacketFramer`.
+    """
+
+    __slots__ = ("transport", "protocol", "timeout")
+
+    def __init__(self, transport: asyncio.Transport, protocol: PacketProtocol, timeout: float):
+        """
+        :param transport: The transport, over which the data is sent/received.
+        :param protocol: The protocol handling the received data.
+        :param timeout: Amount of seconds to wait for a packet when reading.
+        """
+        self.transport = transport
+        self.protocol = protocol
+        self.timeout = timeout
+
+    @classmethod
+    async def make_client(
+        cls,
+        address: tuple[str, int],
+        timeout: float,
+        *,
+        framer: Optional[PacketFramer] = None,
+        buffer_size: int = 65536,
+        max_queued: int = 1024,
+    ) -> Self:
+        """Construct a client connection (Client -> Server) to given server ``address``.
+
+        :param address: Address of the server to connection to.
+        :param timeout:
+            Amount of seconds to wait for the connection to be established.
+            If connection can't be established within this time, :exc:`TimeoutError` will be raised.
+            This timeout is then also used for any further packet receiving.
+        :param framer: The packet framer, by default, a new client framer (in the handshaking state) is used.
+        :param buffer_size: Size of the preallocated receive buffer, see :class:`.PacketProtocol`.
+        :param max_queued: Maximum amount of queued packets, see :class:`.PacketProtocol`.
+        """
+        if framer is None:
+            framer = PacketFramer(PacketDirection.CLIENTBOUND)
+
+        loop = asyncio.get_running_loop()
+        conn = loop.create_connection(
+            lambda: PacketProtocol(framer, buffer_size=buffer_size, max_queued=max_queued),
+            address[0],
+            address[1],
+        )
+        transport, protocol = await asyncio.wait_for(conn, timeout=timeout)
+        return cls(transport, protocol, timeout)
+
+    @property
+    def framer(self) -> PacketFramer:
+        """Get the packet framer, holding the state of the connection."""
+        return self.protocol.framer
+
+    async def read_packet(self) -> Packet:
+        """Receive the next packet.
+
+        If no packet is received within the :attr:`.timeout`, :exc:`asyncio.TimeoutError` will be raised.
+        """
+        if self.protocol.queued_packets:
+            # The packet is already here, this read won't need to wait, avoid setting up a timeout
+            return await self.protocol.read_packet()
+        return await asyncio.wait_for(self.protocol.read_packet(), timeout=self.timeout)
+
+    async def write_packet(self, packet: Union[Packet, RawPacket]) -> None:
+        """Send given ``packet``, waiting for the write buffer to drain, if it went over the high water mark."""
+        self.protocol.write_packet(packet)
+        await self.protocol.drain()
+
+    async def close(self) -> None:
+        """Close the connection (it cannot be used after this)."""
+        self.transport.close()
+
+    async def __aenter__(self) -> Self:
+        if self.transport.is_closing():
+            raise IOError("Connection already closed.")
+        return self
+
+    async def __aexit__(self, *a, **kw) -> None:
+        await self.close()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import inspect
+from collections.abc import Callable
+from typing import Any, Optional
+
+from typing_extensions import TypeAlias
+
+from mcproto.packets.packet import GameState, Packet, PacketDirection
+from mcproto.packets.packet_map import _version_range_packet_maps, generate_packet_map
+
+__all__ = ["PacketDispatcher"]
+
+# Packet handler, called with the packet, either synchronous, or asynchronous (returning an awaitable)
+PacketHandler: TypeAlias = "Callable[[Any], object]"
+
+
+class PacketDispatcher:
+    """Dispatcher of received packets into handlers registered for their packet classes (or packet ids).
+
+    The handlers are held in a table indexed by the game state and the packet id (for the single direction
+    of the received packets), which means the dispatch takes the same (constant) time, no matter how many
+    handlers are registered, unlike a chain of ``isinstance`` checks.
+
+    The handlers can either be synchronous, or asynchronous, in which case :meth:`.async_dispatch` needs to
+    be used, in order to await them.
+    """
+
+    __slots__ = ("direction", "fallback", "_handlers")
+
+    def __init__(self, direction: PacketDirection, *, fallback: Optional[PacketHandler] = None):
+        """
+        :param direction:
+            Direction of the dispatched packets, i.e. :attr:`~mcproto.packets.packet.PacketDirection.CLIENTBOUND`
+            when used by a client, or :attr:`~mcproto.packets.packet.PacketDirection.SERVERBOUND` by a server.
+        :param fallback: Handler called for the packets without a registered handler.
+        """
+        self.direction = direction
+        self.fallback = fallback
+        # Handlers for each game state, indexed by the packet id (None for packets without a handler)
+        self._handlers: list[list[Optional[PacketHandler]]] = [[] for _ in GameState]
+
+    def register(
+        self,
+        packet_class: type[Packet],
+        handler: PacketHandler,
+        *,
+        protocol_version: Optional[int] = None,
+    ) -> None:
+        """Register a ``handler`` for the packets of given ``packet_class``.
+
+        This replaces any handler previously registered for the same packet.
+
+        :param protocol_version:
+            The protocol version of the connection, in which the packet needs to exist. If not set, the packet
+            only needs to exist in any of the supported protocol versions.
+        :raises ValueError:
+            If the packet class isn't one of the packets of the dispatcher's direction (in given protocol version),
+            or if the protocol version isn't supported.
+        """
+        if protocol_version is None:
+            packet_maps = _version_range_packet_maps(self.direction, packet_class.GAME_STATE)
+        else:
+            packet_maps = [generate_packet_map(self.direction, packet_class.GAME_STATE, protocol_version)]
+
+        if not any(packet_map.get(packet_class.PACKET_ID) is packet_class for packet_map in packet_maps):
+            version_info = "" if protocol_version is None else f" in protocol version {protocol_version}"
+            raise ValueError(f"{packet_class.__name__} isn't a {self.direction.name.lower()} packet{version_info}.")
+
+        self.register_id(packet_class.GAME_STATE, packet_class.PACKET_ID, handler)
+
+    def register_id(self, game_state: GameState, packet_id: int, handler: PacketHandler) -> None:
+        """Register a ``handler`` for the packets with given ``packet_id`` in given ``game_state``.
+
+        Unlike :meth:`.register`, this also works with packets unknown to mcproto, which can be dispatched
+        as :class:`~mcproto.packets.packet.RawPacket` with :meth:`.dispatch_id`.
+        """
+        if packet_id < 0:
+            raise ValueError(f"Packet id can't be negative, got {packet_id}.")
+
+        handlers = self._handlers[game_state]
+        if packet_id >= len(handlers):
+            handlers.extend([None] * (packet_id + 1 - len(handlers)))
+        handlers[packet_id] = handler
+
+    def get_handler(self, game_state: GameState, packet_id: int) -> Optional[PacketHandler]:
+        """Get the handler for the packets with given ``packet_id`` in given ``game_state``.
+
+        If there's no handler registered for the packet, the :attr:`.fallback` handler is returned.
+        """
+        handlers = self._handlers[game_state]
+        if 0 <= packet_id < len(handlers):
+            handler = handlers[packet_id]
+            if handler is not None:
+                return handler
+        return self.fallback
+
+    def dispatch(self, packet: Packet) -> object:
+        """Call the handler registered for given ``packet``, returning it's result.
+
+        If the packet has no handler (and there's no :attr:`.fallback` handler), nothing is called and ``None``
+        is returned. Note that for asynchronous handlers, the returned awaitable isn't awaited.
+        """
+        return self.dispatch_id(packet.GAME_STATE, packet.PACKET_ID, packet)
+
+    def dispatch_id(self, game_state: GameState, packet_id: int, packet: object) -> object:
+        """Call the handler registered for the packets with given ``packet_id`` in given ``game_state``.
+
+        This allows dispatching packets by their id, including the packets which aren't deserialized
+        (:class:`~mcproto.packets.packet.LazyPacket` or :class:`~mcproto.packets.packet.RawPacket`), which
+        are passed to the handler as is. See :meth:`.dispatch` for more info.
+        """
+        handler = self.get_handler(game_state, packet_id)
+        if handler is None:
+            return None
+        return handler(packet)
+
+    async def async_dispatch(self, packet: Packet) -> object:
+        """Call the handler registered for given ``packet``, awaiting it, if it's an asynchronous handler.
+
+        See :meth:`.dispatch` for more info.
+        """
+        result = self.dispatch_id(packet.GAME_STATE, packet.PACKET_ID, packet)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def async_dispatch_id(self, game_state: GameState, packet_id: int, packet: object) -> object:
+        """Call the handler registered for the packets with given ``packet_id`` in given ``game_state``.
+
+        This works like :meth:`.dispatch_id`, except that asynchronous handlers are awaited.
+        """
+        result = self.dispatch_id(game_state, packet_id, packet)
+        if inspect.isawaitable(result):
+            return await result
+        return result
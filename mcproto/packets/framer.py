@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Set
+from typing import NamedTuple, Optional, TYPE_CHECKING, Union
+
+from mcproto.buffer import Buffer
+from mcproto.packets.compression import PacketCompressor
+from mcproto.packets.handshaking.handshake import Handshake, NextState
+from mcproto.packets.interactions import (
+    _decompress_packet_data,
+    _deserialize_packet_data,
+    _lazy_packet_data,
+    _peek_packet_id,
+    _serialize_packet,
+)
+from mcproto.packets.login.login import LoginSetCompression, LoginSuccess
+from mcproto.packets.packet import GameState, LazyPacket, Packet, PacketDirection, RawPacket
+from mcproto.packets.packet_map import generate_packet_map
+
+if TYPE_CHECKING:
+    from mcproto.encryption import AESCipher
+
+__all__ = ["MAX_FRAME_LENGTH", "PacketFrame", "PacketFramer"]
+
+# Maximum length of a packet frame, allowed by the protocol, and the maximum size of it's length prefix (a varint
+# of up to 3 bytes, which is exactly enough to hold this length). This limits how much data we'll buffer for a
+# single frame, before it's fully received.
+MAX_FRAME_LENGTH = 2**21 - 1
+_MAX_LENGTH_SIZE = 3
+
+# Packets which affect the state of the connection, these always get deserialized, even when only
+# reading the raw packet frames, so that the state can be tracked
+_STATE_PACKETS = (Handshake, LoginSetCompression, LoginSuccess)
+
+
+class PacketFrame(NamedTuple):
+    """A single raw (but already decrypted and decompressed) packet frame."""
+
+    packet_id: int
+    #: The internal packet data (without the packet id)
+    data: Buffer
+
+
+class PacketFramer:
+    """Sans-IO packet framer, tracking the state of a single connection.
+
+    Rather than reading the data from a connection itself, arbitrary chunks of the received data are passed in
+    with :meth:`.receive_data`, after which the complete packets can be obtained with :meth:`.next_packet` (or
+    as raw packet frames with :meth:`.next_frame`). Similarly, the packets to be sent are serialized into bytes
+    with :meth:`.send_packet`, which then need to be sent over the connection. This makes the framer usable with
+    any kind of transport (asyncio protocols, selectors, plain sockets, ...).
+
+    The framer tracks the game state, switching to the appropriate packet map automatically once the
+    :class:`~mcproto.packets.handshaking.handshake.Handshake` or
+    :class:`~mcproto.packets.login.login.LoginSuccess` packets are received or sent. The packet maps are
+    selected for the protocol version from the handshake, only once for each game state. The compression is enabled
+    once :class:`~mcproto.packets.login.login.LoginSetCompression` is received or sent. The encryption needs to
+    be enabled explicitly, with :meth:`.enable_encryption`.
+    """
+
+    __slots__ = (
+        "direction",
+        "protocol_version",
+        "compressor",
+        "compressor_factory",
+        "cipher",
+        "_game_state",
+        "_packet_map",
+        "_buffer",
+    )
+
+    def __init__(
+        self,
+        direction: PacketDirection,
+        *,
+        game_state: GameState = GameState.HANDSHAKING,
+        protocol_version: Optional[int] = None,
+        compressor: Optional[PacketCompressor] = None,
+        compressor_factory: Callable[[int], PacketCompressor] = PacketCompressor,
+        cipher: Optional[AESCipher] = None,
+    ):
+        """
+        :param direction:
+            Direction of the received packets, i.e. :attr:`~mcproto.packets.packet.PacketDirection.CLIENTBOUND`
+            when used by a client, or :attr:`~mcproto.packets.packet.PacketDirection.SERVERBOUND` by a server.
+        :param game_state: The initial game state.
+        :param protocol_version:
+            The protocol version, if the handshake already happened. Otherwise, it's set from the handshake,
+            and until then, the packet maps of the latest protocol version are used.
+        :param compressor: Compression state, if the compression is already enabled.
+        :param compressor_factory:
+            Function called with the compression threshold (from
+            :class:`~mcproto.packets.login.login.LoginSetCompression`), producing the compressor to be used
+            once the compression is enabled. This allows configuring the other compression settings, such as
+            the ``max_data_length`` or ``offload_threshold``, e.g. with
+            ``functools.partial(PacketCompressor, max_data_length=...)``.
+        :param cipher: Cipher used for encryption, if the encryption is already enabled.
+        """
+        self.direction = direction
+        self.protocol_version = protocol_version
+        self.compressor = compressor
+        self.compressor_factory = compressor_factory
+        self.cipher = cipher
+        self._buffer = Buffer()
+        self.game_state = game_state
+
+    @property
+    def game_state(self) -> GameState:
+        """Get the current game state."""
+        return self._game_state
+
+    @game_state.setter
+    def game_state(self, game_state: GameState) -> None:
+        """Switch to given game state, selecting the packet map for it."""
+        self._game_state = game_state
+        self._packet_map = generate_packet_map(self.direction, game_state, self.protocol_version)
+
+    @property
+    def packet_map(self) -> Mapping[int, type[Packet]]:
+        """Get the packet map of the received packets for the current game state and protocol version."""
+        return self._packet_map
+
+    @property
+    def buffered(self) -> int:
+        """Get the amount of received bytes, which weren't yet consumed as a packet frame."""
+        return self._buffer.remaining
+
+    def enable_encryption(self, cipher: AESCipher) -> None:
+        """Enable encryption of all of the further sent and received data, using given ``cipher``.
+
+        Any data which was already received, but wasn't yet consumed as a packet frame, will be decrypted too.
+        """
+        self.cipher = cipher
+        buf = self._buffer
+        if buf.remaining:
+            buf[buf.pos :] = cipher.decrypt(buf[buf.pos :])
+
+    def receive_data(self, data: bytes) -> None:
+        """Pass in a chunk of data received from the connection."""
+        if self.cipher is not None:
+            data = self.cipher.decrypt(data)
+        # Drop the already consumed frames from the start of the buffer (this doesn't require moving the
+        # remaining data), doing this once per received chunk rather than after each consumed frame
+        self._buffer.clear(only_already_read=True)
+        self._buffer.write(data)
+
+    def next_frame(self) -> Optional[PacketFrame]:
+        """Get the next complete raw packet frame, or ``None`` if it wasn't yet fully received.
+
+        Packets affecting the state of the connection are still deserialized, in order to keep track of the state.
+        """
+        data = self._next_frame_data()
+        if data is None:
+            return None
+
+        frame = self._split_frame(data)
+        packet_class = self._state_packet_class(frame.packet_id)
+        if packet_class is not None:
+            self._update_state(packet_class.deserialize(Buffer(frame.data)))
+        return frame
+
+    def next_packet(self) -> Optional[Packet]:
+        """Get the next complete packet, or ``None`` if it wasn't yet fully received."""
+        data = self._next_frame_data()
+        if data is None:
+            return None
+
+        if self.compressor is not None:
+            data = _decompress_packet_data(data, self.compressor)
+        packet = _deserialize_packet_data(data, self.packet_map)
+        self._update_state(packet)
+        return packet
+
+    def next_lazy_packet(self, packet_ids: Optional[Set[int]] = None) -> Optional[LazyPacket[Packet]]:
+        """Get the next complete packet, which only gets deserialized once it's needed.
+
+        See :class:`~mcproto.packets.packet.LazyPacket` for more info. Packets affecting the state of the
+        connection are still deserialized right away, in order to keep track of the state.
+
+        :param packet_ids:
+            Ids of the packets to produce. Packets with any other ids are skipped, without being decompressed
+            (beyond the packet id) or deserialized. If not set, no packets are skipped.
+        :return: The lazy packet, or ``None`` if no (matching) packet was yet fully received.
+        """
+        while (data := self._next_frame_data()) is not None:
+            if packet_ids is not None:
+                packet_id = _peek_packet_id(data, compressor=self.compressor)
+                if packet_id not in packet_ids and self._state_packet_class(packet_id) is None:
+                    continue
+
+            if self.compressor is not None:
+                data = _decompress_packet_data(data, self.compressor)
+            lazy_packet = _lazy_packet_data(data, self.packet_map)
+            if self._state_packet_class(lazy_packet.packet_id) is not None:
+                self._update_state(lazy_packet.decode())
+
+            if packet_ids is None or lazy_packet.packet_id in packet_ids:
+                return lazy_packet
+        return None
+
+    def receive_packets(self, data: bytes) -> list[Packet]:
+        """Pass in a chunk of data received from the connection, and get all of the now complete packets."""
+        self.receive_data(data)
+        packets: list[Packet] = []
+        while (packet := self.next_packet()) is not None:
+            packets.append(packet)
+        return packets
+
+    def send_packet(self, packet: Union[Packet, RawPacket]) -> bytes:
+        """Serialize given ``packet`` into the data to be sent over the connection.
+
+        Raw packets are sent as is, without any serialization (see :class:`~mcproto.packets.packet.RawPacket`).
+        Raw packets affecting the state of the connection are still deserialized, in order to keep track of the state.
+        """
+        data = _serialize_packet(packet, compressor=self.compressor)
+        self._update_state(packet, sent=True)
+        if self.cipher is not None:
+            return self.cipher.encrypt(data)
+        return bytes(data)
+
+    def _next_frame_data(self) -> Optional[Buffer]:
+        """Consume the next complete packet frame from the received data, without the length prefix.
+
+        :return: The frame data, or ``None`` if the packet wasn't yet fully received.
+        :raises IOError: If the packet length is over the :data:`.MAX_FRAME_LENGTH`.
+        """
+        buf = self._buffer
+        start = buf.pos
+
+        if start == len(buf):
+            return None
+
+        # Decode the length prefix in place, to find out whether the whole frame is already here
+        length = buf[start]
+        pos = start + 1
+        if length & 0x80:
+            # Multi-byte length prefix (the single byte one, used by all packets under 128 bytes, is handled above)
+            length &= 0x7F
+            end = min(len(buf), start + _MAX_LENGTH_SIZE)
+            while True:
+                if pos == end:
+                    if end - start == _MAX_LENGTH_SIZE:
+                        raise IOError(f"Received packet length was over the maximum of {MAX_FRAME_LENGTH} bytes.")
+                    return None
+                byte = buf[pos]
+                length |= (byte & 0x7F) << (7 * (pos - start))
+                pos += 1
+                if not byte & 0x80:
+                    break
+
+        if len(buf) - pos < length:
+            return None
+
+        buf.pos = pos
+        with buf.read_view(length) as view:
+            return Buffer(view)
+
+    def _split_frame(self, data: Buffer) -> PacketFrame:
+        """Split the packet frame data into the packet id and the internal packet data, decompressing it if needed."""
+        if self.compressor is not None:
+            data = _decompress_packet_data(data, self.compressor)
+        packet_id = data.read_varint()
+        data.clear(only_already_read=True)
+        return PacketFrame(packet_id, data)
+
+    def _state_packet_class(self, packet_id: int, *, sent: bool = False) -> Optional[type[Packet]]:
+        """Get the class of the packet with given id, if it's a packet affecting the connection state.
+
+        :param sent: Whether the packet is sent (rather than received), i.e. whether it goes in the other direction.
+        """
+        if self.game_state not in (GameState.HANDSHAKING, GameState.LOGIN):
+            return None
+
+        if sent:
+            direction = PacketDirection(1 - self.direction)  # The opposite direction
+            packet_map = generate_packet_map(direction, self.game_state, self.protocol_version)
+        else:
+            packet_map = self.packet_map
+        packet_class = packet_map.get(packet_id)
+        if packet_class is not None and issubclass(packet_class, _STATE_PACKETS):
+            return packet_class
+        return None
+
+    def _update_state(self, packet: Union[Packet, RawPacket], *, sent: bool = False) -> None:
+        """Update the state of the connection, based on given (sent or received) ``packet``.
+
+        Raw packets are deserialized for this, if their id is one of the packets affecting the state.
+
+        :param sent: Whether the packet is sent (rather than received), i.e. whether it goes in the other direction.
+        :raises IOError: If the packet is a handshake with an unsupported protocol version.
+        """
+        if self.game_state not in (GameState.HANDSHAKING, GameState.LOGIN):
+            # None of the packets affecting the state can be sent in the other states, skip the type checks
+            return
+
+        if isinstance(packet, RawPacket):
+            packet_class = self._state_packet_class(packet.packet_id, sent=sent)
+            if packet_class is None:
+                return
+            packet = packet_class.deserialize(Buffer(packet.data))
+
+        if isinstance(packet, Handshake):
+            game_state = GameState.STATUS if packet.next_state is NextState.STATUS else GameState.LOGIN
+            # The protocol version comes from the peer, make sure it's supported, before switching to it
+            try:
+                generate_packet_map(self.direction, game_state, packet.protocol_version)
+            except ValueError as exc:
+                raise IOError(f"Handshake with an unsupported protocol version: {packet.protocol_version}.") from exc
+            self.protocol_version = packet.protocol_version
+            self.game_state = game_state
+        elif isinstance(packet, LoginSetCompression):
+            self.compressor = self.compressor_factory(packet.threshold) if packet.threshold >= 0 else None
+        elif isinstance(packet, LoginSuccess):
+            self.game_state = GameState.PLAY
@@ -1,13 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from enum import IntEnum
 from typing import ClassVar, Union, final
 
-from typing_extensions import Self
-
-from mcproto.buffer import Buffer
 from mcproto.packets.packet import GameState, ServerBoundPacket
 from mcproto.protocol.base_io import StructFormat
+from mcproto.protocol.schema import Field, StructType, UTF, VARINT
 
 __all__ = [
     "NextState",
@@ -29,6 +28,13 @@ class Handshake(ServerBoundPacket):
 
     __slots__ = ("protocol_version", "server_address", "server_port", "next_state")
 
+    FIELDS: ClassVar[Sequence[Field]] = (
+        Field("protocol_version", VARINT),
+        Field("server_address", UTF),
+        Field("server_port", StructType(StructFormat.USHORT)),
+        Field("next_state", VARINT),
+    )
+
     def __init__(
         self,
         *,
@@ -54,20 +60,3 @@ class Handshake(ServerBoundPacket):
         self.server_address = server_address
         self.server_port = server_port
         self.next_state = next_state
-
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_varint(self.protocol_version)
-        buf.write_utf(self.server_address)
-        buf.write_value(StructFormat.USHORT, self.server_port)
-        buf.write_varint(self.next_state.value)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        return cls(
-            protocol_version=buf.read_varint(),
-            server_address=buf.read_utf(),
-            server_port=buf.read_value(StructFormat.USHORT),
-            next_state=buf.read_varint(),
-        )
@@ -1,14 +1,29 @@
 from __future__ import annotations
 
-import gzip
-from collections.abc import Mapping
-from typing import TypeVar
+from collections.abc import Mapping, Set
+from typing import Optional, TypeVar, Union
 
 from mcproto.buffer import Buffer
-from mcproto.packets.packet import Packet
-from mcproto.protocol.base_io import BaseAsyncReader, BaseAsyncWriter, BaseSyncReader, BaseSyncWriter
+from mcproto.packets.compression import PacketCompressor
+from mcproto.packets.packet import LazyPacket, Packet, RawPacket
+from mcproto.protocol.base_io import (
+    BaseAsyncReader,
+    BaseAsyncWriter,
+    BaseSyncReader,
+    BaseSyncWriter,
+    _encode_varint,
+)
 
-__all__ = ["async_read_packet", "async_write_packet", "sync_read_packet", "sync_write_packet"]
+__all__ = [
+    "async_read_lazy_packet",
+    "async_read_packet",
+    "async_read_raw_packet",
+    "async_write_packet",
+    "sync_read_lazy_packet",
+    "sync_read_packet",
+    "sync_read_raw_packet",
+    "sync_write_packet",
+]
 
 T_Packet = TypeVar("T_Packet", bound=Packet)
 
@@ -19,78 +34,381 @@ T_Packet = TypeVar("T_Packet", bound=Packet)
 # | Packet ID   | 32-bit varint |                                       |
 # | Data        | byte array    | Internal data to packet of given id   |
 
+# COMPRESSED PACKET FORMAT (used once compression threshold was set with LoginSetCompression):
+# | Field name  | Field type    | Notes                                                           |
+# |-------------|---------------|-----------------------------------------------------------------|
+# | Length      | 32-bit varint | Length (in bytes) of Data Length + (compressed) PacketID + Data |
+# | Data Length | 32-bit varint | Length of uncompressed PacketID + Data, or 0 if not compressed  |
+# | Packet ID   | 32-bit varint | Zlib compressed along with data (unless data length is 0)       |
+# | Data        | byte array    | Zlib compressed along with packet id (unless data length is 0)  |
+
+# Amount of bytes reserved at the start of the packet buffer for the length prefix,
+# which is the maximum size of a 32-bit varint
+_LENGTH_RESERVE = 5
+
+# Maximum size of the packet id (32-bit varint)
+_MAX_PACKET_ID_SIZE = 5
 
 # Since the read functions here require PACKET_MAP, we can't move these functions
 # directly into BaseWriter/BaseReader classes, as that would be a circular import
 
 
-def _serialize_packet(packet: Packet, *, compressed: bool = False) -> Buffer:
-    """Serialize the internal packet data, along with it's packet id."""
-    packet_data = packet.serialize()
-
-    # Base packet buffer should only contain packet id and internal packet data
-    packet_buf = Buffer()
-    packet_buf.write_varint(packet.PACKET_ID)
-    packet_buf.write(packet_data)
+def _serialize_packet_data(packet: Union[Packet, RawPacket], *, compressed: bool) -> tuple[Buffer, int]:
+    """Serialize the packet id and internal packet data into a new buffer, after a reserved header space.
 
-    # If we're serializing a packet as compressed, we compress the packet buffer data
-    # and prepend a varint with the size of uncompressed pacekt buffer
-    if compressed:
-        data_length = len(packet_buf)
-        packet_buf = Buffer(gzip.compress(packet_buf))
+    :param compressed:
+        Whether the compressed packet format is used, in which case an extra byte will be reserved for the data
+        length. It will stay as 0 (marking an uncompressed packet), unless the packet gets compressed.
+    :return: The packet buffer and the size of the reserved header space at it's start.
+    """
+    header_size = _LENGTH_RESERVE + 1 if compressed else _LENGTH_RESERVE
 
-        data_buf = Buffer()
-        data_buf.write_varint(data_length)
-        data_buf.write(packet_buf)
-        return data_buf
+    packet_buf = Buffer(header_size)
+    if isinstance(packet, RawPacket):
+        packet_buf.write_varint(packet.packet_id)
+        packet_buf.write(packet.data)
     else:
-        return packet_buf
+        packet_buf.write_varint(packet.PACKET_ID)
+        packet.serialize_into(packet_buf)
+    return packet_buf, header_size
+
+
+def _compressed_packet_data(data_length: int, compressed_data: bytes) -> Buffer:
+    """Produce a packet buffer with given compressed data, prepended by the uncompressed data length."""
+    packet_buf = Buffer(_LENGTH_RESERVE)
+    packet_buf.write_varint(data_length)
+    packet_buf.write(compressed_data)
+    return packet_buf
+
+
+def _forwarded_packet_data(packet: RawPacket, compressor: Optional[PacketCompressor]) -> Optional[Buffer]:
+    """Produce a packet buffer with the original compressed data of the raw packet, if it can be reused.
+
+    That's the case when the packet was received compressed, and it's being written with the same compression
+    threshold, which means the packet would end up compressed again anyway.
+
+    :return: The packet buffer, or ``None`` if the compressed data can't be reused.
+    """
+    if compressor is None or packet.compressed_data is None or packet.compression_threshold != compressor.threshold:
+        return None
+
+    packet_buf = Buffer(_LENGTH_RESERVE)
+    packet_buf.write(packet.compressed_data)
+    return packet_buf
+
+
+def _frame_packet(packet_buf: Buffer) -> memoryview:
+    """Back-patch the length prefix into the reserved header space of the packet buffer.
+
+    :return: A view of the whole packet frame, starting at the length prefix.
+    """
+    length_prefix = _encode_varint(len(packet_buf) - _LENGTH_RESERVE, bits=32)
+    start = _LENGTH_RESERVE - len(length_prefix)
+    packet_buf[start:_LENGTH_RESERVE] = length_prefix
+    return memoryview(packet_buf)[start:]
+
+
+def _serialize_packet(
+    packet: Union[Packet, RawPacket],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> memoryview:
+    """Serialize the whole packet frame, including the length prefix, packet id and internal packet data.
+
+    The packet is serialized in a single pass, directly into one buffer, which starts with a few reserved
+    bytes for the length prefix. Once the packet is serialized and it's length is known, the length varint
+    is back-patched into the end of this reserved space. The returned view then starts at the beginning of
+    this varint, so that the whole frame can be written at once, without copying it into yet another buffer.
+
+    :param compressor:
+        Compression state of the connection, if compression is enabled. Packets over it's threshold will
+        be compressed, smaller ones will be sent uncompressed (with the data length set to 0). If not set,
+        the uncompressed packet format is used.
+    """
+    if isinstance(packet, RawPacket) and (forwarded_buf := _forwarded_packet_data(packet, compressor)) is not None:
+        return _frame_packet(forwarded_buf)
+
+    packet_buf, header_size = _serialize_packet_data(packet, compressed=compressor is not None)
+
+    # If the packet is over the compression threshold, we compress the packet buffer data
+    # and prepend a varint with the size of uncompressed packet buffer
+    data_length = len(packet_buf) - header_size
+    if compressor is not None and data_length >= compressor.threshold:
+        with memoryview(packet_buf) as view:
+            packet_buf = _compressed_packet_data(data_length, compressor.compress(view[header_size:]))
+
+    return _frame_packet(packet_buf)
+
+
+async def _async_serialize_packet(
+    packet: Union[Packet, RawPacket],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> memoryview:
+    """Serialize the whole packet frame, running the compression of large packets in a thread pool.
+
+    See :func:`_serialize_packet` for more info.
+    """
+    if isinstance(packet, RawPacket) and (forwarded_buf := _forwarded_packet_data(packet, compressor)) is not None:
+        return _frame_packet(forwarded_buf)
+
+    packet_buf, header_size = _serialize_packet_data(packet, compressed=compressor is not None)
+
+    data_length = len(packet_buf) - header_size
+    if compressor is not None and data_length >= compressor.threshold:
+        with memoryview(packet_buf) as view:
+            packet_buf = _compressed_packet_data(data_length, await compressor.async_compress(view[header_size:]))
+
+    return _frame_packet(packet_buf)
+
+
+def _deserialize_packet_data(buf: Buffer, packet_map: Mapping[int, type[T_Packet]]) -> T_Packet:
+    """Deserialize the (uncompressed) packet id and it's internal data."""
+    packet_id = buf.read_varint()
+
+    # Rather than copying the remaining packet data into a new buffer, just drop the already read
+    # packet id from the start of this buffer (which doesn't require moving the data) and pass it on
+    buf.clear(only_already_read=True)
+    return packet_map[packet_id].deserialize(buf)
+
+
+def _decompress_packet_data(buf: Buffer, compressor: PacketCompressor) -> Buffer:
+    """Decompress the packet data (in the compressed packet format), producing the packet id and internal data.
+
+    If the packet isn't compressed (it's data length is 0), the same buffer is returned, with the data length
+    already read from it.
+    """
+    data_length = buf.read_varint()
+    # Data length of 0 means the packet wasn't compressed (it's under the threshold)
+    if data_length == 0:
+        return buf
+
+    with buf.read_view(buf.remaining) as compressed_packet_data:
+        return Buffer(compressor.decompress(compressed_packet_data, data_length))
 
 
 def _deserialize_packet(
-    buf: Buffer, packet_map: Mapping[int, type[T_Packet]], *, compressed: bool = False
+    buf: Buffer,
+    packet_map: Mapping[int, type[T_Packet]],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> T_Packet:
+    """Deserialize the packet id and it's internal data, decompressing it first if needed."""
+    if compressor is not None:
+        buf = _decompress_packet_data(buf, compressor)
+
+    return _deserialize_packet_data(buf, packet_map)
+
+
+async def _async_deserialize_packet(
+    buf: Buffer,
+    packet_map: Mapping[int, type[T_Packet]],
+    *,
+    compressor: Optional[PacketCompressor] = None,
 ) -> T_Packet:
-    """Deserialize the packet id and it's internal data."""
-    if compressed:
-        buf.read_varint()  # We don't need this uncompressed length
-        compressd_packet_data = buf.read(buf.remaining)
-        buf = Buffer(gzip.decompress(compressd_packet_data))
+    """Deserialize the packet, running the decompression of large packets in a thread pool.
+
+    See :func:`_deserialize_packet` for more info.
+    """
+    if compressor is not None:
+        data_length = buf.read_varint()
+        if data_length != 0:
+            with buf.read_view(buf.remaining) as compressed_packet_data:
+                buf = Buffer(await compressor.async_decompress(compressed_packet_data, data_length))
+
+    return _deserialize_packet_data(buf, packet_map)
+
+
+def _peek_packet_id(buf: Buffer, *, compressor: Optional[PacketCompressor] = None) -> int:
+    """Get the packet id from the packet frame data, without consuming any of it.
+
+    For compressed packets, only the start of the data holding the packet id gets decompressed.
+    """
+    pos = buf.pos
+    try:
+        if compressor is not None and buf.read_varint() != 0:
+            with buf.read_view(buf.remaining) as compressed_packet_data:
+                return Buffer(compressor.decompress_head(compressed_packet_data, _MAX_PACKET_ID_SIZE)).read_varint()
+        return buf.read_varint()
+    finally:
+        buf.pos = pos
 
+
+def _lazy_packet_data(buf: Buffer, packet_map: Mapping[int, type[T_Packet]]) -> LazyPacket[T_Packet]:
+    """Read the (uncompressed) packet id, and wrap the remaining internal packet data into a lazy packet."""
     packet_id = buf.read_varint()
-    packet_data = buf.read(buf.remaining)
+    buf.clear(only_already_read=True)
+    return LazyPacket(packet_map[packet_id], buf)
+
+
+def _raw_packet_data(buf: Buffer, *, compressor: Optional[PacketCompressor] = None) -> RawPacket:
+    """Wrap the packet frame data into a raw packet, without decompressing it (beyond the packet id)."""
+    packet_id = _peek_packet_id(buf, compressor=compressor)
+    if compressor is not None and buf.read_varint() != 0:
+        buf.pos = 0
+        return RawPacket.from_compressed(packet_id, bytes(buf), compressor)
+
+    buf.read_varint()
+    with buf.read_view(buf.remaining) as data:
+        return RawPacket(packet_id, bytes(data))
+
 
-    return packet_map[packet_id].deserialize(Buffer(packet_data))
+def sync_write_packet(
+    writer: BaseSyncWriter,
+    packet: Union[Packet, RawPacket],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> None:
+    """Write given ``packet``.
+
+    The whole packet frame (including the length prefix) is passed to the ``writer`` in a single write.
+    Raw packets (:class:`~mcproto.packets.packet.RawPacket`) are written back without any serialization
+    (and without recompression, if they were received compressed with the same compression threshold).
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    writer.write(_serialize_packet(packet, compressor=compressor))
 
 
-def sync_write_packet(writer: BaseSyncWriter, packet: Packet, *, compressed: bool = False) -> None:
-    """Write given ``packet``."""
-    data_buf = _serialize_packet(packet, compressed=compressed)
-    writer.write_bytearray(data_buf)
+async def async_write_packet(
+    writer: BaseAsyncWriter,
+    packet: Union[Packet, RawPacket],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> None:
+    """Write given ``packet``.
 
+    The whole packet frame (including the length prefix) is passed to the ``writer`` in a single write.
+    Raw packets (:class:`~mcproto.packets.packet.RawPacket`) are written back without any serialization
+    (and without recompression, if they were received compressed with the same compression threshold).
+    Compression of large packets (see :attr:`~mcproto.packets.compression.PacketCompressor.offload_threshold`)
+    runs in a thread pool, so that it doesn't block the event loop.
 
-async def async_write_packet(writer: BaseAsyncWriter, packet: Packet, *, compressed: bool = False) -> None:
-    """Write given ``packet``."""
-    data_buf = _serialize_packet(packet, compressed=compressed)
-    await writer.write_bytearray(data_buf)
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    await writer.write(await _async_serialize_packet(packet, compressor=compressor))
 
 
 def sync_read_packet(
     reader: BaseSyncReader,
     packet_map: Mapping[int, type[T_Packet]],
     *,
-    compressed: bool = False,
+    compressor: Optional[PacketCompressor] = None,
 ) -> T_Packet:
-    """Read a packet."""
-    data_buf = Buffer(reader.read_bytearray())
-    return _deserialize_packet(data_buf, packet_map, compressed=compressed)
+    """Read a packet.
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    data_buf = reader.read_buffer()
+    return _deserialize_packet(data_buf, packet_map, compressor=compressor)
 
 
 async def async_read_packet(
     reader: BaseAsyncReader,
     packet_map: Mapping[int, type[T_Packet]],
     *,
-    compressed: bool = False,
+    compressor: Optional[PacketCompressor] = None,
 ) -> T_Packet:
-    """Read a packet."""
-    data_buf = Buffer(await reader.read_bytearray())
-    return _deserialize_packet(data_buf, packet_map, compressed=compressed)
+    """Read a packet.
+
+    Decompression of large packets (see :attr:`~mcproto.packets.compression.PacketCompressor.offload_threshold`)
+    runs in a thread pool, so that it doesn't block the event loop.
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    data_buf = await reader.read_buffer()
+    return await _async_deserialize_packet(data_buf, packet_map, compressor=compressor)
+
+
+def sync_read_lazy_packet(
+    reader: BaseSyncReader,
+    packet_map: Mapping[int, type[T_Packet]],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+    packet_ids: Optional[Set[int]] = None,
+) -> LazyPacket[T_Packet]:
+    """Read a packet, which only gets deserialized once it's needed (see :class:`~mcproto.packets.packet.LazyPacket`).
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    :param packet_ids:
+        Ids of the packets to read. Packets with any other ids are skipped, without being decompressed (beyond
+        the packet id) or deserialized, and the next packet is read instead. If not set, no packets are skipped.
+    """
+    while True:
+        data_buf = reader.read_buffer()
+        if packet_ids is None or _peek_packet_id(data_buf, compressor=compressor) in packet_ids:
+            break
+
+    if compressor is not None:
+        data_buf = _decompress_packet_data(data_buf, compressor)
+    return _lazy_packet_data(data_buf, packet_map)
+
+
+async def async_read_lazy_packet(
+    reader: BaseAsyncReader,
+    packet_map: Mapping[int, type[T_Packet]],
+    *,
+    compressor: Optional[PacketCompressor] = None,
+    packet_ids: Optional[Set[int]] = None,
+) -> LazyPacket[T_Packet]:
+    """Read a packet, which only gets deserialized once it's needed (see :class:`~mcproto.packets.packet.LazyPacket`).
+
+    Decompression of large packets (see :attr:`~mcproto.packets.compression.PacketCompressor.offload_threshold`)
+    runs in a thread pool, so that it doesn't block the event loop.
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    :param packet_ids:
+        Ids of the packets to read. Packets with any other ids are skipped, without being decompressed (beyond
+        the packet id) or deserialized, and the next packet is read instead. If not set, no packets are skipped.
+    """
+    while True:
+        data_buf = await reader.read_buffer()
+        if packet_ids is None or _peek_packet_id(data_buf, compressor=compressor) in packet_ids:
+            break
+
+    if compressor is not None:
+        data_length = data_buf.read_varint()
+        if data_length != 0:
+            with data_buf.read_view(data_buf.remaining) as compressed_packet_data:
+                data_buf = Buffer(await compressor.async_decompress(compressed_packet_data, data_length))
+    return _lazy_packet_data(data_buf, packet_map)
+
+
+def sync_read_raw_packet(reader: BaseSyncReader, *, compressor: Optional[PacketCompressor] = None) -> RawPacket:
+    """Read a packet in it's raw form, without deserializing it (see :class:`~mcproto.packets.packet.RawPacket`).
+
+    Unlike the other read functions, this works with any packet id, including the ones unknown to mcproto.
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    return _raw_packet_data(reader.read_buffer(), compressor=compressor)
+
+
+async def async_read_raw_packet(
+    reader: BaseAsyncReader,
+    *,
+    compressor: Optional[PacketCompressor] = None,
+) -> RawPacket:
+    """Read a packet in it's raw form, without deserializing it (see :class:`~mcproto.packets.packet.RawPacket`).
+
+    Unlike the other read functions, this works with any packet id, including the ones unknown to mcproto.
+
+    :param compressor:
+        Compression state of the connection, once compression was enabled with
+        :class:`~mcproto.packets.login.login.LoginSetCompression`. If not set, compression is disabled.
+    """
+    return _raw_packet_data(await reader.read_buffer(), compressor=compressor)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import ClassVar, Optional, final
 
-from typing_extensions import Self
-
-from mcproto.buffer import Buffer
 from mcproto.packets.packet import ClientBoundPacket, GameState, ServerBoundPacket
+from mcproto.protocol.schema import (
+    BYTEARRAY,
+    ConstantType,
+    Field,
+    OptionalType,
+    REMAINING_BYTES,
+    SerializableType,
+    UTF,
+    VARINT,
+)
 from mcproto.types.chat import ChatMessage
 from mcproto.types.uuid import UUID
 
@@ -30,22 +38,14 @@ class LoginStart(ServerBoundPacket):
     PACKET_ID: ClassVar[int] = 0x00
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("username", UTF),)
+
     def __init__(self, *, username: str):
         """
         :param username: Username of the client who sent the request.
         """
         self.username = username
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_utf(self.username)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        username = buf.read_utf()
-        return cls(username=username)
-
 
 @final
 class LoginEncryptionRequest(ClientBoundPacket):
@@ -56,6 +56,12 @@ class LoginEncryptionRequest(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x01
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (
+        Field("server_id", ConstantType(UTF, " " * 20)),  # Server ID - appears to be empty
+        Field("public_key", BYTEARRAY),
+        Field("verify_token", BYTEARRAY),
+    )
+
     def __init__(self, *, public_key: bytes, verify_token: bytes):
         """
         :param public_key: Server's public key
@@ -64,21 +70,6 @@ class LoginEncryptionRequest(ClientBoundPacket):
         self.public_key = public_key
         self.verify_token = verify_token
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_utf(" " * 20)  # Server ID - appears to be empty
-        buf.write_bytearray(self.public_key)
-        buf.write_bytearray(self.verify_token)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        buf.read_utf()  # Server ID - appears to be empty
-
-        public_key = buf.read_bytearray()
-        verify_token = buf.read_bytearray()
-        return cls(public_key=public_key, verify_token=verify_token)
-
 
 @final
 class LoginEncryptionResponse(ServerBoundPacket):
@@ -89,6 +80,8 @@ class LoginEncryptionResponse(ServerBoundPacket):
     PACKET_ID: ClassVar[int] = 0x01
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("shared_key", BYTEARRAY), Field("verify_token", BYTEARRAY))
+
     def __init__(self, *, shared_key: bytes, verify_token: bytes):
         """
         :param shared_key: Shared secret value, encrypted with server's public key.
@@ -97,18 +90,6 @@ class LoginEncryptionResponse(ServerBoundPacket):
         self.shared_key = shared_key
         self.verify_token = verify_token
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_bytearray(self.shared_key)
-        buf.write_bytearray(self.verify_token)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        shared_key = buf.read_bytearray()
-        verify_token = buf.read_bytearray()
-        return cls(shared_key=shared_key, verify_token=verify_token)
-
 
 @final
 class LoginSuccess(ClientBoundPacket):
@@ -119,6 +100,8 @@ class LoginSuccess(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x02
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("uuid", SerializableType(UUID)), Field("username", UTF))
+
     def __init__(self, uuid: UUID, username: str):
         """
         :param uuid: The UUID of the connecting player/client.
@@ -127,18 +110,6 @@ class LoginSuccess(ClientBoundPacket):
         self.uuid = uuid
         self.username = username
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.extend(self.uuid.serialize())
-        buf.write_utf(self.username)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        uuid = UUID.deserialize(buf)
-        username = buf.read_utf()
-        return cls(uuid, username)
-
 
 @final
 class LoginDisconnect(ClientBoundPacket):
@@ -149,20 +120,14 @@ class LoginDisconnect(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x00
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("reason", SerializableType(ChatMessage)),)
+
     def __init__(self, reason: ChatMessage):
         """
         :param reason: The reason for disconnection (kick).
         """
         self.reason = reason
 
-    def serialize(self) -> Buffer:
-        return self.reason.serialize()
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        reason = ChatMessage.deserialize(buf)
-        return cls(reason)
-
 
 @final
 class LoginPluginRequest(ClientBoundPacket):
@@ -173,6 +138,12 @@ class LoginPluginRequest(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x04
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (
+        Field("message_id", VARINT),
+        Field("channel", UTF),
+        Field("data", REMAINING_BYTES),  # All of the remaining data in the buffer
+    )
+
     def __init__(self, message_id: int, channel: str, data: bytes):
         """
         :param message_id: Message id, generated by the server, should be unique to the connection.
@@ -183,20 +154,6 @@ class LoginPluginRequest(ClientBoundPacket):
         self.channel = channel
         self.data = data
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_varint(self.message_id)
-        buf.write_utf(self.channel)
-        buf.write(self.data)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        message_id = buf.read_varint()
-        channel = buf.read_utf()
-        data = buf.read(buf.remaining)  # All of the remaining data in the buffer
-        return cls(message_id, channel, data)
-
 
 @final
 class LoginPluginResponse(ServerBoundPacket):
@@ -207,6 +164,8 @@ class LoginPluginResponse(ServerBoundPacket):
     PACKET_ID: ClassVar[int] = 0x02
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("message_id", VARINT), Field("data", OptionalType(REMAINING_BYTES)))
+
     def __init__(self, message_id: int, data: Optional[bytes]):
         """
         :param message_id: Message id, generated by the server, should be unique to the connection.
@@ -215,18 +174,6 @@ class LoginPluginResponse(ServerBoundPacket):
         self.message_id = message_id
         self.data = data
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_varint(self.message_id)
-        buf.write_optional(self.data, buf.write)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        message_id = buf.read_varint()
-        data = buf.read_optional(lambda: buf.read(buf.remaining))
-        return cls(message_id, data)
-
 
 @final
 class LoginSetCompression(ClientBoundPacket):
@@ -239,6 +186,8 @@ class LoginSetCompression(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x03
     GAME_STATE: ClassVar[GameState] = GameState.LOGIN
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("threshold", VARINT),)
+
     def __init__(self, threshold: int):
         """
         :param threshold:
@@ -246,13 +195,3 @@ class LoginSetCompression(ClientBoundPacket):
             To disable compression completely, threshold can be set to -1.
         """
         self.threshold = threshold
-
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_varint(self.threshold)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        threshold = buf.read_varint()
-        return cls(threshold)
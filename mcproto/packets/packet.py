@@ -2,9 +2,16 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from enum import IntEnum
-from typing import ClassVar
+from typing import ClassVar, Generic, Optional, TYPE_CHECKING, TypeVar, cast
 
-from mcproto.utils.abc import RequiredParamsABCMixin, Serializable
+from typing_extensions import Self
+
+from mcproto.buffer import Buffer
+from mcproto.protocol.schema import SchemaSerializable
+from mcproto.utils.abc import RequiredParamsABCMixin
+
+if TYPE_CHECKING:
+    from mcproto.packets.compression import PacketCompressor
 
 __all__ = [
     "GameState",
@@ -12,8 +19,12 @@ __all__ = [
     "Packet",
     "ServerBoundPacket",
     "ClientBoundPacket",
+    "LazyPacket",
+    "RawPacket",
 ]
 
+T_Packet = TypeVar("T_Packet", bound="Packet")
+
 
 class GameState(IntEnum):
     HANDSHAKING = 0
@@ -27,7 +38,7 @@ class PacketDirection(IntEnum):
     CLIENTBOUND = 1
 
 
-class Packet(Serializable, RequiredParamsABCMixin):
+class Packet(SchemaSerializable, RequiredParamsABCMixin):
     """Base class for all packets"""
 
     _REQUIRED_CLASS_VARS: ClassVar[Sequence[str]] = ["PACKET_ID", "GAME_STATE"]
@@ -37,6 +48,9 @@ class Packet(Serializable, RequiredParamsABCMixin):
 
     PACKET_ID: ClassVar[int]
     GAME_STATE: ClassVar[GameState]
+    #: Range of the protocol versions, in which this packet exists (with this packet id). If not set, the packet
+    #: exists in all of the protocol versions. Packets which changed their id need a separate class for each id.
+    PROTOCOL_VERSIONS: ClassVar[Optional[range]] = None
 
 
 class ServerBoundPacket(Packet):
@@ -49,3 +63,121 @@ class ClientBoundPacket(Packet):
     """Packet bound to a client (Server -> Client)."""
 
     __slots__ = ()
+
+
+class LazyPacket(Generic[T_Packet]):
+    """Received packet, which only gets deserialized once it's actually needed.
+
+    This holds the packet id and the raw internal packet data, with the data only getting deserialized on an
+    explicit :meth:`.decode` call, or on the first access to any of the packet's attributes (which are then
+    looked up on the decoded packet). This avoids the deserialization cost for packets which end up ignored.
+    """
+
+    __slots__ = ("packet_id", "packet_class", "raw_data", "_packet")
+
+    def __init__(self, packet_class: type[T_Packet], raw_data: Buffer):
+        """
+        :param packet_class: Class of the packet, used to deserialize it.
+        :param raw_data: The internal packet data (without the packet id).
+        """
+        self.packet_id = packet_class.PACKET_ID
+        self.packet_class = packet_class
+        self.raw_data = raw_data
+        self._packet: Optional[T_Packet] = None
+
+    @property
+    def decoded(self) -> bool:
+        """Check whether the packet was already deserialized."""
+        return self._packet is not None
+
+    def decode(self) -> T_Packet:
+        """Deserialize the packet (only done once, the same packet instance is returned for any further calls)."""
+        if self._packet is None:
+            try:
+                self._packet = self.packet_class.deserialize(self.raw_data)
+            finally:
+                self.raw_data.pos = 0
+        return self._packet
+
+    def __getattr__(self, name: str) -> object:
+        # Only called for attributes not found on this class, which are then looked up on the decoded packet.
+        # Don't decode the packet for private attributes (these can be looked up by copy/pickle, or before
+        # the slots are initialized).
+        if name.startswith("_"):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return getattr(self.decode(), name)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {self.packet_class.__name__} (id {self.packet_id:#x})>"
+
+
+class RawPacket:
+    """Packet in it's raw form, holding just the packet id and the unparsed internal packet data.
+
+    This allows reading and writing packets which aren't deserialized, such as packets unknown to mcproto, or
+    packets which are only being forwarded (e.g. by a proxy). When written, the data is written back as is,
+    without any serialization.
+
+    If the packet was received compressed, the compressed data is kept, and the packet only gets decompressed
+    once it's :attr:`.data` is accessed. When such packet is written with the same compression threshold as
+    it was received with, the compressed data is written back directly, avoiding both the decompression and
+    the compression.
+    """
+
+    __slots__ = ("packet_id", "compressed_data", "_data", "_compressor")
+
+    def __init__(self, packet_id: int, data: bytes):
+        """
+        :param packet_id: Id of the packet.
+        :param data: The internal packet data (without the packet id).
+        """
+        self.packet_id = packet_id
+        #: The packet data in the compressed packet format (data length, followed by the compressed packet id
+        #: and internal data), if the packet was received compressed.
+        self.compressed_data: Optional[bytes] = None
+        self._data: Optional[bytes] = data
+        self._compressor: Optional[PacketCompressor] = None
+
+    @classmethod
+    def from_compressed(cls, packet_id: int, compressed_data: bytes, compressor: PacketCompressor) -> Self:
+        """Construct the packet from compressed data, which only gets decompressed once it's needed.
+
+        :param packet_id: Id of the packet.
+        :param compressed_data:
+            The packet data in the compressed packet format (data length, followed by the compressed packet id
+            and internal data).
+        :param compressor: Compression state of the connection, from which the packet was received.
+        """
+        packet = cls.__new__(cls)
+        packet.packet_id = packet_id
+        packet.compressed_data = compressed_data
+        packet._data = None
+        packet._compressor = compressor
+        return packet
+
+    @property
+    def compression_threshold(self) -> Optional[int]:
+        """Get the compression threshold, with which the packet was received compressed (if it was)."""
+        return None if self._compressor is None else self._compressor.threshold
+
+    @property
+    def data(self) -> bytes:
+        """Get the internal packet data (without the packet id), decompressing it if needed.
+
+        :raises IOError: If the compressed data is malformed.
+        """
+        if self._data is None:
+            # Only packets constructed with from_compressed don't have the data set
+            compressor = cast("PacketCompressor", self._compressor)
+            buf = Buffer(cast(bytes, self.compressed_data))
+            data_length = buf.read_varint()
+            with buf.read_view(buf.remaining) as compressed_packet_data:
+                decompressed = compressor.decompress(compressed_packet_data, data_length)
+            # Skip over the packet id (a varint, taking up at most 5 bytes), keeping the (immutable) rest of the data
+            id_buf = Buffer(decompressed[:5])
+            id_buf.read_varint()
+            self._data = decompressed[id_buf.pos :]
+        return self._data
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} (id {self.packet_id:#x})>"
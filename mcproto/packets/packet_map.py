@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import importlib
-import pkgutil
+from bisect import bisect_right
+from collections import defaultdict
 from collections.abc import Iterator, Mapping, Sequence
 from functools import lru_cache
 from types import MappingProxyType, ModuleType
-from typing import Literal, NamedTuple, NoReturn, overload
+from typing import Literal, NamedTuple, NoReturn, Optional, TYPE_CHECKING, overload
 
+from mcproto.packets._registry import PACKET_REGISTRY
 from mcproto.packets.packet import ClientBoundPacket, GameState, Packet, PacketDirection, ServerBoundPacket
 
+if TYPE_CHECKING:
+    import pkgutil
+    from pathlib import Path
+
 __all__ = ["generate_packet_map"]
 
+
+def _collect_version_range_starts() -> dict[tuple[GameState, PacketDirection], list[int]]:
+    """Collect the (sorted) first protocol versions of the version ranges in the registry, per state and direction."""
+    range_starts: defaultdict[tuple[GameState, PacketDirection], list[int]] = defaultdict(list)
+    for state, direction, first_version in sorted(PACKET_REGISTRY):
+        range_starts[state, direction].append(first_version)
+    return dict(range_starts)
+
+
+# First protocol versions of each of the version ranges in the packet registry, for each game state and
+# direction. All of the protocol versions within a range share the same packet map.
+_VERSION_RANGE_STARTS = _collect_version_range_starts()
+
+# Packages holding the packets of each game state, walked when generating the packet registry
+# (game states with a package which doesn't exist yet simply have no packets)
 MODULE_PATHS = {
     GameState.HANDSHAKING: "mcproto.packets.handshaking",
     GameState.STATUS: "mcproto.packets.status",
@@ -35,6 +56,9 @@ def _walk_submodules(module: ModuleType) -> Iterator[WalkableModuleData]:
     causing the same object to appear more than once. This makes ``__all__`` a requirement.)
     """
 
+    # Walking the modules is only needed to generate the packet registry, avoid the import cost otherwise
+    import pkgutil
+
     def on_error(name: str) -> NoReturn:
         raise ImportError(name=name)
 
@@ -82,6 +106,7 @@ def _walk_module_packets(module_data: WalkableModuleData) -> Iterator[type[Packe
 def generate_packet_map(
     direction: Literal[PacketDirection.SERVERBOUND],
     state: GameState,
+    protocol_version: Optional[int] = None,
 ) -> Mapping[int, type[ServerBoundPacket]]:
     ...
 
@@ -90,22 +115,86 @@ def generate_packet_map(
 def generate_packet_map(
     direction: Literal[PacketDirection.CLIENTBOUND],
     state: GameState,
+    protocol_version: Optional[int] = None,
 ) -> Mapping[int, type[ClientBoundPacket]]:
     ...
 
 
+def generate_packet_map(
+    direction: PacketDirection,
+    state: GameState,
+    protocol_version: Optional[int] = None,
+) -> Mapping[int, type[Packet]]:
+    """Get a packet map for given ``direction``, ``state`` and ``protocol_version``.
+
+    The packet map maps the packet ids to the packet classes. It's built from the precomputed packet registry
+    (:mod:`mcproto.packets._registry`), which holds the import paths of all of the packet classes, split into
+    ranges of protocol versions with the same packets. This means only the modules with the packets of this
+    packet map get imported, without walking through all of the packet modules at runtime.
+
+    The packet maps are cached per protocol version range, which means all of the protocol versions within
+    the same range share a single (immutable) mapping, which is only actually built once. Finding the range
+    isn't free though, so the packet map should be obtained once (i.e. at the handshake), rather than for
+    every packet.
+
+    :param protocol_version:
+        The protocol version (as sent in :class:`~mcproto.packets.handshaking.handshake.Handshake`).
+        If not set, the packet map for the latest protocol version is returned.
+    :raises ValueError: If there are no packets for given ``protocol_version``.
+    """
+    try:
+        range_starts = _VERSION_RANGE_STARTS[state, direction]
+    except KeyError:
+        raise ValueError("Unrecognized packet direction or game state") from None
+
+    if protocol_version is None:
+        return _build_packet_map(direction, state, range_starts[-1])
+
+    index = bisect_right(range_starts, protocol_version) - 1
+    if index < 0:
+        raise ValueError(f"Unsupported protocol version: {protocol_version}.")
+    return _build_packet_map(direction, state, range_starts[index])
+
+
+def _version_range_packet_maps(direction: PacketDirection, state: GameState) -> Iterator[Mapping[int, type[Packet]]]:
+    """Get the packet maps of all of the protocol version ranges, for given ``direction`` and ``state``."""
+    for first_version in _VERSION_RANGE_STARTS.get((state, direction), ()):
+        yield _build_packet_map(direction, state, first_version)
+
+
 @lru_cache()
-def generate_packet_map(direction: PacketDirection, state: GameState) -> Mapping[int, type[Packet]]:
-    """Dynamically generated a packet map for given ``direction`` and ``state``.
+def _build_packet_map(direction: PacketDirection, state: GameState, first_version: int) -> Mapping[int, type[Packet]]:
+    """Build the packet map for the protocol version range starting at ``first_version``, from the registry.
 
-    This generation is done by dynamically importing all of the modules containing these packets,
-    filtering them to only contain those pacekts with the specified parameters, and storing those
-    into a dictionary, using the packet id as key, and the packet class itself being the value.
+    Note that this is cached per version range, rather than per protocol version. Caching each of the protocol
+    versions separately could make the cache grow indefinitely, as the version comes from the client.
+    """
+    class_paths = PACKET_REGISTRY[state, direction, first_version]
+    packet_map = {packet_id: _import_packet_class(class_path) for packet_id, class_path in class_paths.items()}
 
-    As this fucntion is likely to be called quite often, and it uses dynamic importing to obtain
-    the packet classes, this function is cached, which means the logic only actually runs once,
-    after which, for the same arguments, the same dict will be returned.
+    # Return an immutable mapping proxy, rather than the actual (mutable) dict
+    # This allows us to safely cache the function returns, without worrying that
+    # when the user mutates the dict, next function run would return that same
+    # mutated dict, as it was cached
+    return MappingProxyType(packet_map)
+
+
+def _import_packet_class(class_path: str) -> type[Packet]:
+    """Import the packet class from given ``"module:ClassName"`` path."""
+    module_name, class_name = class_path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def _walk_packets(direction: PacketDirection, state: GameState) -> list[type[Packet]]:
+    """Find all of the packets for given ``direction`` and ``state``, by walking through their package.
+
+    This imports all of the modules in the package holding the packets of given ``state``, filtering the
+    packet classes from their ``__all__`` to only those with the specified parameters.
     """
+    import importlib.util
+
+    if importlib.util.find_spec(MODULE_PATHS[state]) is None:
+        return []
     module = importlib.import_module(MODULE_PATHS[state])
 
     if direction is PacketDirection.SERVERBOUND:
@@ -115,15 +204,91 @@ def generate_packet_map(direction: PacketDirection, state: GameState) -> Mapping
     else:
         raise ValueError("Unrecognized packet direction")
 
-    packet_map: dict[int, type[Packet]] = {}
+    packets: list[type[Packet]] = []
 
     for submodule in _walk_submodules(module):
         for packet_class in _walk_module_packets(submodule):
             if issubclass(packet_class, direction_class):
+                packets.append(packet_class)
+
+    return packets
+
+
+def _split_version_ranges(packets: list[type[Packet]]) -> list[tuple[int, dict[int, type[Packet]]]]:
+    """Split the packets into ranges of protocol versions, with the same packets in each of the ranges.
+
+    :return:
+        List of the version ranges, each holding the first protocol version of the range and it's packet map.
+        The first range always starts at protocol version 0.
+    """
+    boundaries = {0}
+    for packet_class in packets:
+        if packet_class.PROTOCOL_VERSIONS is not None:
+            boundaries.update((packet_class.PROTOCOL_VERSIONS.start, packet_class.PROTOCOL_VERSIONS.stop))
+
+    version_ranges: list[tuple[int, dict[int, type[Packet]]]] = []
+    for first_version in sorted(boundaries):
+        packet_map: dict[int, type[Packet]] = {}
+        for packet_class in packets:
+            if packet_class.PROTOCOL_VERSIONS is None or first_version in packet_class.PROTOCOL_VERSIONS:
+                if packet_class.PACKET_ID in packet_map:
+                    raise ValueError(
+                        f"Packets {packet_map[packet_class.PACKET_ID].__name__} and {packet_class.__name__}"
+                        f" share the packet id {packet_class.PACKET_ID:#x} in protocol version {first_version}."
+                    )
                 packet_map[packet_class.PACKET_ID] = packet_class
 
-    # Return an immutable mapping proxy, rather than the actual (mutable) dict
-    # This allows us to safely cache the function returns, without worrying that
-    # when the user mutates the dict, next function run would return that same
-    # mutated dict, as it was cached
-    return MappingProxyType(packet_map)
+        # Merge the ranges with the same packets
+        if not version_ranges or version_ranges[-1][1] != packet_map:
+            version_ranges.append((first_version, packet_map))
+
+    return version_ranges
+
+
+_REGISTRY_HEADER = '''"""Precomputed registry of all of the packet classes, used to build the packet maps.
+
+This file is generated by walking through all of the packet modules, do not edit it manually!
+To regenerate it, run ``poetry run task packet-registry``.
+"""
+from __future__ import annotations
+
+from mcproto.packets.packet import GameState, PacketDirection
+
+__all__ = ["PACKET_REGISTRY"]
+
+# Import paths ("module:ClassName") of the packet classes, for each game state, direction and the first protocol
+# version of a range of protocol versions with the same packets (the range lasts until the next one starts)
+PACKET_REGISTRY: dict[tuple[GameState, PacketDirection, int], dict[int, str]] = {
+'''
+
+
+def _generate_registry_source() -> str:
+    """Generate the source code of the packet registry module (:mod:`mcproto.packets._registry`)."""
+    lines = [_REGISTRY_HEADER]
+    for state in GameState:
+        for direction in PacketDirection:
+            for first_version, packet_map in _split_version_ranges(_walk_packets(direction, state)):
+                key = f"(GameState.{state.name}, PacketDirection.{direction.name}, {first_version})"
+                if not packet_map:
+                    lines.append(f"    {key}: {{}},\n")
+                    continue
+
+                lines.append(f"    {key}: {{\n")
+                for packet_id, packet_class in sorted(packet_map.items()):
+                    class_path = f"{packet_class.__module__}:{packet_class.__qualname__}"
+                    lines.append(f'        0x{packet_id:02X}: "{class_path}",\n')
+                lines.append("    },\n")
+    lines.append("}\n")
+    return "".join(lines)
+
+
+def _registry_path() -> Path:
+    """Get the path to the packet registry module."""
+    from pathlib import Path
+
+    return Path(__file__).parent / "_registry.py"
+
+
+def _write_registry() -> None:
+    """Regenerate the packet registry module (:mod:`mcproto.packets._registry`)."""
+    _registry_path().write_text(_generate_registry_source())
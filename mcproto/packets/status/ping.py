@@ -1,12 +1,11 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import ClassVar, final
 
-from typing_extensions import Self
-
-from mcproto.buffer import Buffer
 from mcproto.packets.packet import ClientBoundPacket, GameState, ServerBoundPacket
 from mcproto.protocol.base_io import StructFormat
+from mcproto.protocol.schema import Field, StructType
 
 __all__ = ["PingPong"]
 
@@ -20,6 +19,8 @@ class PingPong(ClientBoundPacket, ServerBoundPacket):
     PACKET_ID: ClassVar[int] = 0x01
     GAME_STATE: ClassVar[GameState] = GameState.STATUS
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("payload", StructType(StructFormat.LONGLONG)),)
+
     def __init__(self, payload: int):
         """
         :param payload:
@@ -27,13 +28,3 @@ class PingPong(ClientBoundPacket, ServerBoundPacket):
             however it does need to fit within the limit of a signed long long (-2 ** 63 to 2 ** 63 - 1).
         """
         self.payload = payload
-
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write_value(StructFormat.LONGLONG, self.payload)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        payload = buf.read_value(StructFormat.LONGLONG)
-        return cls(payload)
@@ -1,12 +1,10 @@
 from __future__ import annotations
 
-import json
+from collections.abc import Sequence
 from typing import Any, ClassVar, final
 
-from typing_extensions import Self
-
-from mcproto.buffer import Buffer
 from mcproto.packets.packet import ClientBoundPacket, GameState, ServerBoundPacket
+from mcproto.protocol.schema import Field, JSON
 
 __all__ = ["StatusRequest", "StatusResponse"]
 
@@ -20,12 +18,7 @@ class StatusRequest(ServerBoundPacket):
     PACKET_ID: ClassVar[int] = 0x00
     GAME_STATE: ClassVar[GameState] = GameState.STATUS
 
-    def serialize(self) -> Buffer:  # pragma: no cover, nothing to test here.
-        return Buffer()
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:  # pragma: no cover, nothing to test here.
-        return cls()
+    FIELDS: ClassVar[Sequence[Field]] = ()
 
 
 @final
@@ -37,20 +30,10 @@ class StatusResponse(ClientBoundPacket):
     PACKET_ID: ClassVar[int] = 0x00
     GAME_STATE: ClassVar[GameState] = GameState.STATUS
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("data", JSON),)
+
     def __init__(self, data: dict[str, Any]):
         """
         :param data: JSON response data sent back to the client.
         """
         self.data = data
-
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        s = json.dumps(self.data)
-        buf.write_utf(s)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        s = buf.read_utf()
-        data_ = json.loads(s)
-        return cls(data_)
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import struct
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Mapping, Sequence
 from enum import Enum
+from functools import lru_cache
 from itertools import count
-from typing import Literal, Optional, TypeVar, Union, overload
+from types import MappingProxyType, ModuleType
+from typing import Any, Literal, Optional, TYPE_CHECKING, TypeVar, Union, overload
 
 from typing_extensions import TypeAlias
 
-from mcproto.protocol.utils import from_twos_complement, to_twos_complement
+if TYPE_CHECKING:
+    from mcproto.buffer import Buffer
 
 __all__ = [
     "BaseAsyncReader",
@@ -71,8 +74,197 @@ FLOAT_FORMATS_TYPE: TypeAlias = Union[
     Literal[StructFormat.HALFFLOAT],
 ]
 
+# Precompiled (big-endian) structs for each of the struct formats, to avoid parsing the format on every use
+_STRUCTS: Mapping[StructFormat, struct.Struct] = MappingProxyType(
+    {fmt: struct.Struct(">" + fmt.value) for fmt in StructFormat}
+)
+
+
+@lru_cache(maxsize=None)
+def _compile_struct(fmts: tuple[StructFormat, ...]) -> struct.Struct:
+    """Obtain a precompiled (big-endian) struct, representing a run of given struct formats (``fmts``)."""
+    return struct.Struct(">" + "".join(fmt.value for fmt in fmts))
+
+
 # endregion
+# region: Varint codec
+
+
+def _encode_varuint(value: int, /) -> bytes:
+    """Encode a non-negative integer ``value`` into the variable length (varint) format.
+
+    For more information about variable length format check :meth:`BaseSyncWriter._write_varuint`.
+    """
+    if value < 0x80:  # Fast path for the (very common) single byte varints
+        return bytes((value,))
+
+    out = bytearray()
+    while value > 0x7F:
+        # Store only 7 least significant bits with the first bit being 1, marking there will be another byte
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _encode_varint(value: int, /, *, bits: int) -> bytes:
+    """Encode a signed integer ``value`` of given amount of ``bits`` into the variable length (varint) format.
+
+    The value is converted into two's complement form, and range-checked, as a part of the encoding process.
+
+    :raises ValueError: If the ``value`` doesn't fit into a signed integer of given amount of ``bits``.
+    """
+    value_max = 1 << (bits - 1)
+    if value >= value_max or value < -value_max:
+        raise ValueError(f"Tried to write varint outside of the range of {bits}-bit int.")
+
+    # Masking the value gives us the two's complement form for negative numbers, and leaves positive ones as they are
+    return _encode_varuint(value & ((1 << bits) - 1))
+
+
+def _unsigned_to_signed(value: int, /, *, bits: int) -> int:
+    """Convert an already range-checked unsigned (two's complement) ``value`` of ``bits`` into a signed integer."""
+    if value & (1 << (bits - 1)):
+        return value - (1 << bits)
+    return value
+
+
+def _encode_varint_array(values: Sequence[int], /, *, bits: int) -> bytes:
+    """Encode a sequence of signed integers of given amount of ``bits``, prefixed with a varint of it's length."""
+    encoded = [_encode_varuint(len(values))]
+    encoded.extend([_encode_varint(value, bits=bits) for value in values])
+    return b"".join(encoded)
+
+
+@lru_cache(maxsize=None)
+def _get_numpy() -> Optional[ModuleType]:
+    """Import and return the :mod:`numpy` module, or ``None`` if it isn't installed.
+
+    NumPy is an optional dependency, used to speed up decoding of large varint arrays. It is only imported once
+    needed, as importing it is fairly slow.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _max_varint_size(bits: int, /) -> int:
+    """Get the maximum size (in bytes) of a varint holding an integer of given amount of ``bits``."""
+    return (bits + 6) // 7
+
+
+def _overlong_varint_error(bits: int, /) -> IOError:
+    """Produce the error for a received varint longer than the maximum size for an integer of ``bits``."""
+    return IOError(f"Received varint was longer than {_max_varint_size(bits)} bytes, the maximum for {bits}-bit int.")
+
+
+# Amount of varints in an array, starting from which we'll use NumPy (if available) for decoding them. For smaller
+# arrays, the overhead of constructing the NumPy arrays outweighs the benefits of vectorized decoding.
+_NUMPY_ARRAY_THRESHOLD = 128
+
 
+def _decode_varint_array(data: bytearray, pos: int, count: int, /, *, bits: int) -> tuple[list[int], int]:
+    """Decode ``count`` signed varints of given amount of ``bits`` from ``data``, starting at ``pos``.
+
+    If NumPy is installed, and there are enough varints to decode, the decoding will be vectorized. Otherwise, it
+    will fall back to a pure-python loop.
+
+    :return: A tuple with the decoded values, and the position right after the last decoded varint.
+    :raises IOError:
+        * If ``data`` ends before all of the varints were read.
+        * If any of the varints is longer than the maximum size of a ``bits``-bit integer varint (overlong).
+        * If any of the varints is outside of the range of a ``bits``-bit integer.
+    """
+    if count > 0 and count >= _NUMPY_ARRAY_THRESHOLD:
+        numpy = _get_numpy()
+        if numpy is not None:
+            return _decode_varint_array_numpy(numpy, data, pos, count, bits=bits)
+
+    value_max = (1 << bits) - 1
+    sign_bit = 1 << (bits - 1)
+    max_shift = 7 * _max_varint_size(bits)
+    end = len(data)
+
+    values: list[int] = []
+    append = values.append
+    for _ in range(count):
+        result = 0
+        shift = 0
+        while True:
+            if pos >= end:
+                raise IOError(f"Data ended while reading varint array, read {len(values)} of {count} items.")
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+
+            if not byte & 0x80:
+                break
+            shift += 7
+            if shift == max_shift:
+                raise _overlong_varint_error(bits)
+
+        # Only the last byte of a varint with the maximum size can hold bits over the limit
+        if result > value_max:
+            raise IOError(f"Received varint was outside the range of {bits}-bit int.")
+
+        append(result - (1 << bits) if result & sign_bit else result)
+
+    return values, pos
+
+
+def _decode_varint_array_numpy(
+    numpy: ModuleType, data: bytearray, pos: int, count: int, /, *, bits: int
+) -> tuple[list[int], int]:
+    """Vectorized version of :func:`._decode_varint_array`, using NumPy.
+
+    The validation matches the pure-python version, raising the same error for the first invalid varint.
+    """
+    np = numpy
+    max_size = _max_varint_size(bits)
+
+    # We don't know where exactly the array ends, but we know the maximum size it could take up, we also
+    # copy the data here, to make sure the buffer isn't left with an export (which would prevent resizes)
+    window_size = min(len(data) - pos, count * max_size)
+    window = np.frombuffer(data, dtype=np.uint8, count=window_size, offset=pos).copy()
+
+    # Every varint ends with a byte without the continuation bit set
+    ends = np.flatnonzero(window < 0x80)[:count]
+    starts = np.empty(len(ends), dtype=ends.dtype)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    sizes = ends - starts + 1
+
+    # The last byte of the longest possible varint can only hold the bits which remain until the limit
+    too_long = sizes > max_size
+    invalid = too_long | ((sizes == max_size) & (window[ends] > ((1 << bits) - 1) >> (7 * (max_size - 1))))
+    if invalid.any():
+        if too_long[np.argmax(invalid)]:
+            raise _overlong_varint_error(bits)
+        raise IOError(f"Received varint was outside the range of {bits}-bit int.")
+
+    if len(ends) < count:
+        # The window can also end early because of an overlong varint, not only because the data ended
+        if window_size - (int(ends[-1]) + 1 if len(ends) else 0) >= max_size:
+            raise _overlong_varint_error(bits)
+        raise IOError(f"Data ended while reading varint array, read {len(ends)} of {count} items.")
+
+    # Shift the 7 value bits of every byte based on it's index within the varint, and sum up all varint bytes
+    used = window[: ends[-1] + 1].astype(np.uint64)
+    indices = np.arange(len(used), dtype=np.uint64) - np.repeat(starts, sizes).astype(np.uint64)
+    values = np.add.reduceat((used & 0x7F) << (indices * 7), starts)
+
+    if bits == 64:
+        signed = values.view(np.int64)
+    else:
+        signed = values.astype(np.int64)
+        signed[signed >= 1 << (bits - 1)] -= 1 << bits
+
+    return signed.tolist(), pos + int(ends[-1]) + 1
+
+
+# endregion
 # region: Writer classes
 
 
@@ -103,7 +295,15 @@ class BaseAsyncWriter(ABC):
 
     async def write_value(self, fmt: StructFormat, value: object, /) -> None:
         """Write a given ``value`` as given struct format (``fmt``) in big-endian mode."""
-        await self.write(struct.pack(">" + fmt.value, value))
+        await self.write(_STRUCTS[fmt].pack(value))
+
+    async def write_values(self, fmts: tuple[StructFormat, ...], values: Sequence[object], /) -> None:
+        """Write a run of fixed-width ``values``, as given struct formats (``fmts``) in big-endian mode.
+
+        This is equivalent to calling :meth:`.write_value` for each of the formats and values, however
+        all of the values are packed at once, and written with a single write call.
+        """
+        await self.write(_compile_struct(fmts).pack(*values))
 
     async def _write_varuint(self, value: int, /, *, max_bits: Optional[int] = None) -> None:
         """Write an arbitrarily big unsigned integer in a variable length format.
@@ -123,31 +323,38 @@ class BaseAsyncWriter(ABC):
         if value < 0 or value > value_max:
             raise ValueError(f"Tried to write varint outside of the range of {max_bits}-bit int.")
 
-        remaining = value
-        while True:
-            if remaining & ~0x7F == 0:  # final byte
-                await self.write_value(StructFormat.UBYTE, remaining)
-                return
-            # Write only 7 least significant bits with the first bit being 1, marking there will be another byte
-            await self.write_value(StructFormat.UBYTE, remaining & 0x7F | 0x80)
-            # Subtract the value we've already sent (7 least significant bits)
-            remaining >>= 7
+        # Encode the whole varint first, so that it can be written with a single write call
+        await self.write(_encode_varuint(value))
 
     async def write_varint(self, value: int, /) -> None:
         """Write a 32-bit signed integer in a variable length format.
 
         For more information about variable length format check :meth:`._write_varuint`.
         """
-        val = to_twos_complement(value, bits=32)
-        await self._write_varuint(val, max_bits=32)
+        await self.write(_encode_varint(value, bits=32))
 
     async def write_varlong(self, value: int, /) -> None:
         """Write a 64-bit signed integer in a variable length format.
 
         For more information about variable length format check :meth:`._write_varuint`.
         """
-        val = to_twos_complement(value, bits=64)
-        await self._write_varuint(val, max_bits=64)
+        await self.write(_encode_varint(value, bits=64))
+
+    async def write_varint_array(self, values: Sequence[int], /) -> None:
+        """Write a sequence of 32-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        All of the values are encoded first, and then written with a single write call.
+        For more information about variable length format check :meth:`._write_varuint`.
+        """
+        await self.write(_encode_varint_array(values, bits=32))
+
+    async def write_varlong_array(self, values: Sequence[int], /) -> None:
+        """Write a sequence of 64-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        All of the values are encoded first, and then written with a single write call.
+        For more information about variable length format check :meth:`._write_varuint`.
+        """
+        await self.write(_encode_varint_array(values, bits=64))
 
     async def write_bytearray(self, data: bytes, /) -> None:
         """Write an arbitrary sequence of bytes, prefixed with a varint of it's size."""
@@ -221,7 +428,15 @@ class BaseSyncWriter(ABC):
 
     def write_value(self, fmt: StructFormat, value: object, /) -> None:
         """Write a given ``value`` as given struct format (``fmt``) in big-endian mode."""
-        self.write(struct.pack(">" + fmt.value, value))
+        self.write(_STRUCTS[fmt].pack(value))
+
+    def write_values(self, fmts: tuple[StructFormat, ...], values: Sequence[object], /) -> None:
+        """Write a run of fixed-width ``values``, as given struct formats (``fmts``) in big-endian mode.
+
+        This is equivalent to calling :meth:`.write_value` for each of the formats and values, however
+        all of the values are packed at once, and written with a single write call.
+        """
+        self.write(_compile_struct(fmts).pack(*values))
 
     def _write_varuint(self, value: int, /, *, max_bits: Optional[int] = None) -> None:
         """Write an arbitrarily big unsigned integer in a variable length format.
@@ -241,31 +456,38 @@ class BaseSyncWriter(ABC):
         if value < 0 or value > value_max:
             raise ValueError(f"Tried to write varint outside of the range of {max_bits}-bit int.")
 
-        remaining = value
-        while True:
-            if remaining & ~0x7F == 0:  # final byte
-                self.write_value(StructFormat.UBYTE, remaining)
-                return
-            # Write only 7 least significant bits with the first bit being 1, marking there will be another byte
-            self.write_value(StructFormat.UBYTE, remaining & 0x7F | 0x80)
-            # Subtract the value we've already sent (7 least significant bits)
-            remaining >>= 7
+        # Encode the whole varint first, so that it can be written with a single write call
+        self.write(_encode_varuint(value))
 
     def write_varint(self, value: int, /) -> None:
         """Write a 32-bit signed integer in a variable length format.
 
         For more information about variable length format check :meth:`._write_varuint`.
         """
-        val = to_twos_complement(value, bits=32)
-        self._write_varuint(val, max_bits=32)
+        self.write(_encode_varint(value, bits=32))
 
     def write_varlong(self, value: int, /) -> None:
         """Write a 64-bit signed integer in a variable length format.
 
         For more information about variable length format check :meth:`._write_varuint` docstring.
         """
-        val = to_twos_complement(value, bits=64)
-        self._write_varuint(val, max_bits=64)
+        self.write(_encode_varint(value, bits=64))
+
+    def write_varint_array(self, values: Sequence[int], /) -> None:
+        """Write a sequence of 32-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        All of the values are encoded first, and then written with a single write call.
+        For more information about variable length format check :meth:`._write_varuint`.
+        """
+        self.write(_encode_varint_array(values, bits=32))
+
+    def write_varlong_array(self, values: Sequence[int], /) -> None:
+        """Write a sequence of 64-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        All of the values are encoded first, and then written with a single write call.
+        For more information about variable length format check :meth:`._write_varuint`.
+        """
+        self.write(_encode_varint_array(values, bits=64))
 
     def write_bytearray(self, data: bytes, /) -> None:
         """Write an arbitrary sequence of bytes, prefixed with a varint of it's size."""
@@ -325,6 +547,14 @@ class BaseAsyncReader(ABC):
     async def read(self, length: int, /) -> bytearray:
         ...
 
+    async def read_into(self, view: memoryview, /) -> None:
+        """Read exactly ``len(view)`` bytes into given (writable) ``view``.
+
+        By default, this copies the data obtained from :meth:`.read` into the view, readers which can read
+        the data into the view directly override this, avoiding the intermediate copy.
+        """
+        view[:] = await self.read(len(view))
+
     @overload
     async def read_value(self, fmt: INT_FORMATS_TYPE, /) -> int:
         ...
@@ -346,10 +576,19 @@ class BaseAsyncReader(ABC):
 
         The amount of bytes to read will be determined based on the struct format automatically.
         """
-        length = struct.calcsize(fmt.value)
-        data = await self.read(length)
-        unpacked = struct.unpack(">" + fmt.value, data)
-        return unpacked[0]
+        compiled = _STRUCTS[fmt]
+        data = await self.read(compiled.size)
+        return compiled.unpack(data)[0]
+
+    async def read_values(self, fmts: tuple[StructFormat, ...], /) -> tuple[Any, ...]:
+        """Read a run of fixed-width values, as given struct formats (``fmts``) in big-endian mode.
+
+        This is equivalent to calling :meth:`.read_value` for each of the formats, however all of the
+        values are read with a single read call, and unpacked at once.
+        """
+        compiled = _compile_struct(fmts)
+        data = await self.read(compiled.size)
+        return compiled.unpack(data)
 
     async def _read_varuint(self, *, max_bits: Optional[int] = None) -> int:
         """Read an arbitrarily big unsigned integer in a variable length format.
@@ -369,7 +608,7 @@ class BaseAsyncReader(ABC):
 
         result = 0
         for i in count():
-            byte = await self.read_value(StructFormat.UBYTE)
+            byte = (await self.read(1))[0]
             # Read 7 least significant value bits in this byte, and shift them appropriately to be in the right place
             # then simply add them (OR) as additional 7 most significant bits in our result
             result |= (byte & 0x7F) << (7 * i)
@@ -391,8 +630,7 @@ class BaseAsyncReader(ABC):
         For more information about variable length format check :meth:`._read_varuint`.
         """
         unsigned_num = await self._read_varuint(max_bits=32)
-        val = from_twos_complement(unsigned_num, bits=32)
-        return val
+        return _unsigned_to_signed(unsigned_num, bits=32)
 
     async def read_varlong(self) -> int:
         """Read a 64-bit signed integer in a variable length format.
@@ -400,22 +638,61 @@ class BaseAsyncReader(ABC):
         For more information about variable length format check :meth:`._read_varuint`.
         """
         unsigned_num = await self._read_varuint(max_bits=64)
-        val = from_twos_complement(unsigned_num, bits=64)
-        return val
+        return _unsigned_to_signed(unsigned_num, bits=64)
+
+    async def read_varint_array(self) -> list[int]:
+        """Read a sequence of 32-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        For more information about variable length format check :meth:`._read_varuint`.
+        """
+        return await self._read_varint_array(bits=32)
+
+    async def read_varlong_array(self) -> list[int]:
+        """Read a sequence of 64-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        For more information about variable length format check :meth:`._read_varuint`.
+        """
+        return await self._read_varint_array(bits=64)
+
+    async def _read_varint_array(self, *, bits: int) -> list[int]:
+        """Read a sequence of signed integers of given amount of ``bits``, prefixed with a varint of it's size."""
+        count = await self.read_varint()
+        if count < 0:
+            raise IOError(f"Received negative varint array size ({count}).")
+
+        read_item = self.read_varint if bits == 32 else self.read_varlong
+        return [await read_item() for _ in range(count)]
 
     async def read_bytearray(self, /) -> bytearray:
         """Read an arbitrary sequence of bytes, prefixed with a varint of it's size."""
         length = await self.read_varint()
         return await self.read(length)
 
+    async def read_buffer(self) -> Buffer:
+        """Read an arbitrary sequence of bytes, prefixed with a varint of it's size, into a new buffer.
+
+        This is equivalent to wrapping the result of :meth:`.read_bytearray` in a :class:`~mcproto.buffer.Buffer`,
+        however the data is read into the buffer directly (see :meth:`.read_into`), without copying it over.
+        """
+        from mcproto.buffer import Buffer
+
+        length = await self.read_varint()
+        if length < 0:
+            raise IOError(f"Received negative bytearray size ({length}).")
+        buf = Buffer(length)
+        with memoryview(buf) as view:
+            await self.read_into(view)
+        return buf
+
     async def read_ascii(self) -> str:
         """Read ISO-8859-1 encoded string, until we encounter NULL (0x00) at the end indicating string end."""
         # Keep reading bytes until we find NULL
         result = bytearray()
-        while len(result) == 0 or result[-1] != 0:
+        while True:
             byte = await self.read(1)
-            result.extend(byte)
-        return result[:-1].decode("ISO-8859-1")
+            if byte == b"\x00":
+                return result.decode("ISO-8859-1")
+            result += byte
 
     async def read_utf(self) -> str:
         """Read a UTF-8 encoded string, prefixed with a varint of it's size (in bytes).
@@ -467,6 +744,14 @@ class BaseSyncReader(ABC):
     def read(self, length: int, /) -> bytearray:
         ...
 
+    def read_into(self, view: memoryview, /) -> None:
+        """Read exactly ``len(view)`` bytes into given (writable) ``view``.
+
+        By default, this copies the data obtained from :meth:`.read` into the view, readers which can read
+        the data into the view directly override this, avoiding the intermediate copy.
+        """
+        view[:] = self.read(len(view))
+
     @overload
     def read_value(self, fmt: INT_FORMATS_TYPE, /) -> int:
         ...
@@ -488,10 +773,19 @@ class BaseSyncReader(ABC):
 
         The amount of bytes to read will be determined based on the struct format automatically.
         """
-        length = struct.calcsize(fmt.value)
-        data = self.read(length)
-        unpacked = struct.unpack(">" + fmt.value, data)
-        return unpacked[0]
+        compiled = _STRUCTS[fmt]
+        data = self.read(compiled.size)
+        return compiled.unpack(data)[0]
+
+    def read_values(self, fmts: tuple[StructFormat, ...], /) -> tuple[Any, ...]:
+        """Read a run of fixed-width values, as given struct formats (``fmts``) in big-endian mode.
+
+        This is equivalent to calling :meth:`.read_value` for each of the formats, however all of the
+        values are read with a single read call, and unpacked at once.
+        """
+        compiled = _compile_struct(fmts)
+        data = self.read(compiled.size)
+        return compiled.unpack(data)
 
     def _read_varuint(self, *, max_bits: Optional[int] = None) -> int:
         """Read an arbitrarily big unsigned integer in a variable length format.
@@ -511,7 +805,7 @@ class BaseSyncReader(ABC):
 
         result = 0
         for i in count():
-            byte = self.read_value(StructFormat.UBYTE)
+            byte = self.read(1)[0]
             # Read 7 least significant value bits in this byte, and shift them appropriately to be in the right place
             # then simply add them (OR) as additional 7 most significant bits in our result
             result |= (byte & 0x7F) << (7 * i)
@@ -533,8 +827,7 @@ class BaseSyncReader(ABC):
         For more information about variable length format check :meth:`._read_varuint`.
         """
         unsigned_num = self._read_varuint(max_bits=32)
-        val = from_twos_complement(unsigned_num, bits=32)
-        return val
+        return _unsigned_to_signed(unsigned_num, bits=32)
 
     def read_varlong(self) -> int:
         """Read a 64-bit signed integer in a variable length format.
@@ -542,22 +835,61 @@ class BaseSyncReader(ABC):
         For more information about variable length format check :meth:`._read_varuint`.
         """
         unsigned_num = self._read_varuint(max_bits=64)
-        val = from_twos_complement(unsigned_num, bits=64)
-        return val
+        return _unsigned_to_signed(unsigned_num, bits=64)
+
+    def read_varint_array(self) -> list[int]:
+        """Read a sequence of 32-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        For more information about variable length format check :meth:`._read_varuint`.
+        """
+        return self._read_varint_array(bits=32)
+
+    def read_varlong_array(self) -> list[int]:
+        """Read a sequence of 64-bit signed integers in a variable length format, prefixed with a varint of it's size.
+
+        For more information about variable length format check :meth:`._read_varuint`.
+        """
+        return self._read_varint_array(bits=64)
+
+    def _read_varint_array(self, *, bits: int) -> list[int]:
+        """Read a sequence of signed integers of given amount of ``bits``, prefixed with a varint of it's size."""
+        count = self.read_varint()
+        if count < 0:
+            raise IOError(f"Received negative varint array size ({count}).")
+
+        read_item = self.read_varint if bits == 32 else self.read_varlong
+        return [read_item() for _ in range(count)]
 
     def read_bytearray(self) -> bytearray:
         """Read an arbitrary sequence of bytes, prefixed with a varint of it's size."""
         length = self.read_varint()
         return self.read(length)
 
+    def read_buffer(self) -> Buffer:
+        """Read an arbitrary sequence of bytes, prefixed with a varint of it's size, into a new buffer.
+
+        This is equivalent to wrapping the result of :meth:`.read_bytearray` in a :class:`~mcproto.buffer.Buffer`,
+        however the data is read into the buffer directly (see :meth:`.read_into`), without copying it over.
+        """
+        from mcproto.buffer import Buffer
+
+        length = self.read_varint()
+        if length < 0:
+            raise IOError(f"Received negative bytearray size ({length}).")
+        buf = Buffer(length)
+        with memoryview(buf) as view:
+            self.read_into(view)
+        return buf
+
     def read_ascii(self) -> str:
         """Read ISO-8859-1 encoded string, until we encounter NULL (0x00) at the end indicating string end."""
         # Keep reading bytes until we find NULL
         result = bytearray()
-        while len(result) == 0 or result[-1] != 0:
+        while True:
             byte = self.read(1)
-            result.extend(byte)
-        return result[:-1].decode("ISO-8859-1")
+            if byte == b"\x00":
+                return result.decode("ISO-8859-1")
+            result += byte
 
     def read_utf(self) -> str:
         """Read a UTF-8 encoded string, prefixed with a varint of it's size (in bytes).
@@ -0,0 +1,404 @@
+"""Declarative field schemas, from which the (de)serialization code of the serializable classes is generated.
+
+Rather than hand-writing the :meth:`~mcproto.utils.abc.Serializable.serialize_into` and
+:meth:`~mcproto.utils.abc.Serializable.deserialize` methods as a series of individual ``buf.write_*``/``buf.read_*``
+calls, :class:`SchemaSerializable` classes (packets and types) can declare their fields in a ``FIELDS`` class
+variable::
+
+    class Handshake(ServerBoundPacket):
+        FIELDS: ClassVar[Sequence[Field]] = (
+            Field("protocol_version", VARINT),
+            Field("server_address", UTF),
+            Field("server_port", StructType(StructFormat.USHORT)),
+            Field("next_state", VARINT),
+        )
+
+Specialized, straight-line (de)serializers are then generated for the class once, when it's created. Adjacent
+fixed-width fields (:class:`StructType`) are read and written with a single (precompiled) struct call, and the
+optional fields are inlined directly, without any closures. The generated code only uses the public
+:class:`~mcproto.buffer.Buffer` API. The generated ``deserialize`` constructs the class by
+passing the read values as keyword arguments named after the fields, so ``__init__`` needs to accept them.
+"""
+from __future__ import annotations
+
+import keyword
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from typing import Any, ClassVar, NamedTuple, Optional, TYPE_CHECKING
+
+from mcproto.protocol.base_io import StructFormat, _compile_struct
+from mcproto.utils.abc import Serializable
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from mcproto.buffer import Buffer
+
+__all__ = [
+    "SchemaSerializable",
+    "Field",
+    "FieldType",
+    "CodeGenerator",
+    "StructType",
+    "PrimitiveType",
+    "FixedBytesType",
+    "RemainingBytesType",
+    "JSONType",
+    "SerializableType",
+    "OptionalType",
+    "ConstantType",
+    "VARINT",
+    "VARLONG",
+    "UTF",
+    "ASCII",
+    "BYTEARRAY",
+    "VARINT_ARRAY",
+    "VARLONG_ARRAY",
+    "REMAINING_BYTES",
+    "JSON",
+]
+
+
+class Field(NamedTuple):
+    """A single serialized field of a schema."""
+
+    #: Name of the field, used both as the attribute name, and as the keyword argument name for ``__init__``
+    name: str
+    field_type: FieldType
+
+
+class CodeGenerator:
+    """Holder of the global names, available to the generated (de)serialization code.
+
+    Within the generated code, ``buf`` is the :class:`~mcproto.buffer.Buffer` being read from, or written into.
+    Any other objects the code needs to refer to have to be bound to a global name with :meth:`.bind`.
+    """
+
+    __slots__ = ("globals",)
+
+    def __init__(self):
+        self.globals: dict[str, object] = {}
+
+    def bind(self, obj: object, prefix: str = "obj") -> str:
+        """Make given ``obj`` accessible from the generated code, returning the global name bound to it."""
+        name = f"_{prefix}{len(self.globals)}"
+        self.globals[name] = obj
+        return name
+
+
+class FieldType(ABC):
+    """Type of a serialized field, generating the code to read and write the values of this type."""
+
+    __slots__ = ()
+
+    @property
+    def struct_format(self) -> Optional[StructFormat]:
+        """Struct format of the values of fixed-width types, or ``None`` for variable width types.
+
+        Adjacent fields of the types with a struct format are read and written with a single struct call.
+        """
+        return None
+
+    @abstractmethod
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        """Generate the statements reading a value of this type from ``buf`` into the ``target`` variable."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        """Generate the statements writing a value of this type (given by the ``value`` expression) into ``buf``."""
+        raise NotImplementedError
+
+
+class StructType(FieldType):
+    """Fixed-width value of given struct format (in big-endian mode)."""
+
+    __slots__ = ("fmt",)
+
+    def __init__(self, fmt: StructFormat):
+        self.fmt = fmt
+
+    @property
+    def struct_format(self) -> StructFormat:
+        return self.fmt
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [f"{target} = buf.read_value({gen.bind(self.fmt, 'fmt')})"]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [f"buf.write_value({gen.bind(self.fmt, 'fmt')}, {value})"]
+
+
+class PrimitiveType(FieldType):
+    """Value read and written with the given reader and writer methods of the buffer."""
+
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: str, writer: str):
+        """
+        :param reader: Name of the buffer's method reading the value (e.g. ``read_varint``).
+        :param writer: Name of the buffer's method writing the value (e.g. ``write_varint``).
+        """
+        self.reader = reader
+        self.writer = writer
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [f"{target} = buf.{self.reader}()"]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [f"buf.{self.writer}({value})"]
+
+
+class FixedBytesType(FieldType):
+    """Sequence of bytes of a fixed length (without any length prefix), read as :class:`bytes`."""
+
+    __slots__ = ("length",)
+
+    def __init__(self, length: int):
+        self.length = length
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [
+            f"with buf.read_view({self.length}) as _view:",
+            f"    {target} = bytes(_view)",
+        ]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [f"buf.write({value})"]
+
+
+class RemainingBytesType(FieldType):
+    """All of the remaining data in the buffer. This can only be used as the last field."""
+
+    __slots__ = ()
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [f"{target} = buf.read(buf.remaining)"]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [f"buf.write({value})"]
+
+
+class JSONType(FieldType):
+    """JSON data, serialized into a UTF-8 string."""
+
+    __slots__ = ()
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        import json
+
+        return [f"{target} = {gen.bind(json.loads, 'loads')}(buf.read_utf())"]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        import json
+
+        return [f"buf.write_utf({gen.bind(json.dumps, 'dumps')}({value}))"]
+
+
+class SerializableType(FieldType):
+    """Value of another serializable class (like an :class:`~mcproto.types.abc.MCType`)."""
+
+    __slots__ = ("cls",)
+
+    def __init__(self, cls: type[Serializable]):
+        self.cls = cls
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [f"{target} = {gen.bind(self.cls, 'type')}.deserialize(buf)"]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [f"{value}.serialize_into(buf)"]
+
+
+class OptionalType(FieldType):
+    """Value which might not be present (``None``), prefixed with a bool of whether it's present."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: FieldType):
+        """
+        :param inner: Type of the value, when it's present.
+        """
+        self.inner = inner
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return [
+            f"if buf.read_value({gen.bind(StructFormat.BOOL, 'fmt')}):",
+            *_indent(self.inner.read_code(target, gen)),
+            "else:",
+            f"    {target} = None",
+        ]
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return [
+            f"if {value} is None:",
+            "    buf.write(b'\\x00')",
+            "else:",
+            "    buf.write(b'\\x01')",
+            *_indent(self.inner.write_code(value, gen)),
+        ]
+
+
+class ConstantType(FieldType):
+    """Field always written with a constant value, which is ignored when read.
+
+    The fields of this type aren't attributes of the class, and aren't passed to ``__init__``.
+    """
+
+    __slots__ = ("inner", "value")
+
+    def __init__(self, inner: FieldType, value: object):
+        """
+        :param inner: Type of the written value.
+        :param value: The constant value to write.
+        """
+        self.inner = inner
+        self.value = value
+
+    def read_code(self, target: str, gen: CodeGenerator) -> list[str]:
+        return self.inner.read_code(target, gen)
+
+    def write_code(self, value: str, gen: CodeGenerator) -> list[str]:
+        return self.inner.write_code(gen.bind(self.value, "const"), gen)
+
+
+VARINT = PrimitiveType("read_varint", "write_varint")
+VARLONG = PrimitiveType("read_varlong", "write_varlong")
+UTF = PrimitiveType("read_utf", "write_utf")
+ASCII = PrimitiveType("read_ascii", "write_ascii")
+BYTEARRAY = PrimitiveType("read_bytearray", "write_bytearray")
+VARINT_ARRAY = PrimitiveType("read_varint_array", "write_varint_array")
+VARLONG_ARRAY = PrimitiveType("read_varlong_array", "write_varlong_array")
+REMAINING_BYTES = RemainingBytesType()
+JSON = JSONType()
+
+
+def _indent(lines: list[str]) -> list[str]:
+    return ["    " + line for line in lines]
+
+
+def _group_fields(fields: Sequence[Field]) -> list[list[Field]]:
+    """Split the fields into groups, with each run of adjacent fixed-width fields forming a single group."""
+    groups: list[list[Field]] = []
+    for field in fields:
+        fused = field.field_type.struct_format is not None
+        if fused and groups and groups[-1][0].field_type.struct_format is not None:
+            groups[-1].append(field)
+        else:
+            groups.append([field])
+    return groups
+
+
+def _init_arguments(cls: type, fields: Sequence[Field]) -> str:
+    """Generate the arguments passing the read field values to ``__init__``.
+
+    The values are passed positionally, as long as the fields match the positional parameters of ``__init__``
+    (which makes the call cheaper), with the rest of them passed as keyword arguments.
+    """
+    code = getattr(cls.__init__, "__code__", None)
+    parameters = code.co_varnames[1 : code.co_argcount] if code is not None else ()
+
+    arguments = []
+    positional = True
+    for field in fields:
+        if isinstance(field.field_type, ConstantType):
+            continue
+        positional = positional and len(arguments) < len(parameters) and parameters[len(arguments)] == field.name
+        arguments.append(f"f_{field.name}" if positional else f"{field.name}=f_{field.name}")
+    return ", ".join(arguments)
+
+
+def _read_code(cls: type, fields: Sequence[Field], gen: CodeGenerator) -> list[str]:
+    lines = []
+    for group in _group_fields(fields):
+        if group[0].field_type.struct_format is None:
+            lines.extend(group[0].field_type.read_code(f"f_{group[0].name}", gen))
+            continue
+
+        fmts = tuple(field.field_type.struct_format for field in group)
+        targets = "".join(f"f_{field.name}, " for field in group)
+        lines.append(f"({targets}) = buf.read_values({gen.bind(fmts, 'fmts')})")
+
+    lines.append(f"return cls({_init_arguments(cls, fields)})")
+    return lines
+
+
+def _write_code(fields: Sequence[Field], gen: CodeGenerator) -> list[str]:
+    lines = []
+    for group in _group_fields(fields):
+        if group[0].field_type.struct_format is None:
+            lines.extend(group[0].field_type.write_code(f"self.{group[0].name}", gen))
+            continue
+
+        compiled = _compile_struct(tuple(field.field_type.struct_format for field in group))  # type: ignore
+        values = ", ".join(f"self.{field.name}" for field in group)
+        lines.append(f"buf.write({gen.bind(compiled, 'struct')}.pack({values}))")
+
+    return lines or ["pass"]
+
+
+def _compile_function(
+    cls: type, name: str, signature: str, body: list[str], gen: CodeGenerator
+) -> Callable[..., object]:
+    source = "\n".join([f"def {name}({signature}):", *_indent(body)])
+    namespace: dict[str, Any] = {}
+    exec(compile(source, f"<{cls.__qualname__}.{name}>", "exec"), gen.globals, namespace)  # noqa: S102
+    function = namespace[name]
+    function.__module__ = cls.__module__
+    function.__qualname__ = f"{cls.__qualname__}.{name}"
+    return function
+
+
+def _generate_serializers(cls: type[Serializable], fields: Sequence[Field]) -> None:
+    """Generate the ``serialize_into`` and ``deserialize`` methods of given class from it's ``fields``.
+
+    Methods which are defined on the class explicitly are kept, and don't get generated.
+
+    :raises ValueError: If the field names aren't valid (unique) identifiers.
+    """
+    names = [field.name for field in fields]
+    for name in names:
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise ValueError(f"Field name {name!r} of {cls.__qualname__} isn't a valid identifier.")
+    if len(set(names)) != len(names):
+        raise ValueError(f"Fields of {cls.__qualname__} have duplicate names.")
+
+    gen = CodeGenerator()
+    if "serialize_into" not in vars(cls):
+        serialize_into = _compile_function(cls, "serialize_into", "self, buf, /", _write_code(fields, gen), gen)
+        serialize_into.__doc__ = f"Write the {cls.__qualname__} fields into given buffer."
+        cls.serialize_into = serialize_into  # type: ignore
+    if "deserialize" not in vars(cls):
+        deserialize = _compile_function(cls, "deserialize", "cls, buf, /", _read_code(cls, fields, gen), gen)
+        deserialize.__doc__ = f"Read the {cls.__qualname__} fields from given buffer."
+        cls.deserialize = classmethod(deserialize)  # type: ignore
+
+
+class SchemaSerializable(Serializable):
+    """Serializable class, with the (de)serialization methods generated from the declared :attr:`.FIELDS`.
+
+    The methods are generated when the subclass declaring the ``FIELDS`` is created. Methods which the class also
+    defines explicitly are kept as they are, and subclasses without any ``FIELDS`` remain abstract.
+    """
+
+    __slots__ = ()
+
+    #: Declarative schema of the serialized fields, used to generate the (de)serialization methods
+    FIELDS: ClassVar[Sequence[Field]]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Generate the (de)serialization methods of the class, if it declares it's fields."""
+        super().__init_subclass__(**kwargs)
+        if "FIELDS" in vars(cls):
+            _generate_serializers(cls, cls.FIELDS)
+
+    if TYPE_CHECKING:
+        # The generated methods aren't visible to type checkers, declare them here, so that they don't consider
+        # the classes using FIELDS abstract. (At runtime, classes without FIELDS or these methods stay abstract.)
+
+        def serialize_into(self, buf: Buffer, /) -> None:
+            ...
+
+        @classmethod
+        def deserialize(cls, buf: Buffer, /) -> Self:
+            ...
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-__all__ = ["to_twos_complement", "from_twos_complement"]
+__all__ = ["to_twos_complement", "from_twos_complement", "varint_size", "varlong_size"]
 
 
 def to_twos_complement(number: int, bits: int) -> int:
@@ -35,3 +35,33 @@ def from_twos_complement(number: int, bits: int) -> int:
         number -= 1 << bits
 
     return number
+
+
+def _varuint_size(value: int, bits: int) -> int:
+    """Get the amount of bytes a signed ``value`` of given amount of ``bits`` takes up in the varint format."""
+    value_max = 1 << (bits - 1)
+    if value >= value_max or value < -value_max:
+        raise ValueError(f"Can't determine varint size of number {value} - out of range of {bits}-bit int")
+
+    if value < 0:
+        # Negative numbers are sent in their two's complement form, which always has the most significant bit set
+        return (bits + 6) // 7
+
+    # Each varint byte holds 7 value bits, even 0 takes up a single byte though
+    return max(1, (value.bit_length() + 6) // 7)
+
+
+def varint_size(value: int) -> int:
+    """Get the amount of bytes a 32-bit signed integer ``value`` will take up when written as a varint.
+
+    :raises ValueError: Given ``value`` is out of range of a 32-bit signed integer.
+    """
+    return _varuint_size(value, bits=32)
+
+
+def varlong_size(value: int) -> int:
+    """Get the amount of bytes a 64-bit signed integer ``value`` will take up when written as a varlong.
+
+    :raises ValueError: Given ``value`` is out of range of a 64-bit signed integer.
+    """
+    return _varuint_size(value, bits=64)
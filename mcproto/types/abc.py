@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from mcproto.utils.abc import Serializable
+from mcproto.protocol.schema import SchemaSerializable
 
 __all__ = ["MCType"]
 
 
-class MCType(Serializable):
+class MCType(SchemaSerializable):
     """Base class for a minecraft type structure."""
 
     __slots__ = ()
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import json
-from typing import TypeAlias, TypedDict, Union, final
+from collections.abc import Sequence
+from typing import ClassVar, TypeAlias, TypedDict, Union, final
 
 from typing_extensions import Self
 
-from mcproto.buffer import Buffer
+from mcproto.protocol.schema import Field, JSON
 from mcproto.types.abc import MCType
 
 __all__ = [
@@ -35,6 +35,8 @@ RawChatMessage: TypeAlias = Union[RawChatMessageDict, list[RawChatMessageDict],
 class ChatMessage(MCType):
     __slots__ = ("raw",)
 
+    FIELDS: ClassVar[Sequence[Field]] = (Field("raw", JSON),)
+
     def __init__(self, raw: RawChatMessage):
         self.raw = raw
 
@@ -60,15 +62,3 @@ class ChatMessage(MCType):
             return NotImplemented
 
         return self.raw == other.raw
-
-    def serialize(self) -> Buffer:
-        txt = json.dumps(self.raw)
-        buf = Buffer()
-        buf.write_utf(txt)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        txt = buf.read_utf()
-        dct = json.loads(txt)
-        return cls(dct)
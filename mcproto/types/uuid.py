@@ -1,11 +1,10 @@
 from __future__ import annotations
 
 import uuid
-from typing import final
+from collections.abc import Sequence
+from typing import ClassVar, final
 
-from typing_extensions import Self
-
-from mcproto.buffer import Buffer
+from mcproto.protocol.schema import Field, FixedBytesType
 from mcproto.types.abc import MCType
 
 __all__ = ["UUID"]
@@ -21,11 +20,5 @@ class UUID(MCType, uuid.UUID):
 
     __slots__ = ()
 
-    def serialize(self) -> Buffer:
-        buf = Buffer()
-        buf.write(self.bytes)
-        return buf
-
-    @classmethod
-    def deserialize(cls, buf: Buffer, /) -> Self:
-        return cls(bytes=bytes(buf.read(16)))
+    # Serialized as the 16 bytes of the UUID, passed to ``__init__`` as the ``bytes`` keyword argument
+    FIELDS: ClassVar[Sequence[Field]] = (Field("bytes", FixedBytesType(16)),)
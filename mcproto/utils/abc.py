@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
-from typing import ClassVar
+from typing import ClassVar, Optional
 
 from typing_extensions import Self
 
@@ -20,7 +20,9 @@ class RequiredParamsABCMixin:
 
     Just like with ABCs, this doesn't prevent creation of classes without these required class vars
     defined, only initialization is prevented. This is done to allow creation of a more specific, but
-    still abstract class.
+    still abstract class. The check is performed once, when the class is created, which means the
+    required class vars need to be defined in the class body (setting them on the class later won't
+    make it instantiable).
 
     Additionally, you can also define :attr:`._REQUIRED_CLASS_VARS_NO_MRO` class var, holding names of
     class vars which should be defined on given class directly. That means inheritance will be ignored
@@ -37,40 +39,76 @@ class RequiredParamsABCMixin:
     _REQUIRRED_CLASS_VARS: ClassVar[Sequence[str]]
     _REQUIRED_CLASS_VARS_NO_MRO: ClassVar[Sequence[str]]
 
+    # Reason why the class can't be instantiated (None if it can be), determined once, when the class is created,
+    # so that the instantiation doesn't need to go over all of the required class vars again
+    _REQUIRED_CLASS_VARS_ERROR: ClassVar[Optional[str]]
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Check the required class vars of the newly created class."""
+        super().__init_subclass__(**kwargs)
+        cls._REQUIRED_CLASS_VARS_ERROR = _check_required_class_vars(cls)
+
     def __new__(cls: type[Self], *a, **kw) -> Self:
         """Enforce required parameters being set for each instance of the concrete classes."""
-        _err_msg = f"Can't instantiate abstract {cls.__name__} class without defining " + "{!r} classvar"
+        if cls._REQUIRED_CLASS_VARS_ERROR is not None:
+            raise TypeError(cls._REQUIRED_CLASS_VARS_ERROR)
+        return super().__new__(cls)
+
 
-        _required_class_vars = getattr(cls, "_REQUIRED_CLASS_VARS", None)
-        if _required_class_vars is None:
-            raise TypeError(_err_msg.format("_REQUIRED_CLASS_VARS"))
+def _check_required_class_vars(cls: type[RequiredParamsABCMixin]) -> Optional[str]:
+    """Check that given class defines all of it's required class vars.
 
-        for req_attr in _required_class_vars:
-            if not hasattr(cls, req_attr):
-                raise TypeError(_err_msg.format(req_attr))
+    :return: Error message explaining which class var is missing, or ``None`` if the class defines all of them.
+    """
+    _err_msg = f"Can't instantiate abstract {cls.__name__} class without defining " + "{!r} classvar"
 
-        _required_class_vars_no_mro = getattr(cls, "_REQUIRED_CLASS_VARS_NO_MRO", None)
-        if _required_class_vars_no_mro is None:
-            return super().__new__(cls)
+    _required_class_vars = getattr(cls, "_REQUIRED_CLASS_VARS", None)
+    if _required_class_vars is None:
+        return _err_msg.format("_REQUIRED_CLASS_VARS")
 
-        for req_no_mro_attr in _required_class_vars_no_mro:
-            if req_no_mro_attr not in vars(cls):
-                emsg = _err_msg.format(req_no_mro_attr) + " explicitly"
-                if hasattr(cls, req_no_mro_attr):
-                    emsg += f" ({req_no_mro_attr} found in a subclass, but not explicitly in {cls.__name__})"
-                raise TypeError(emsg)
+    for req_attr in _required_class_vars:
+        if not hasattr(cls, req_attr):
+            return _err_msg.format(req_attr)
 
-        return super().__new__(cls)
+    _required_class_vars_no_mro = getattr(cls, "_REQUIRED_CLASS_VARS_NO_MRO", None)
+    if _required_class_vars_no_mro is None:
+        return None
+
+    for req_no_mro_attr in _required_class_vars_no_mro:
+        if req_no_mro_attr not in vars(cls):
+            emsg = _err_msg.format(req_no_mro_attr) + " explicitly"
+            if hasattr(cls, req_no_mro_attr):
+                emsg += f" ({req_no_mro_attr} found in a subclass, but not explicitly in {cls.__name__})"
+            return emsg
+
+    return None
+
+
+RequiredParamsABCMixin._REQUIRED_CLASS_VARS_ERROR = _check_required_class_vars(RequiredParamsABCMixin)
 
 
 class Serializable(ABC):
-    """Base class for any type that should be (de)serializable into/from :class:`~mcproto.Buffer` data."""
+    """Base class for any type that should be (de)serializable into/from :class:`~mcproto.Buffer` data.
+
+    Rather than implementing the (de)serialization methods manually, they can also be generated from declarative
+    field schemas, see :class:`~mcproto.protocol.schema.SchemaSerializable`.
+    """
 
     __slots__ = ()
 
-    @abstractmethod
     def serialize(self) -> Buffer:
         """Represent the object as a :class:`~mcproto.Buffer` (transmittable sequence of bytes)."""
+        buf = Buffer()
+        self.serialize_into(buf)
+        return buf
+
+    @abstractmethod
+    def serialize_into(self, buf: Buffer, /) -> None:
+        """Write the object into given :class:`~mcproto.Buffer` (as a transmittable sequence of bytes).
+
+        This allows the object to be serialized directly into an already existing buffer, avoiding the need
+        to create a new buffer for it, and copying it's data over (as would happen with :meth:`.serialize`).
+        """
         raise NotImplementedError
 
     @classmethod
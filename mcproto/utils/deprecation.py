@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import importlib.metadata
 import warnings
 from collections.abc import Callable
 from functools import wraps
-from typing import Optional, TypeVar, Union
+from typing import Optional, TYPE_CHECKING, TypeVar, Union
 
-from semantic_version import Version
 from typing_extensions import ParamSpec, Protocol
 
+if TYPE_CHECKING:
+    from semantic_version import Version
+
 __all__ = ["deprecated", "deprecation_warn"]
 
 R = TypeVar("R")
@@ -38,6 +39,11 @@ def deprecation_warn(
     :param extra_msg: Additional message included in the deprecation warning/exception at the end.
     :param stack_level: Stack level at which the warning is emitted.
     """
+    # These are only imported once a deprecated object is used, rather than on every import of this module
+    import importlib.metadata
+
+    from semantic_version import Version
+
     if isinstance(removal_version, str):
         removal_version = Version(removal_version)
 
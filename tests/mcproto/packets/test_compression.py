@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+import zlib
+
+import pytest
+
+from mcproto.packets import compression
+from mcproto.packets.compression import PacketCompressor
+
+PACKETS = [b"x" * 300, os.urandom(1000), b"", bytes(100_000), b"hello" * 1000]
+
+
+@pytest.mark.parametrize("level", [-1, 0, 1, 5, 9])
+@pytest.mark.parametrize("wbits", [9, 12, 15])
+def test_compress_valid_zlib_stream(level: int, wbits: int):
+    """Compressed data of each packet should be a standalone zlib stream."""
+    compressor = PacketCompressor(0, level=level, wbits=wbits)
+    for data in PACKETS:
+        assert zlib.decompress(compressor.compress(data)) == data
+
+
+def test_compress_independent_packets():
+    """Repeated packets shouldn't reference data of previous packets (they must be decompressable alone)."""
+    compressor = PacketCompressor(0)
+    first = compressor.compress(b"repeated data" * 20)
+    second = compressor.compress(b"repeated data" * 20)
+    assert first == second
+
+
+def test_decompress():
+    """Compressed data should decompress back into the same data."""
+    compressor = PacketCompressor(0)
+    for data in PACKETS:
+        assert compressor.decompress(compressor.compress(data), len(data)) == data
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"threshold": -1}, "threshold can't be negative"),
+        ({"threshold": 0, "wbits": 8}, "wbits must be within"),
+        ({"threshold": 0, "wbits": 16}, "wbits must be within"),
+    ],
+)
+def test_invalid_settings(kwargs: dict[str, int], match: str):
+    """Invalid compression settings should be rejected."""
+    with pytest.raises(ValueError, match=match):
+        PacketCompressor(**kwargs)
+
+
+async def test_async_compress_offloaded(monkeypatch: pytest.MonkeyPatch):
+    """Data over the offload threshold should be compressed in another thread, under it in the current one."""
+    threads: list[int] = []
+    compress = PacketCompressor.compress
+
+    def _compress(self: PacketCompressor, data: bytes) -> bytes:
+        threads.append(threading.get_ident())
+        return compress(self, data)
+
+    monkeypatch.setattr(PacketCompressor, "compress", _compress)
+    compressor = PacketCompressor(0, offload_threshold=1024)
+
+    for data in (b"x" * 1023, os.urandom(1024)):
+        assert zlib.decompress(await compressor.async_compress(data)) == data
+    assert len(threads) == 2
+    assert threads[0] == threading.get_ident()
+    assert threads[1] != threading.get_ident()
+
+
+async def test_async_decompress_offloaded(monkeypatch: pytest.MonkeyPatch):
+    """Data over the offload threshold should be decompressed in another thread, under it in the current one."""
+    threads: list[int] = []
+    decompress = PacketCompressor.decompress
+
+    def _decompress(self: PacketCompressor, data: bytes, data_length: int) -> bytes:
+        threads.append(threading.get_ident())
+        return decompress(self, data, data_length)
+
+    monkeypatch.setattr(PacketCompressor, "decompress", _decompress)
+    compressor = PacketCompressor(0, offload_threshold=1024)
+
+    for data in (b"x" * 1023, os.urandom(1024)):
+        assert await compressor.async_decompress(compressor.compress(data), len(data)) == data
+    assert len(threads) == 2
+    assert threads[0] == threading.get_ident()
+    assert threads[1] != threading.get_ident()
+
+
+async def test_async_offload_bounded(monkeypatch: pytest.MonkeyPatch):
+    """Only a limited amount of offloaded jobs should be submitted to the thread pool at once."""
+    monkeypatch.setattr(compression, "_OFFLOAD_MAX_PENDING", 2)
+    monkeypatch.setattr(compression, "_offload_slots", weakref.WeakKeyDictionary())
+    pending = 0
+    max_pending = 0
+    lock = threading.Lock()
+
+    def _job(data: bytes) -> bytes:
+        nonlocal pending, max_pending
+        with lock:
+            pending += 1
+            max_pending = max(max_pending, pending)
+        time.sleep(0.01)
+        with lock:
+            pending -= 1
+        return data
+
+    results = await asyncio.gather(*(compression._offload(_job, bytes([i])) for i in range(8)))
+    assert results == [bytes([i]) for i in range(8)]
+    assert max_pending <= 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Fork isn't supported on this platform.")
+def test_offload_executor_after_fork():
+    """A forked process shouldn't reuse the parent's offload thread pool, which has no threads in the child."""
+    assert compression._get_offload_executor().submit(int, 1).result(timeout=5) == 1
+
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover # Runs in the child process, outside of the coverage measurement
+        try:
+            result = compression._get_offload_executor().submit(int, 1).result(timeout=5)
+        except BaseException:
+            os._exit(1)
+        os._exit(0 if result == 1 else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status)
+    assert os.WEXITSTATUS(status) == 0
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+from unittest.mock import Mock
+
+import pytest
+
+from mcproto.packets.connection import AsyncPacketConnection, PacketProtocol
+from mcproto.packets.framer import PacketFramer
+from mcproto.packets.packet import GameState, Packet, PacketDirection
+from mcproto.packets.status.ping import PingPong
+
+PING_DATA = bytes.fromhex("0901000000000001e240")
+
+
+def _make_protocol(**kwargs) -> tuple[PacketProtocol, Mock]:
+    """Create a status state client protocol, connected to a mock transport."""
+    protocol = PacketProtocol(PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS), **kwargs)
+    transport = Mock(spec_set=asyncio.Transport)
+    transport.is_closing.return_value = False
+    protocol.connection_made(transport)
+    return protocol, transport
+
+
+def _feed(protocol: PacketProtocol, data: bytes) -> None:
+    """Pass the data to the protocol, the same way as the transport would."""
+    while data:
+        buffer = protocol.get_buffer(len(data))
+        size = min(len(buffer), len(data))
+        buffer[:size] = data[:size]
+        protocol.buffer_updated(size)
+        data = data[size:]
+
+
+class TestPacketProtocol:
+    """Tests for :class:`~mcproto.packets.connection.PacketProtocol`."""
+
+    async def test_read_packets(self):
+        """Packets split across, or sharing, the received chunks should all be produced."""
+        protocol, _ = _make_protocol(buffer_size=4)
+        _feed(protocol, PING_DATA * 3)
+
+        for _ in range(3):
+            packet = await protocol.read_packet()
+            assert isinstance(packet, PingPong)
+            assert packet.payload == 123456
+
+    async def test_read_waits_for_packet(self):
+        protocol, _ = _make_protocol()
+        task = asyncio.create_task(protocol.read_packet())
+        await asyncio.sleep(0)
+        assert not task.done()
+
+        _feed(protocol, PING_DATA)
+        packet = await asyncio.wait_for(task, timeout=1)
+        assert isinstance(packet, PingPong)
+
+    async def test_concurrent_readers(self):
+        """Each of the concurrently waiting readers should get a different packet."""
+        protocol, _ = _make_protocol()
+        tasks = [asyncio.create_task(protocol.read_packet()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        _feed(protocol, PING_DATA)
+        await asyncio.sleep(0)
+        assert sum(task.done() for task in tasks) == 1
+
+        _feed(protocol, PING_DATA * 2)
+        packets = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+        assert all(isinstance(packet, PingPong) for packet in packets)
+        assert protocol.queued_packets == 0
+
+    async def test_concurrent_drain(self):
+        """All of the writers waiting for the drain should be woken up once the buffer is drained."""
+        protocol, _ = _make_protocol()
+        protocol.pause_writing()
+        tasks = [asyncio.create_task(protocol.drain()) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert not any(task.done() for task in tasks)
+
+        protocol.resume_writing()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+
+    async def test_on_packet_callback(self):
+        packets: list[Packet] = []
+        protocol, _ = _make_protocol(on_packet=packets.append)
+        _feed(protocol, PING_DATA * 2)
+
+        assert len(packets) == 2
+        assert protocol.queued_packets == 0
+
+    async def test_flow_control(self):
+        """Reading should be paused once the queue is full, and resumed once it's consumed."""
+        protocol, transport = _make_protocol(max_queued=4)
+        _feed(protocol, PING_DATA * 4)
+        transport.pause_reading.assert_called_once_with()
+
+        await protocol.read_packet()
+        transport.resume_reading.assert_not_called()
+        await protocol.read_packet()
+        transport.resume_reading.assert_called_once_with()
+
+    async def test_connection_closed(self):
+        """Already received packets should still be produced after the connection is closed."""
+        protocol, _ = _make_protocol()
+        _feed(protocol, PING_DATA)
+        protocol.connection_lost(None)
+
+        assert isinstance(await protocol.read_packet(), PingPong)
+        with pytest.raises(IOError, match="Connection was closed"):
+            await protocol.read_packet()
+
+    async def test_invalid_data(self):
+        """Invalid data should close the transport, and the error should be raised when reading."""
+        protocol, transport = _make_protocol()
+        _feed(protocol, bytes([0x80, 0x80, 0x80, 0x80, 0x80]))
+
+        transport.close.assert_called_once_with()
+        with pytest.raises(IOError, match="over the maximum"):
+            await protocol.read_packet()
+
+    def test_invalid_buffer_size(self):
+        with pytest.raises(ValueError):
+            PacketProtocol(PacketFramer(PacketDirection.CLIENTBOUND), buffer_size=0)
+
+
+class TestAsyncPacketConnection:
+    """Tests for :class:`~mcproto.packets.connection.AsyncPacketConnection`, over a real socket."""
+
+    async def test_exchange_packets(self):
+        sock, peer = socket.socketpair()
+        loop = asyncio.get_running_loop()
+        server_framer = PacketFramer(PacketDirection.SERVERBOUND, game_state=GameState.STATUS)
+        client_framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+        transport, protocol = await loop.create_connection(lambda: PacketProtocol(client_framer), sock=sock)
+        peer.setblocking(False)
+
+        async with AsyncPacketConnection(transport, protocol, timeout=1) as conn:
+            await conn.write_packet(PingPong(42))
+            received = server_framer.receive_packets(await loop.sock_recv(peer, 1024))
+            assert isinstance(received[0], PingPong)
+            assert received[0].payload == 42
+
+            await loop.sock_sendall(peer, bytes(server_framer.send_packet(PingPong(43))) * 2)
+            for _ in range(2):
+                packet = await conn.read_packet()
+                assert isinstance(packet, PingPong)
+                assert packet.payload == 43
+
+            with pytest.raises(asyncio.TimeoutError):
+                conn.timeout = 0.01
+                await conn.read_packet()
+
+        assert transport.is_closing()
+        peer.close()
+
+    async def test_make_client(self):
+        received: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            received.set_result(await reader.read(1024))
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        address = server.sockets[0].getsockname()[:2]
+        try:
+            conn = await AsyncPacketConnection.make_client(
+                address,
+                1,
+                framer=PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS),
+            )
+            await conn.write_packet(PingPong(123456))
+            assert await asyncio.wait_for(received, timeout=1) == PING_DATA
+
+            with pytest.raises(IOError, match="Connection was closed"):
+                await conn.read_packet()
+            await conn.close()
+        finally:
+            server.close()
+            await server.wait_closed()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from typing import ClassVar, Optional
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from mcproto.packets import packet_map
+from mcproto.packets.dispatch import PacketDispatcher
+from mcproto.packets.handshaking.handshake import Handshake
+from mcproto.packets.login.login import LoginStart
+from mcproto.packets.packet import ClientBoundPacket, GameState, PacketDirection, RawPacket
+from mcproto.packets.packet_map import generate_packet_map
+from mcproto.packets.status.ping import PingPong
+from mcproto.packets.status.status import StatusRequest, StatusResponse
+
+
+def test_dispatch():
+    """Packets should be dispatched to the handler registered for their class."""
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND)
+    ping_handler, status_handler = Mock(), Mock()
+    dispatcher.register(PingPong, ping_handler)
+    dispatcher.register(StatusResponse, status_handler)
+
+    packet = PingPong(123)
+    assert dispatcher.dispatch(packet) is ping_handler.return_value
+    ping_handler.assert_called_once_with(packet)
+    status_handler.assert_not_called()
+
+
+def test_dispatch_fallback():
+    """Packets without a handler should go to the fallback handler, or be ignored without one."""
+    dispatcher = PacketDispatcher(PacketDirection.SERVERBOUND)
+    dispatcher.register(PingPong, Mock())
+    packet = StatusRequest()
+
+    assert dispatcher.dispatch(packet) is None
+
+    dispatcher.fallback = fallback = Mock()
+    dispatcher.dispatch(packet)
+    fallback.assert_called_once_with(packet)
+
+
+def test_register_replaces_handler():
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND)
+    old_handler, new_handler = Mock(), Mock()
+    dispatcher.register(PingPong, old_handler)
+    dispatcher.register(PingPong, new_handler)
+
+    dispatcher.dispatch(PingPong(1))
+    old_handler.assert_not_called()
+    new_handler.assert_called_once()
+
+
+@pytest.mark.parametrize("packet_class", [Handshake, LoginStart, StatusRequest])
+def test_register_wrong_direction(packet_class):
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND)
+    with pytest.raises(ValueError, match="isn't a clientbound packet"):
+        dispatcher.register(packet_class, Mock())
+
+
+def test_register_protocol_version(monkeypatch: pytest.MonkeyPatch):
+    """Packets existing only in some of the protocol versions should be accepted, unless another one is given."""
+
+    class OldPacket(ClientBoundPacket):
+        PACKET_ID: ClassVar[int] = 0x05
+        GAME_STATE: ClassVar[GameState] = GameState.STATUS
+        PROTOCOL_VERSIONS: ClassVar[Optional[range]] = range(0, 100)
+
+        __slots__ = ()
+
+    status_map = generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS)
+    range_maps = {0: {**status_map, OldPacket.PACKET_ID: OldPacket}, 100: status_map}
+    monkeypatch.setitem(packet_map._VERSION_RANGE_STARTS, (GameState.STATUS, PacketDirection.CLIENTBOUND), [0, 100])
+    monkeypatch.setattr(packet_map, "_build_packet_map", lambda _direction, _state, version: range_maps[version])
+
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND)
+    dispatcher.register(OldPacket, Mock())
+    dispatcher.register(OldPacket, Mock(), protocol_version=47)
+    with pytest.raises(ValueError, match="isn't a clientbound packet in protocol version 763"):
+        dispatcher.register(OldPacket, Mock(), protocol_version=763)
+
+
+def test_dispatch_id():
+    """Packets can be dispatched by their id, including unknown raw packets."""
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND, fallback=Mock())
+    handler = Mock()
+    dispatcher.register_id(GameState.PLAY, 0x7F, handler)
+
+    packet = RawPacket(0x7F, b"data")
+    dispatcher.dispatch_id(GameState.PLAY, packet.packet_id, packet)
+    handler.assert_called_once_with(packet)
+
+    # Ids outside of the registered range go to the fallback
+    for packet_id in (-1, 0x80):
+        dispatcher.dispatch_id(GameState.PLAY, packet_id, packet)
+    assert dispatcher.fallback.call_count == 2  # type: ignore
+
+    with pytest.raises(ValueError):
+        dispatcher.register_id(GameState.PLAY, -1, handler)
+
+
+async def test_async_dispatch():
+    """Asynchronous handlers should be awaited, synchronous ones just called."""
+    dispatcher = PacketDispatcher(PacketDirection.CLIENTBOUND)
+    async_handler, sync_handler = AsyncMock(return_value=1), Mock(return_value=2)
+    dispatcher.register(PingPong, async_handler)
+    dispatcher.register(StatusResponse, sync_handler)
+
+    assert await dispatcher.async_dispatch(PingPong(1)) == 1
+    async_handler.assert_awaited_once()
+    assert await dispatcher.async_dispatch(StatusResponse({})) == 2
+    assert await dispatcher.async_dispatch_id(GameState.STATUS, PingPong.PACKET_ID, RawPacket(1, b"")) == 1
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+from functools import partial
+
+import pytest
+
+from mcproto.buffer import Buffer
+from mcproto.encryption import AESCipher
+from mcproto.packets.compression import PacketCompressor
+from mcproto.packets.framer import MAX_FRAME_LENGTH, PacketFramer
+from mcproto.packets.handshaking.handshake import Handshake, NextState
+from mcproto.packets.interactions import sync_write_packet
+from mcproto.packets.login.login import LoginPluginRequest, LoginSetCompression, LoginStart, LoginSuccess
+from mcproto.packets.packet import GameState, Packet, PacketDirection, RawPacket
+from mcproto.packets.packet_map import generate_packet_map
+from mcproto.packets.status.ping import PingPong
+from mcproto.types.uuid import UUID
+
+SHARED_SECRET = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+
+
+def test_receive_partial_data():
+    """Packets should only be produced once they were fully received."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    data = bytes.fromhex("0901000000000001e240")
+
+    for byte in data[:-1]:
+        framer.receive_data(bytes([byte]))
+        assert framer.next_packet() is None
+
+    framer.receive_data(data[-1:])
+    packet = framer.next_packet()
+    assert isinstance(packet, PingPong)
+    assert packet.payload == 123456
+    assert framer.buffered == 0
+
+
+def test_receive_multiple_packets():
+    """All of the complete packets within a single chunk of data should be produced."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    data = bytes.fromhex("0901000000000001e240") * 3
+
+    packets = framer.receive_packets(data[:-3])
+    assert len(packets) == 2
+    packets.extend(framer.receive_packets(data[-3:]))
+    assert len(packets) == 3
+    assert all(isinstance(packet, PingPong) and packet.payload == 123456 for packet in packets)
+
+
+def test_next_frame():
+    """Raw packet frames should hold the packet id and the internal packet data."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    framer.receive_data(bytes.fromhex("0901000000000001e240"))
+
+    frame = framer.next_frame()
+    assert frame is not None
+    assert frame.packet_id == 1
+    assert frame.data == bytes.fromhex("000000000001e240")
+    assert framer.next_frame() is None
+
+
+def test_invalid_length_prefix():
+    """Packet length over the protocol's maximum should be rejected, before the rest of the frame is received."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    # Maximum allowed length, the frame simply isn't complete yet
+    framer.receive_data(bytes([0xFF, 0xFF, 0x7F]))
+    assert framer.next_packet() is None
+
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.STATUS)
+    framer.receive_data(bytes([0x80, 0x80, 0x80]))
+    with pytest.raises(IOError, match=f"over the maximum of {MAX_FRAME_LENGTH} bytes"):
+        framer.next_packet()
+
+
+def test_compressor_factory():
+    """The compressor enabled by the set compression packet should be made by the compressor factory."""
+    client = PacketFramer(
+        PacketDirection.CLIENTBOUND,
+        game_state=GameState.LOGIN,
+        compressor_factory=partial(PacketCompressor, max_data_length=1024, offload_threshold=512),
+    )
+    client.receive_packets(PacketFramer(PacketDirection.SERVERBOUND).send_packet(LoginSetCompression(16)))
+
+    assert client.compressor is not None
+    assert client.compressor.threshold == 16
+    assert client.compressor.max_data_length == 1024
+    assert client.compressor.offload_threshold == 512
+
+
+@pytest.mark.parametrize("raw_frames", [False, True])
+def test_state_tracking(raw_frames: bool):
+    """Both sides should switch their game state and enable compression, based on the exchanged packets."""
+    client = PacketFramer(PacketDirection.CLIENTBOUND)
+    server = PacketFramer(PacketDirection.SERVERBOUND)
+
+    def exchange(sender: PacketFramer, receiver: PacketFramer, packet: Packet) -> None:
+        receiver.receive_data(sender.send_packet(packet))
+        received = receiver.next_frame() if raw_frames else receiver.next_packet()
+        assert received is not None
+
+    exchange(client, server, Handshake(protocol_version=47, server_address="mc", server_port=25565, next_state=2))
+    assert client.game_state is server.game_state is GameState.LOGIN
+
+    exchange(client, server, LoginStart(username="foo"))
+    exchange(server, client, LoginSetCompression(16))
+    assert client.compressor is not None
+    assert server.compressor is not None
+
+    # A compressed packet (over the threshold)
+    exchange(server, client, LoginPluginRequest(1, "channel", b"x" * 100))
+
+    exchange(server, client, LoginSuccess(UUID(int=0), "foo"))
+    assert client.game_state is server.game_state is GameState.PLAY
+
+
+def test_next_lazy_packet():
+    """Lazy packets outside of the filter should be skipped, except for tracking the connection state."""
+    client = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.LOGIN)
+    server = PacketFramer(PacketDirection.SERVERBOUND, game_state=GameState.LOGIN)
+
+    for packet in (
+        LoginSetCompression(16),
+        LoginPluginRequest(1, "channel", b"x" * 100),
+        LoginPluginRequest(2, "channel", b"y"),
+        LoginSuccess(UUID(int=0), "foo"),
+    ):
+        client.receive_data(server.send_packet(packet))
+
+    lazy_packet = client.next_lazy_packet({LoginPluginRequest.PACKET_ID})
+    assert lazy_packet is not None
+    assert lazy_packet.message_id == 1
+    # The set compression packet was skipped, but still processed
+    assert client.compressor is not None
+
+    lazy_packet = client.next_lazy_packet({LoginPluginRequest.PACKET_ID})
+    assert lazy_packet is not None
+    assert not lazy_packet.decoded
+    assert lazy_packet.data == b"y"
+
+    assert client.next_lazy_packet({LoginPluginRequest.PACKET_ID}) is None
+    assert client.game_state is GameState.PLAY
+
+
+def test_status_handshake():
+    framer = PacketFramer(PacketDirection.SERVERBOUND)
+    packet = Handshake(protocol_version=47, server_address="mc", server_port=25565, next_state=NextState.STATUS)
+    framer.send_packet(packet)
+    assert framer.game_state is GameState.STATUS
+    assert framer.protocol_version == 47
+
+
+def test_raw_packet_state_tracking():
+    """Sent raw packets affecting the connection state should update the state, same as the deserialized ones."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND)
+    handshake = Handshake(protocol_version=47, server_address="mc", server_port=25565, next_state=NextState.LOGIN)
+    framer.send_packet(RawPacket(Handshake.PACKET_ID, handshake.serialize()))
+    assert framer.game_state is GameState.LOGIN
+    assert framer.protocol_version == 47
+
+    server = PacketFramer(PacketDirection.SERVERBOUND, game_state=GameState.LOGIN)
+    server.send_packet(RawPacket(LoginSetCompression.PACKET_ID, LoginSetCompression(16).serialize()))
+    assert server.compressor is not None
+    server.send_packet(RawPacket(LoginSuccess.PACKET_ID, LoginSuccess(UUID(int=0), "foo").serialize()))
+    assert server.game_state is GameState.PLAY
+
+
+def test_unsupported_protocol_version():
+    """Handshake with an unsupported protocol version should be rejected with IOError, keeping the state."""
+    server = PacketFramer(PacketDirection.SERVERBOUND)
+    data = Buffer()
+    sync_write_packet(
+        data,
+        Handshake(protocol_version=-1, server_address="mc", server_port=25565, next_state=NextState.LOGIN),
+    )
+
+    with pytest.raises(IOError, match="unsupported protocol version"):
+        server.receive_packets(bytes(data))
+    assert server.game_state is GameState.HANDSHAKING
+    assert server.protocol_version is None
+
+
+def test_protocol_version_packet_map():
+    """The packet map should be selected for the game state and the protocol version."""
+    framer = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.LOGIN, protocol_version=47)
+    assert framer.packet_map is generate_packet_map(PacketDirection.CLIENTBOUND, GameState.LOGIN, 47)
+
+    with pytest.raises(ValueError, match="Unsupported protocol version"):
+        PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.LOGIN, protocol_version=-1)
+
+
+def test_encryption():
+    """Once encryption is enabled, the data should be encrypted, including already received, unconsumed data."""
+    try:
+        server_cipher, client_cipher = AESCipher(SHARED_SECRET), AESCipher(SHARED_SECRET)
+    except ImportError:
+        pytest.skip("No cipher backend is installed.")
+
+    client = PacketFramer(PacketDirection.CLIENTBOUND, game_state=GameState.LOGIN)
+    server = PacketFramer(PacketDirection.SERVERBOUND, game_state=GameState.LOGIN)
+    server.enable_encryption(server_cipher)
+
+    packet = LoginPluginRequest(1, "channel", b"data")
+    plain_data = bytes(PacketFramer(PacketDirection.SERVERBOUND).send_packet(packet))
+    data = bytes(server.send_packet(packet)) + bytes(server.send_packet(packet))
+    assert data[: len(plain_data)] != plain_data
+
+    # Receive the first packet, and a part of the second one, before enabling the encryption
+    client.receive_data(data[:3])
+    assert client.next_packet() is None
+    client.enable_encryption(client_cipher)
+    client.receive_data(data[3:])
+
+    for received in (client.next_packet(), client.next_packet()):
+        assert isinstance(received, LoginPluginRequest)
+        assert received.data == b"data"
@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import socket
+import zlib
+from unittest.mock import Mock
+
+import pytest
+
+from mcproto.buffer import Buffer
+from mcproto.connection import TCPSyncConnection
+from mcproto.packets.compression import PacketCompressor
+from mcproto.packets.interactions import (
+    async_read_lazy_packet,
+    async_read_packet,
+    async_read_raw_packet,
+    async_write_packet,
+    sync_read_lazy_packet,
+    sync_read_packet,
+    sync_read_raw_packet,
+    sync_write_packet,
+)
+from mcproto.packets.login.login import LoginPluginResponse
+from mcproto.packets.packet import GameState, PacketDirection, RawPacket
+from mcproto.packets.packet_map import generate_packet_map
+from mcproto.packets.status.ping import PingPong
+from mcproto.packets.status.status import StatusResponse
+from mcproto.protocol.base_io import BaseAsyncReader, BaseAsyncWriter
+
+STATUS_CLIENTBOUND = generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS)
+LOGIN_SERVERBOUND = generate_packet_map(PacketDirection.SERVERBOUND, GameState.LOGIN)
+
+
+def test_write_read_packet():
+    """Packets written into a buffer should be read back the same."""
+    buf = Buffer()
+    sync_write_packet(buf, PingPong(123456))
+
+    assert buf == bytearray(bytes.fromhex("0901000000000001e240"))
+    packet = sync_read_packet(buf, STATUS_CLIENTBOUND)
+    assert isinstance(packet, PingPong)
+    assert packet.payload == 123456
+
+
+def test_write_packet_connection():
+    """Packets written into a connection should be sent out at once."""
+    sock, peer = socket.socketpair()
+    with sock, peer:
+        conn = TCPSyncConnection(sock)
+        with conn.cork():
+            sync_write_packet(conn, PingPong(123456))
+            # The outer cork context holds back the packet
+            assert conn._write_buffer
+
+        assert peer.recv(1024) == bytes.fromhex("0901000000000001e240")
+
+
+def test_write_packet_long_length_prefix():
+    """Packets with a length that doesn't fit into a single byte varint should be framed properly."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200))
+
+    # 1 byte packet id + 1 byte message id + 1 byte bool + 200 bytes data
+    assert buf[:2] == bytearray(bytes.fromhex("cb01"))
+    assert len(buf) == 2 + 203
+    packet = sync_read_packet(buf, LOGIN_SERVERBOUND)
+    assert isinstance(packet, LoginPluginResponse)
+    assert packet.data == b"x" * 200
+
+
+def test_write_packet_under_compression_threshold():
+    """Packets under the compression threshold should be sent uncompressed, with a zero data length."""
+    buf = Buffer()
+    sync_write_packet(buf, PingPong(123456), compressor=PacketCompressor(256))
+
+    assert buf == bytearray(bytes.fromhex("0a0001000000000001e240"))
+    packet = sync_read_packet(buf, STATUS_CLIENTBOUND, compressor=PacketCompressor(256))
+    assert isinstance(packet, PingPong)
+    assert packet.payload == 123456
+
+
+def test_write_packet_over_compression_threshold():
+    """Packets over the compression threshold should be zlib compressed, with the uncompressed data length."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=PacketCompressor(64))
+
+    length = buf.read_varint()
+    assert length == buf.remaining
+    assert buf.read_varint() == 203
+    assert zlib.decompress(buf.read(buf.remaining)) == bytes.fromhex("020101") + b"x" * 200
+
+
+@pytest.mark.parametrize("compression_threshold", [0, 64, 256])
+def test_write_read_packet_compressed(compression_threshold: int):
+    """Packets written with compression enabled should be read back the same."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=PacketCompressor(compression_threshold))
+
+    packet = sync_read_packet(buf, LOGIN_SERVERBOUND, compressor=PacketCompressor(compression_threshold))
+    assert isinstance(packet, LoginPluginResponse)
+    assert packet.data == b"x" * 200
+    assert buf.remaining == 0
+
+
+def test_read_packet_compressed_under_threshold():
+    """Compressed packets with data length under the threshold should be rejected."""
+    buf = Buffer()
+    sync_write_packet(buf, PingPong(123456), compressor=PacketCompressor(0))
+
+    with pytest.raises(IOError, match="below the compression threshold"):
+        sync_read_packet(buf, STATUS_CLIENTBOUND, compressor=PacketCompressor(256))
+
+
+def _compressed_frame(data_length: int, data: bytes) -> Buffer:
+    """Build a compressed packet frame with given declared data length and (already compressed) data."""
+    payload = Buffer()
+    payload.write_varint(data_length)
+    payload.write(data)
+    buf = Buffer()
+    buf.write_bytearray(payload)
+    return buf
+
+
+def test_read_packet_over_max_data_length():
+    """Compressed packets declaring a data length over the limit should be rejected before decompression."""
+    buf = _compressed_frame(2**30, b"not even zlib data")
+
+    with pytest.raises(IOError, match="above the maximum allowed data length"):
+        sync_read_packet(buf, STATUS_CLIENTBOUND, compressor=PacketCompressor(0))
+
+
+@pytest.mark.parametrize(
+    ("data_length", "data"),
+    [
+        # Decompresses into more data than declared (a "zip bomb")
+        (9, zlib.compress(bytes.fromhex("01000000000001e240") + bytes(2**20))),
+        # Decompresses into less data than declared
+        (100, zlib.compress(bytes.fromhex("01000000000001e240"))),
+        # Not valid zlib data
+        (9, b"garbage"),
+    ],
+)
+def test_read_packet_data_length_mismatch(data_length: int, data: bytes):
+    """Compressed packets which don't decompress into the declared data length should be rejected."""
+    buf = _compressed_frame(data_length, data)
+
+    with pytest.raises(IOError, match="compressed packet"):
+        sync_read_packet(buf, STATUS_CLIENTBOUND, compressor=PacketCompressor(0))
+
+
+def test_read_packet_custom_max_data_length():
+    """The maximum data length of compressed packets should be configurable."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=PacketCompressor(0))
+
+    with pytest.raises(IOError, match="above the maximum allowed data length of 100"):
+        sync_read_packet(buf, LOGIN_SERVERBOUND, compressor=PacketCompressor(0, max_data_length=100))
+
+
+class AsyncBuffer(BaseAsyncReader, BaseAsyncWriter):
+    """Asynchronous wrapper around a :class:`~mcproto.buffer.Buffer`."""
+
+    def __init__(self) -> None:
+        self.buffer = Buffer()
+
+    async def write(self, data: bytes) -> None:
+        self.buffer.write(data)
+
+    async def read(self, length: int) -> bytearray:
+        return self.buffer.read(length)
+
+
+@pytest.mark.parametrize("offload_threshold", [0, 2**20])
+async def test_async_write_read_packet_compressed(offload_threshold: int):
+    """Compressed packets should be written and read back the same, even when offloaded into a thread pool."""
+    compressor = PacketCompressor(64, offload_threshold=offload_threshold)
+    buf = AsyncBuffer()
+    await async_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=compressor)
+    await async_write_packet(buf, PingPong(123456), compressor=compressor)
+
+    packet = await async_read_packet(buf, LOGIN_SERVERBOUND, compressor=compressor)
+    assert isinstance(packet, LoginPluginResponse)
+    assert packet.data == b"x" * 200
+    packet = await async_read_packet(buf, STATUS_CLIENTBOUND, compressor=compressor)
+    assert isinstance(packet, PingPong)
+    assert packet.payload == 123456
+    assert buf.buffer.remaining == 0
+
+
+def test_read_lazy_packet():
+    """Lazy packets should only get deserialized once needed, and only once."""
+    buf = Buffer()
+    sync_write_packet(buf, PingPong(123456))
+
+    lazy_packet = sync_read_lazy_packet(buf, STATUS_CLIENTBOUND)
+    assert lazy_packet.packet_id == PingPong.PACKET_ID
+    assert lazy_packet.packet_class is PingPong
+    assert lazy_packet.raw_data == bytes.fromhex("000000000001e240")
+    assert not lazy_packet.decoded
+
+    # Attribute access decodes the packet
+    assert lazy_packet.payload == 123456
+    assert lazy_packet.decoded
+    assert lazy_packet.decode() is lazy_packet.decode()
+    # The raw data stays available
+    assert lazy_packet.raw_data.remaining == 8
+
+
+@pytest.mark.parametrize("compressor", [None, PacketCompressor(0), PacketCompressor(64)])
+def test_read_lazy_packet_filter(compressor: PacketCompressor | None):
+    """Packets with ids outside of the filter should be skipped."""
+    buf = Buffer()
+    sync_write_packet(buf, StatusResponse({"description": "x" * 100}), compressor=compressor)
+    sync_write_packet(buf, PingPong(123456), compressor=compressor)
+    sync_write_packet(buf, StatusResponse({"description": "y" * 100}), compressor=compressor)
+
+    lazy_packet = sync_read_lazy_packet(buf, STATUS_CLIENTBOUND, compressor=compressor, packet_ids={0x01})
+    assert lazy_packet.packet_class is PingPong
+    assert lazy_packet.payload == 123456
+
+    lazy_packet = sync_read_lazy_packet(buf, STATUS_CLIENTBOUND, compressor=compressor, packet_ids={0x00})
+    assert lazy_packet.packet_class is StatusResponse
+    assert lazy_packet.data == {"description": "y" * 100}
+    assert buf.remaining == 0
+
+
+async def test_async_read_lazy_packet_filter():
+    compressor = PacketCompressor(0, offload_threshold=0)
+    buf = AsyncBuffer()
+    await async_write_packet(buf, StatusResponse({"description": "x"}), compressor=compressor)
+    await async_write_packet(buf, PingPong(123456), compressor=compressor)
+
+    lazy_packet = await async_read_lazy_packet(buf, STATUS_CLIENTBOUND, compressor=compressor, packet_ids={0x01})
+    assert lazy_packet.packet_class is PingPong
+    assert lazy_packet.payload == 123456
+    assert buf.buffer.remaining == 0
+
+
+def test_read_lazy_packet_filter_skips_decompression():
+    """Skipped compressed packets shouldn't be decompressed (beyond the packet id), nor validated."""
+    compressor = PacketCompressor(0)
+    # Compressed packet with the id of 0x00, but declaring a wrong data length (which would only be detected
+    # once the whole packet got decompressed)
+    buf = _compressed_frame(1000, zlib.compress(b"\x00" + b"x" * 10))
+    sync_write_packet(buf, PingPong(123456), compressor=compressor)
+
+    lazy_packet = sync_read_lazy_packet(buf, STATUS_CLIENTBOUND, compressor=compressor, packet_ids={0x01})
+    assert lazy_packet.payload == 123456
+
+
+def test_raw_packet_passthrough():
+    """Raw packets (even with unknown ids) should be written back exactly as they were read."""
+    frame = bytes.fromhex("057f01020304")
+    buf = Buffer(frame)
+
+    packet = sync_read_raw_packet(buf)
+    assert packet.packet_id == 0x7F
+    assert packet.data == bytes.fromhex("01020304")
+    assert packet.compressed_data is None
+
+    out = Buffer()
+    sync_write_packet(out, packet)
+    assert out == frame
+
+
+def test_raw_packet_forward_compressed(monkeypatch: pytest.MonkeyPatch):
+    """Compressed raw packets should be written back without recompression, when the threshold matches."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=PacketCompressor(64))
+    frame = bytes(buf)
+
+    packet = sync_read_raw_packet(buf, compressor=PacketCompressor(64))
+    assert packet.packet_id == LoginPluginResponse.PACKET_ID
+    assert packet.compression_threshold == 64
+
+    # The packet shouldn't get compressed again
+    monkeypatch.setattr(PacketCompressor, "compress", Mock(side_effect=AssertionError))
+    out = Buffer()
+    sync_write_packet(out, packet, compressor=PacketCompressor(64))
+    assert out == frame
+    # The packet data wasn't needed, so it wasn't decompressed
+    assert packet._data is None
+
+
+@pytest.mark.parametrize("compressor", [None, PacketCompressor(0), PacketCompressor(256)])
+def test_raw_packet_forward_recompressed(compressor: PacketCompressor | None):
+    """Compressed raw packets should be decompressed, when written with a different (or no) compression."""
+    buf = Buffer()
+    sync_write_packet(buf, LoginPluginResponse(1, b"x" * 200), compressor=PacketCompressor(64))
+    packet = sync_read_raw_packet(buf, compressor=PacketCompressor(64))
+
+    out = Buffer()
+    sync_write_packet(out, packet, compressor=compressor)
+    received = sync_read_packet(out, LOGIN_SERVERBOUND, compressor=compressor)
+    assert isinstance(received, LoginPluginResponse)
+    assert received.data == b"x" * 200
+
+
+@pytest.mark.parametrize("compressor", [None, PacketCompressor(0)])
+def test_raw_packet_data_immutable(compressor: PacketCompressor | None):
+    """The raw packet data should be immutable bytes, which can be used repeatedly."""
+    buf = Buffer()
+    sync_write_packet(buf, PingPong(123456), compressor=compressor)
+    packet = sync_read_raw_packet(buf, compressor=compressor)
+
+    for _ in range(2):
+        assert isinstance(packet.data, bytes)
+        assert PingPong.deserialize(Buffer(packet.data)).payload == 123456
+    assert hash(packet.data) == hash(bytes(PingPong(123456).serialize()))
+
+
+async def test_async_raw_packet():
+    buf = AsyncBuffer()
+    await async_write_packet(buf, RawPacket(0x7F, b"data"), compressor=PacketCompressor(0))
+
+    packet = await async_read_raw_packet(buf, compressor=PacketCompressor(0))
+    assert packet.packet_id == 0x7F
+    assert packet.compressed_data is not None
+    assert packet.data == b"data"
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import ClassVar, Optional
+
+import pytest
+
+from mcproto.packets.packet import ClientBoundPacket, GameState, Packet, PacketDirection, ServerBoundPacket
+from mcproto.packets.packet_map import (
+    _generate_registry_source,
+    _registry_path,
+    _split_version_ranges,
+    generate_packet_map,
+)
+
+
+def _make_packet(packet_id: int, protocol_versions: Optional[range] = None) -> type[Packet]:
+    """Create a dummy packet class with given id, existing in given protocol versions."""
+
+    class DummyPacket(ClientBoundPacket):
+        PACKET_ID: ClassVar[int] = packet_id
+        GAME_STATE: ClassVar[GameState] = GameState.PLAY
+        PROTOCOL_VERSIONS: ClassVar[Optional[range]] = protocol_versions
+
+        __slots__ = ()
+
+    return DummyPacket
+
+
+def test_registry_up_to_date():
+    """The checked-in packet registry should match the packets found by walking the packet modules."""
+    assert (
+        _registry_path().read_text() == _generate_registry_source()
+    ), "Packet registry is outdated, regenerate it with: poetry run task packet-registry"
+
+
+@pytest.mark.parametrize("state", list(GameState))
+@pytest.mark.parametrize(
+    ("direction", "direction_class"),
+    [(PacketDirection.SERVERBOUND, ServerBoundPacket), (PacketDirection.CLIENTBOUND, ClientBoundPacket)],
+)
+def test_packet_map(state: GameState, direction: PacketDirection, direction_class: type):
+    packet_map = generate_packet_map(direction, state)
+    for packet_id, packet_class in packet_map.items():
+        assert issubclass(packet_class, direction_class)
+        assert packet_class.PACKET_ID == packet_id
+        assert packet_class.GAME_STATE is state
+
+    # The map is cached, and immutable
+    assert generate_packet_map(direction, state) is packet_map
+    with pytest.raises(TypeError):
+        packet_map[0] = None  # type: ignore
+
+
+def test_packet_map_protocol_version():
+    """Protocol versions within the same version range should share the same packet map."""
+    packet_map = generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS)
+    for protocol_version in (0, 47, 763):
+        assert generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS, protocol_version) is packet_map
+
+    with pytest.raises(ValueError, match="Unsupported protocol version"):
+        generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS, -1)
+
+
+def test_split_version_ranges():
+    """Packets should be split into version ranges at the points where they're added or removed."""
+    always = _make_packet(0x00)
+    old = _make_packet(0x01, range(0, 100))
+    new = _make_packet(0x01, range(100, 200))
+    added = _make_packet(0x02, range(150, 200))
+
+    assert _split_version_ranges([always, old, new, added]) == [
+        (0, {0x00: always, 0x01: old}),
+        (100, {0x00: always, 0x01: new}),
+        (150, {0x00: always, 0x01: new, 0x02: added}),
+        (200, {0x00: always}),
+    ]
+
+
+def test_split_version_ranges_merged():
+    """Adjacent version ranges with the same packets should be merged."""
+    first = _make_packet(0x00, range(0, 100))
+    second = _make_packet(0x01, range(50, 100))
+    third = _make_packet(0x02, range(100, 150))
+    unused = _make_packet(0x03, range(30, 30))  # Empty range, splitting the versions without any change
+
+    assert _split_version_ranges([first, second, third, unused]) == [
+        (0, {0x00: first}),
+        (50, {0x00: first, 0x01: second}),
+        (100, {0x02: third}),
+        (150, {}),
+    ]
+    # A single always present packet gives a single range
+    always = _make_packet(0x00)
+    assert _split_version_ranges([always]) == [(0, {0x00: always})]
+
+
+def test_split_version_ranges_conflict():
+    """Packets with the same id, existing in the same protocol version should be rejected."""
+    with pytest.raises(ValueError, match="share the packet id"):
+        _split_version_ranges([_make_packet(0x00), _make_packet(0x00, range(10, 20))])
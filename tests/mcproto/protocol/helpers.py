@@ -9,7 +9,7 @@ class WriteFunctionMock(Mock):
         super().__init__(*a, **kw)
         self.combined_data = bytearray()
 
-    def __call__(self, data: bytearray) -> None:
+    def __call__(self, data: bytes) -> None:
         """Override mock's ``__call__`` to extend our :attr:`.combined_data` bytearray.
 
         This allows us to keep track of exactly what data was written by the mocked write function
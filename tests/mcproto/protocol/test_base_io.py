@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from mcproto.buffer import Buffer
 from mcproto.protocol.base_io import (
     BaseAsyncReader,
     BaseAsyncWriter,
@@ -246,6 +247,31 @@ class WriterTests(ABC):
         with pytest.raises(struct.error):
             self.writer.write_value(fmt, value)
 
+    @pytest.mark.parametrize(
+        ("fmts", "values", "expected_bytes"),
+        [
+            ((StructFormat.UBYTE, StructFormat.BYTE), (255, -1), [255, 255]),
+            ((StructFormat.SHORT, StructFormat.BOOL, StructFormat.UBYTE), (-2, True, 7), [255, 254, 1, 7]),
+            ((StructFormat.DOUBLE,) * 2, (1.0, -2.5), list(struct.pack(">dd", 1.0, -2.5))),
+        ],
+    )
+    def test_write_values(
+        self,
+        fmts: tuple[StructFormat, ...],
+        values: tuple[Any, ...],
+        expected_bytes: list[int],
+        write_mock: WriteFunctionMock,
+    ):
+        """Writing multiple values results in correct bytes, written with a single write call."""
+        self.writer.write_values(fmts, values)
+        write_mock.assert_has_data(bytearray(expected_bytes))
+        write_mock.assert_called_once()
+
+    def test_write_values_mismatched(self):
+        """Writing a different amount of values than formats should fail."""
+        with pytest.raises(struct.error):
+            self.writer.write_values((StructFormat.UBYTE, StructFormat.UBYTE), (1,))
+
     @pytest.mark.parametrize(
         ("number", "expected_bytes"),
         [
@@ -285,9 +311,16 @@ class WriterTests(ABC):
         [(127, [127]), (16384, [128, 128, 1]), (-128, [128, 255, 255, 255, 15]), (-16383, [129, 128, 255, 255, 15])],
     )
     def test_write_varint(self, number: int, expected_bytes: list[int], write_mock: WriteFunctionMock):
-        """Writing varints results in correct bytes."""
+        """Writing varints results in correct bytes, written with a single write call."""
         self.writer.write_varint(number)
         write_mock.assert_has_data(bytearray(expected_bytes))
+        write_mock.assert_called_once()
+
+    @pytest.mark.parametrize("number", [2**31, -(2**31) - 1])
+    def test_write_varint_out_of_range(self, number: int):
+        """Varints should only work on numbers which fit into a signed 32-bit integer."""
+        with pytest.raises(ValueError):
+            self.writer.write_varint(number)
 
     @pytest.mark.parametrize(
         ("number", "expected_bytes"),
@@ -303,6 +336,33 @@ class WriterTests(ABC):
         self.writer.write_varlong(number)
         write_mock.assert_has_data(bytearray(expected_bytes))
 
+    @pytest.mark.parametrize(
+        ("values", "expected_bytes"),
+        [
+            ([], [0]),
+            ([1, 127, 128], [3, 1, 127, 128, 1]),
+            ([-1, 16384], [2, 255, 255, 255, 255, 15, 128, 128, 1]),
+        ],
+    )
+    def test_write_varint_array(self, values: list[int], expected_bytes: list[int], write_mock: WriteFunctionMock):
+        """Writing varint arrays results in correct bytes, written with a single write call."""
+        self.writer.write_varint_array(values)
+        write_mock.assert_has_data(bytearray(expected_bytes))
+        write_mock.assert_called_once()
+
+    @pytest.mark.parametrize(
+        ("values", "expected_bytes"),
+        [
+            ([], [0]),
+            ([1, -128], [2, 1, 128, 255, 255, 255, 255, 255, 255, 255, 255, 1]),
+        ],
+    )
+    def test_write_varlong_array(self, values: list[int], expected_bytes: list[int], write_mock: WriteFunctionMock):
+        """Writing varlong arrays results in correct bytes, written with a single write call."""
+        self.writer.write_varlong_array(values)
+        write_mock.assert_has_data(bytearray(expected_bytes))
+        write_mock.assert_called_once()
+
     @pytest.mark.parametrize(
         ("data", "expected_bytes"),
         [
@@ -441,6 +501,26 @@ class ReaderTests(ABC):
         read_mock.combined_data = bytearray(read_bytes)
         assert self.reader.read_value(fmt) == expected_value
 
+    @pytest.mark.parametrize(
+        ("fmts", "read_bytes", "expected_values"),
+        [
+            ((StructFormat.UBYTE, StructFormat.BYTE), [255, 255], (255, -1)),
+            ((StructFormat.SHORT, StructFormat.BOOL, StructFormat.UBYTE), [255, 254, 1, 7], (-2, True, 7)),
+            ((StructFormat.DOUBLE,) * 2, list(struct.pack(">dd", 1.0, -2.5)), (1.0, -2.5)),
+        ],
+    )
+    def test_read_values(
+        self,
+        fmts: tuple[StructFormat, ...],
+        read_bytes: list[int],
+        expected_values: tuple[Any, ...],
+        read_mock: ReadFunctionMock,
+    ):
+        """Reading multiple values results in correct values, read with a single read call."""
+        read_mock.combined_data = bytearray(read_bytes)
+        assert self.reader.read_values(fmts) == expected_values
+        read_mock.assert_called_once()
+
     @pytest.mark.parametrize(
         ("read_bytes", "expected_value"),
         [
@@ -497,6 +577,37 @@ class ReaderTests(ABC):
         read_mock.combined_data = bytearray(read_bytes)
         assert self.reader.read_varlong() == expected_value
 
+    @pytest.mark.parametrize(
+        ("read_bytes", "expected_values"),
+        [
+            ([0], []),
+            ([3, 1, 127, 128, 1], [1, 127, 128]),
+            ([2, 255, 255, 255, 255, 15, 128, 128, 1], [-1, 16384]),
+        ],
+    )
+    def test_read_varint_array(self, read_bytes: list[int], expected_values: list[int], read_mock: ReadFunctionMock):
+        """Reading varint arrays results in correct values."""
+        read_mock.combined_data = bytearray(read_bytes)
+        assert self.reader.read_varint_array() == expected_values
+
+    @pytest.mark.parametrize(
+        ("read_bytes", "expected_values"),
+        [
+            ([0], []),
+            ([2, 1, 128, 255, 255, 255, 255, 255, 255, 255, 255, 1], [1, -128]),
+        ],
+    )
+    def test_read_varlong_array(self, read_bytes: list[int], expected_values: list[int], read_mock: ReadFunctionMock):
+        """Reading varlong arrays results in correct values."""
+        read_mock.combined_data = bytearray(read_bytes)
+        assert self.reader.read_varlong_array() == expected_values
+
+    def test_read_varint_array_negative_size(self, read_mock: ReadFunctionMock):
+        """Reading varint array with a negative size should raise an IOError."""
+        read_mock.combined_data = bytearray([255, 255, 255, 255, 15])
+        with pytest.raises(IOError):
+            self.reader.read_varint_array()
+
     @pytest.mark.parametrize(
         ("read_bytes", "expected_bytes"),
         [
@@ -511,6 +622,28 @@ class ReaderTests(ABC):
         read_mock.combined_data = bytearray(read_bytes)
         assert self.reader.read_bytearray() == expected_bytes
 
+    @pytest.mark.parametrize(
+        ("read_bytes", "expected_bytes"),
+        [
+            ([0], b""),
+            ([1, 1], b"\x01"),
+            ([8, 1, 2, 3, 102, 111, 117, 114, 5], b"\x01\x02\x03four\x05"),
+        ],
+    )
+    def test_read_buffer(self, read_bytes: list[int], expected_bytes: bytes, read_mock: ReadFunctionMock):
+        """Reading a size-prefixed buffer results in a buffer with the correct (unread) bytes."""
+        read_mock.combined_data = bytearray(read_bytes)
+        buf = self.reader.read_buffer()
+        assert isinstance(buf, Buffer)
+        assert buf == expected_bytes
+        assert buf.pos == 0
+
+    def test_read_buffer_negative_size(self, read_mock: ReadFunctionMock):
+        """Reading a buffer with a negative size should raise an IOError."""
+        read_mock.combined_data = bytearray([255, 255, 255, 255, 15])
+        with pytest.raises(IOError, match="negative"):
+            self.reader.read_buffer()
+
     @pytest.mark.parametrize(
         ("read_bytes", "expected_string"),
         [
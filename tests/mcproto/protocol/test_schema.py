@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import struct
+from collections.abc import Sequence
+from typing import ClassVar, Optional
+
+import pytest
+
+from mcproto.buffer import Buffer
+from mcproto.protocol.base_io import StructFormat
+from mcproto.protocol.schema import (
+    ConstantType,
+    Field,
+    OptionalType,
+    REMAINING_BYTES,
+    SchemaSerializable,
+    StructType,
+    UTF,
+    VARINT,
+)
+
+
+class Example(SchemaSerializable):
+    """Serializable class with a mix of all kinds of fields."""
+
+    __slots__ = ("a", "b", "c", "d", "e")
+
+    FIELDS: ClassVar[Sequence[Field]] = (
+        Field("a", VARINT),
+        Field("b", StructType(StructFormat.USHORT)),
+        Field("c", StructType(StructFormat.LONGLONG)),
+        Field("unused", ConstantType(UTF, "xy")),
+        Field("d", OptionalType(StructType(StructFormat.INT))),
+        Field("e", OptionalType(REMAINING_BYTES)),
+    )
+
+    def __init__(self, a: int, b: int, c: int, d: Optional[int], e: Optional[bytes]):
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.e = e
+
+
+@pytest.mark.parametrize(
+    ("obj", "expected_bytes"),
+    [
+        (
+            Example(1, 2, 3, None, b"data"),
+            bytes.fromhex("01") + bytes.fromhex("0002 0000000000000003") + b"\x02xy" + b"\x00" + b"\x01data",
+        ),
+        (
+            Example(-1, 0, -5, 7, None),
+            bytes.fromhex("ffffffff0f 0000 fffffffffffffffb") + b"\x02xy" + b"\x01\x00\x00\x00\x07" + b"\x00",
+        ),
+    ],
+)
+def test_serialization(obj: Example, expected_bytes: bytes):
+    """The generated methods should (de)serialize all of the fields, in order."""
+    assert obj.serialize() == expected_bytes
+
+    buf = Buffer(expected_bytes)
+    result = Example.deserialize(buf)
+    assert (result.a, result.b, result.c, result.d, result.e) == (obj.a, obj.b, obj.c, obj.d, obj.e)
+    assert buf.remaining == 0
+
+
+def test_fused_struct_fields():
+    """Adjacent fixed-width fields should be read and written with a single struct call, without any closures."""
+    for method in (Example.serialize_into, Example.deserialize.__func__):  # type: ignore
+        used_globals = [method.__globals__[name] for name in method.__code__.co_names if name in method.__globals__]
+        assert not any(hasattr(const, "co_code") for const in method.__code__.co_consts)
+
+        if method is Example.serialize_into:
+            structs = [obj for obj in used_globals if isinstance(obj, struct.Struct)]
+            assert [compiled.format for compiled in structs] == [">Hq"]
+        else:
+            fmts = [obj for obj in used_globals if isinstance(obj, tuple)]
+            assert fmts == [(StructFormat.USHORT, StructFormat.LONGLONG)]
+
+
+def test_public_buffer_api():
+    """The generated code shouldn't rely on any private attributes of the buffer."""
+    for method in (Example.serialize_into, Example.deserialize.__func__):  # type: ignore
+        attributes = [name for name in method.__code__.co_names if name not in method.__globals__]
+        assert attributes
+        assert not any(name.startswith("_") for name in attributes)
+
+
+def test_explicit_methods_kept():
+    """Methods defined on the class explicitly shouldn't be replaced by the generated ones."""
+
+    class Custom(SchemaSerializable):
+        __slots__ = ("a",)
+
+        FIELDS: ClassVar[Sequence[Field]] = (Field("a", VARINT),)
+
+        def __init__(self, a: int):
+            self.a = a
+
+        def serialize_into(self, buf: Buffer) -> None:
+            buf.write_varint(self.a * 2)
+
+    assert Custom(1).serialize() == b"\x02"
+    assert Custom.deserialize(Buffer(b"\x02")).a == 2
+
+
+def test_empty_fields():
+    class Empty(SchemaSerializable):
+        __slots__ = ()
+
+        FIELDS: ClassVar[Sequence[Field]] = ()
+
+    assert Empty().serialize() == b""
+    assert isinstance(Empty.deserialize(Buffer()), Empty)
+
+
+@pytest.mark.parametrize("names", [("a", "a"), ("not valid",), ("class",)])
+def test_invalid_field_names(names: tuple[str, ...]):
+    with pytest.raises(ValueError):
+
+        class Invalid(SchemaSerializable):
+            __slots__ = ()
+
+            FIELDS: ClassVar[Sequence[Field]] = tuple(Field(name, VARINT) for name in names)
+
+
+def test_no_fields_abstract():
+    """Classes without fields or manually implemented methods should remain abstract."""
+
+    class Abstract(SchemaSerializable):
+        __slots__ = ()
+
+    with pytest.raises(TypeError, match="abstract"):
+        Abstract()  # type: ignore
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from mcproto.protocol.utils import from_twos_complement, to_twos_complement
+from mcproto.protocol.utils import from_twos_complement, to_twos_complement, varint_size, varlong_size
 
 # TODO: Consider adding tests for enforce_range
 
@@ -91,3 +91,39 @@ def test_from_twos_complement_negative(number: int, bits: int, expected_out: int
 def test_from_twos_complement_range(number: int, bits: int):
     with pytest.raises(ValueError, match="out of range"):
         from_twos_complement(number, bits)
+
+
+@pytest.mark.parametrize(
+    ("number", "expected_size"),
+    [
+        (0, 1),
+        (127, 1),
+        (128, 2),
+        (16383, 2),
+        (16384, 3),
+        (2147483647, 5),
+        (-1, 5),
+        (-2147483648, 5),
+    ],
+)
+def test_varint_size(number: int, expected_size: int):
+    assert varint_size(number) == expected_size
+
+
+@pytest.mark.parametrize(
+    ("number", "expected_size"),
+    [
+        (0, 1),
+        (2147483647, 5),
+        (9223372036854775807, 9),
+        (-1, 10),
+    ],
+)
+def test_varlong_size(number: int, expected_size: int):
+    assert varlong_size(number) == expected_size
+
+
+@pytest.mark.parametrize("number", [2147483648, -2147483649])
+def test_varint_size_range(number: int):
+    with pytest.raises(ValueError, match="out of range"):
+        varint_size(number)
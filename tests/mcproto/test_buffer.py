@@ -3,6 +3,7 @@ from __future__ import annotations
 import pytest
 
 from mcproto.buffer import Buffer
+from mcproto.protocol.base_io import StructFormat
 
 
 def test_write():
@@ -86,3 +87,193 @@ def test_remainig():
     assert buf.remaining == 4
     buf.clear()
     assert buf.remaining == 0
+
+
+def test_read_view():
+    """Reading a view should return the stored data without copying it."""
+    buf = Buffer(b"Something random")
+    with buf.read_view(9) as view:
+        assert isinstance(view, memoryview)
+        assert view == b"Something"
+        # The view points directly into the buffer's storage
+        buf[0] = ord("s")
+        assert view == b"something"
+    assert buf.read(7) == b" random"
+
+
+def test_read_view_no_data():
+    """Reading a view of more data than available should raise IOError and deplete the buffer."""
+    buf = Buffer(b"Blip")
+    with pytest.raises(IOError):
+        buf.read_view(len(buf) + 1)
+    assert buf.remaining == 0
+
+
+def test_read_view_prevents_resize():
+    """Buffer shouldn't be resizable while a view into it exists."""
+    buf = Buffer(b"abc")
+    view = buf.read_view(2)
+    with pytest.raises(BufferError):
+        buf.write(b"d")
+    view.release()
+    buf.write(b"d")
+    assert buf == bytearray(b"abcd")
+
+
+def test_read_into():
+    """Reading into a view should copy the stored data into it, and move the position accordingly."""
+    buf = Buffer(b"Something random")
+    target = bytearray(9)
+    buf.read_into(memoryview(target))
+    assert target == b"Something"
+    assert buf.read(7) == b" random"
+
+
+def test_read_into_no_data():
+    """Reading into a view bigger than the remaining data should raise IOError and deplete the buffer."""
+    buf = Buffer(b"Blip")
+    with pytest.raises(IOError):
+        buf.read_into(memoryview(bytearray(len(buf) + 1)))
+    assert buf.remaining == 0
+
+
+def test_read_utf():
+    """Reading UTF strings directly from the buffer should decode them properly."""
+    buf = Buffer()
+    buf.write_utf("नमस्ते")
+    buf.write_utf("hello")
+    assert buf.read_utf() == "नमस्ते"
+    assert buf.read_utf() == "hello"
+    # No views should be left behind after reading, so the buffer can still be written into
+    buf.write(b"foo")
+
+
+def test_read_value():
+    """Reading values should unpack them directly from the buffer, advancing the position."""
+    buf = Buffer(b"\x00\x05\xff")
+    assert buf.read_value(StructFormat.USHORT) == 5
+    assert buf.read_value(StructFormat.BYTE) == -1
+    assert buf.remaining == 0
+    with pytest.raises(IOError):
+        buf.read_value(StructFormat.UBYTE)
+
+
+def test_read_write_values():
+    """Multiple values written into the buffer should be read back the same."""
+    fmts = (StructFormat.DOUBLE, StructFormat.DOUBLE, StructFormat.DOUBLE, StructFormat.FLOAT, StructFormat.BOOL)
+    values = (1.5, -20.25, 1e10, 0.5, False)
+    buf = Buffer()
+    buf.write_values(fmts, values)
+    assert len(buf) == 8 * 3 + 4 + 1
+    assert buf.read_values(fmts) == values
+    assert buf.remaining == 0
+
+
+def test_read_values_no_data():
+    """Reading more values than available should raise IOError and deplete the buffer."""
+    buf = Buffer(b"\x00\x01\x02")
+    with pytest.raises(IOError):
+        buf.read_values((StructFormat.USHORT, StructFormat.USHORT))
+    assert buf.remaining == 0
+
+
+@pytest.mark.parametrize("number", [0, 1, 127, 128, 255, 16384, 2147483647, -1, -128, -2147483648])
+def test_read_write_varint(number: int):
+    """Varints written into the buffer should be read back the same."""
+    buf = Buffer()
+    buf.write_varint(number)
+    assert buf.read_varint() == number
+    assert buf.remaining == 0
+
+
+def test_read_varint_incomplete():
+    """Reading an incomplete varint should raise IOError and deplete the buffer."""
+    buf = Buffer(b"\x80\x80")
+    with pytest.raises(IOError):
+        buf.read_varint()
+    assert buf.remaining == 0
+
+
+def test_read_varint_out_of_range():
+    """Reading a varint bigger than 32 bits should raise IOError."""
+    buf = Buffer(b"\x80\x80\x80\x80\x10")
+    with pytest.raises(IOError):
+        buf.read_varint()
+
+
+@pytest.fixture(params=["python", "numpy"])
+def varint_array_mode(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the test with both the pure-python, and the NumPy vectorized varint array decoding."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr("mcproto.protocol.base_io._NUMPY_ARRAY_THRESHOLD", 0)
+    else:
+        monkeypatch.setattr("mcproto.protocol.base_io._NUMPY_ARRAY_THRESHOLD", float("inf"))
+    return request.param
+
+
+@pytest.mark.usefixtures("varint_array_mode")
+def test_read_write_varint_array():
+    """Varint arrays written into the buffer should be read back the same."""
+    values = [0, 1, 127, 128, 255, 16384, 2147483647, -1, -128, -2147483648] * 20
+    buf = Buffer()
+    buf.write_varint_array(values)
+    buf.write_varint_array([])
+    buf.write_varint(5)
+    assert buf.read_varint_array() == values
+    assert buf.read_varint_array() == []
+    assert buf.read_varint() == 5
+
+
+@pytest.mark.usefixtures("varint_array_mode")
+def test_read_write_varlong_array():
+    """Varlong arrays written into the buffer should be read back the same."""
+    values = [0, 1, 128, 2147483648, 9223372036854775807, -1, -9223372036854775808] * 20
+    buf = Buffer()
+    buf.write_varlong_array(values)
+    assert buf.read_varlong_array() == values
+    assert buf.remaining == 0
+
+
+@pytest.mark.usefixtures("varint_array_mode")
+@pytest.mark.parametrize(
+    ("data", "match"),
+    [
+        (bytes([3, 1, 2]), "more data than available"),  # Less items than declared
+        (bytes([2, 1, 128, 128]), "Data ended"),  # Last item is incomplete
+        (bytes([2, 1, 128, 128, 128, 128, 16]), "outside the range"),  # Item is bigger than 32 bits
+        (bytes([2, 1, 128, 128, 128, 128, 128, 1]), "longer than 5 bytes"),  # Item is too long
+        (bytes([2, 1, 128, 128, 128, 128, 128, 0]), "longer than 5 bytes"),  # Item is too long, even if it's zero
+        (bytes([1, 128, 128, 128, 128, 128, 128, 0]), "longer than 5 bytes"),  # Item is longer than all items can be
+        (bytes([2, 128, 128, 128, 128, 16, 128, 128, 128, 128, 128, 0]), "outside the range"),  # First error wins
+    ],
+)
+def test_read_varint_array_invalid(data: bytes, match: str):
+    """Reading an invalid varint array should raise IOError and deplete the buffer.
+
+    Both the pure-python and the NumPy decoding should produce the same error.
+    """
+    buf = Buffer(data)
+    with pytest.raises(IOError, match=match):
+        buf.read_varint_array()
+    assert buf.remaining == 0
+    # No views should be left behind, so the buffer can still be written into
+    buf.write(b"foo")
+
+
+def test_read_ascii():
+    """Reading ASCII strings should find their NULL terminators and skip over them."""
+    buf = Buffer(b"hostname\x00A Minecraft Server\x00\x00foo")
+    assert buf.read_ascii() == "hostname"
+    assert buf.read_ascii() == "A Minecraft Server"
+    assert buf.read_ascii() == ""
+    assert buf.read(3) == b"foo"
+
+
+def test_read_ascii_unterminated():
+    """Reading an ASCII string without a NULL terminator should raise IOError and deplete the buffer."""
+    buf = Buffer(b"foo\x00bar")
+    assert buf.read_ascii() == "foo"
+    with pytest.raises(IOError):
+        buf.read_ascii()
+    assert buf.remaining == 0
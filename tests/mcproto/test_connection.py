@@ -4,10 +4,11 @@ import asyncio
 import errno
 import socket
 from typing import Optional
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from mcproto.buffer import Buffer
 from mcproto.connection import TCPAsyncConnection, TCPSyncConnection
 from tests.helpers import CustomMockMixin
 from tests.mcproto.protocol.helpers import ReadFunctionAsyncMock, ReadFunctionMock, WriteFunctionMock
@@ -18,21 +19,41 @@ class MockSocket(CustomMockMixin, MagicMock):
 
     def __init__(self, *args, read_data: Optional[bytearray] = None, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.mock_add_spec(["_recv", "_send", "_closed"])
+        self.mock_add_spec(["_recv", "_send", "_closed", "_sendmsg_limit"])
         self._recv = ReadFunctionMock(combined_data=read_data)
         self._send = WriteFunctionMock()
         self._closed = False
+        self._sendmsg_limit: Optional[int] = None  # Maximum amount of bytes sent by a single sendmsg call
 
-    def send(self, data: bytearray) -> None:
+    def send(self, data: bytes) -> None:
         if self._closed:
             raise OSError(errno.EBADF, "Bad file descriptor")
         return self._send(data)
 
+    def sendall(self, data: bytes) -> None:
+        if self._closed:
+            raise OSError(errno.EBADF, "Bad file descriptor")
+        self._send(data)
+
+    def sendmsg(self, buffers: list[memoryview]) -> int:
+        if self._closed:
+            raise OSError(errno.EBADF, "Bad file descriptor")
+        data = b"".join(buffers)[: self._sendmsg_limit]
+        self._send(data)
+        return len(data)
+
     def recv(self, length: int) -> bytearray:
         if self._closed:
             raise OSError(errno.EBADF, "Bad file descriptor")
         return self._recv(length)
 
+    def recv_into(self, buffer: memoryview, nbytes: int = 0) -> int:
+        if self._closed:
+            raise OSError(errno.EBADF, "Bad file descriptor")
+        data = self._recv(nbytes or len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
     def close(self) -> None:
         self._closed = True
 
@@ -45,8 +66,9 @@ class MockStreamWriter(CustomMockMixin, MagicMock):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.mock_add_spec(["_white", "_closed"])
+        self.mock_add_spec(["_white", "_closed", "_drain"])
         self._write = WriteFunctionMock()
+        self._drain = AsyncMock()
         self._closed = False
 
     def write(self, data: bytearray) -> None:
@@ -54,6 +76,9 @@ class MockStreamWriter(CustomMockMixin, MagicMock):
             raise OSError(errno.EBADF, "Bad file descriptor")
         return self._write(data)
 
+    async def drain(self) -> None:
+        await self._drain()
+
     def close(self) -> None:
         self._closed = True
 
@@ -69,6 +94,12 @@ class MockStreamReader(CustomMockMixin, MagicMock):
     def read(self, length: int) -> bytearray:
         return self._read(length)
 
+    async def readexactly(self, length: int) -> bytes:
+        data = await self._read(length)  # type: ignore # AsyncMock returns a coroutine, despite the annotation
+        if len(data) < length:
+            raise asyncio.IncompleteReadError(bytes(data), length)
+        return bytes(data)
+
 
 class TestTCPSyncConnection:
     def make_connection(self, read_data: Optional[bytearray] = None) -> TCPSyncConnection[MockSocket]:
@@ -93,6 +124,23 @@ class TestTCPSyncConnection:
         with pytest.raises(IOError):
             conn.read(10)
 
+    def test_read_buffer(self):
+        data = bytearray([5]) + b"hello"
+        conn = self.make_connection(data)
+
+        buf = conn.read_buffer()
+
+        assert isinstance(buf, Buffer)
+        assert buf == b"hello"
+        conn.socket._recv.assert_read_everything()
+
+    def test_read_into_more_data_than_sent(self):
+        data = bytearray("test", "utf-8")
+        conn = self.make_connection(data)
+
+        with pytest.raises(IOError, match="got 4 bytes, but expected 10 bytes"):
+            conn.read_into(memoryview(bytearray(10)))
+
     def test_write(self):
         data = bytearray("hello", "utf-8")
         conn = self.make_connection()
@@ -122,6 +170,231 @@ class TestTCPSyncConnection:
                 pass
 
 
+class TestTCPSyncConnectionWriteBuffer:
+    def make_connection(self, autoflush: bool = True) -> TCPSyncConnection[MockSocket]:
+        return TCPSyncConnection(MockSocket(), autoflush=autoflush)
+
+    def test_cork(self):
+        conn = self.make_connection()
+
+        with conn.cork():
+            conn.write(b"foo")
+            conn.write(bytearray(b"bar"))
+            conn.socket._send.assert_not_called()
+
+        # All of the writes are sent together, with a single call
+        conn.socket._send.assert_called_once()
+        conn.socket._send.assert_has_data(bytearray(b"foobar"))
+
+    def test_cork_nested(self):
+        conn = self.make_connection()
+
+        with conn.cork():
+            conn.write(b"foo")
+            with conn.cork():
+                conn.write(b"bar")
+            conn.socket._send.assert_not_called()
+
+        conn.socket._send.assert_has_data(bytearray(b"foobar"))
+
+    def test_cork_copies_data(self):
+        """Buffered data shouldn't be affected by changes made to it after writing."""
+        conn = self.make_connection()
+        data = bytearray(b"foo")
+
+        with conn.cork():
+            conn.write(data)
+            data[:] = b"bar"
+
+        conn.socket._send.assert_has_data(bytearray(b"foo"))
+
+    def test_cork_exception(self):
+        """Data written within a cork context which raised an exception shouldn't be sent."""
+        conn = self.make_connection()
+
+        with pytest.raises(ZeroDivisionError), conn.cork():
+            conn.write(b"foo")
+            raise ZeroDivisionError
+
+        conn.socket._send.assert_not_called()
+
+    def test_cork_exception_later_writes(self):
+        """Data from a failed cork context shouldn't be sent out later, but data written before it should be."""
+        conn = self.make_connection(autoflush=False)
+
+        conn.write(b"foo")
+        with pytest.raises(ZeroDivisionError), conn.cork():
+            conn.write(b"partial")
+            raise ZeroDivisionError
+        conn.write(b"bar")
+        conn.flush()
+
+        conn.socket._send.assert_has_data(bytearray(b"foobar"))
+
+    def test_cork_exception_autoflush(self):
+        """Writes after a failed cork context should be sent right away, without the data from the failed context."""
+        conn = self.make_connection()
+
+        with pytest.raises(ZeroDivisionError), conn.cork():
+            conn.write(b"partial")
+            raise ZeroDivisionError
+        conn.write(b"foo")
+
+        conn.socket._send.assert_called_once()
+        conn.socket._send.assert_has_data(bytearray(b"foo"))
+
+    def test_manual_flush(self):
+        conn = self.make_connection(autoflush=False)
+
+        conn.write(b"foo")
+        with conn.cork():
+            conn.write(b"bar")
+        conn.socket._send.assert_not_called()
+
+        conn.flush()
+        conn.socket._send.assert_has_data(bytearray(b"foobar"))
+
+    def test_flush_partial_sends(self):
+        """Flushing should keep sending until all of the data was sent."""
+        conn = self.make_connection(autoflush=False)
+        conn.socket._sendmsg_limit = 2
+
+        for segment in (b"foo", b"b", b"", b"arbaz"):
+            conn.write(segment)
+        conn.flush()
+
+        conn.socket._send.assert_has_data(bytearray(b"foobarbaz"))
+        assert conn.socket._send.call_count == 5
+
+    def test_close_flushes(self):
+        conn = self.make_connection(autoflush=False)
+
+        conn.write(b"foo")
+        conn.close()
+
+        conn.socket._send.assert_has_data(bytearray(b"foo"))
+        assert conn.socket._closed is True
+
+
+class TestBufferedTCPSyncConnection:
+    def make_connection(
+        self, read_data: Optional[bytearray] = None, read_buffer_size: int = 8
+    ) -> TCPSyncConnection[MockSocket]:
+        if read_data is not None:
+            read_data = read_data.copy()
+
+        return TCPSyncConnection(MockSocket(read_data=read_data), read_buffer_size=read_buffer_size)
+
+    def test_read(self):
+        data = bytearray("hello", "utf-8")
+        conn = self.make_connection(data)
+
+        assert conn.read(2) == b"he"
+        assert conn.buffered == 3
+        assert conn.read(3) == b"llo"
+
+        # Everything was received into the read-ahead buffer at once
+        conn.socket._recv.assert_called_once()
+        conn.socket._recv.assert_read_everything()
+
+    def test_read_across_refills(self):
+        data = bytearray(b"0123456789abcdefghij")
+        conn = self.make_connection(data, read_buffer_size=8)
+
+        assert conn.read(6) == b"012345"
+        assert conn.read(6) == b"6789ab"
+        assert conn.read(8) == b"cdefghij"
+        conn.socket._recv.assert_read_everything()
+
+    def test_read_bigger_than_buffer(self):
+        data = bytearray(b"0123456789abcdefghij")
+        conn = self.make_connection(data, read_buffer_size=4)
+
+        assert conn.read(2) == b"01"
+        assert conn.read(18) == b"23456789abcdefghij"
+        conn.socket._recv.assert_read_everything()
+
+    @pytest.mark.parametrize("read_buffer_size", [4, 64])
+    def test_read_buffer(self, read_buffer_size: int):
+        """Reading a buffer should work both when it fits into the read-ahead buffer, and when it doesn't."""
+        data = bytearray([11]) + b"hello\x00world!"
+        conn = self.make_connection(data, read_buffer_size=read_buffer_size)
+
+        assert conn.read_buffer() == b"hello\x00world"
+        assert conn.read(1) == b"!"
+        conn.socket._recv.assert_read_everything()
+
+    @pytest.mark.parametrize("read_buffer_size", [2, 64])
+    def test_read_into_more_data_than_sent(self, read_buffer_size: int):
+        data = bytearray("test", "utf-8")
+        conn = self.make_connection(data, read_buffer_size=read_buffer_size)
+
+        with pytest.raises(IOError, match="but expected 10 bytes"):
+            conn.read_into(memoryview(bytearray(10)))
+
+    def test_read_more_data_than_sent(self):
+        data = bytearray("test", "utf-8")
+        conn = self.make_connection(data)
+
+        with pytest.raises(IOError):
+            conn.read(6)
+
+    def test_read_no_data(self):
+        conn = self.make_connection()
+
+        with pytest.raises(IOError, match="did not respond"):
+            conn.read(1)
+
+    def test_read_varint(self):
+        data = bytearray([0x01, 0x80, 0x80, 0x01, 0xFF, 0xFF, 0xFF, 0xFF, 0x0F, 0x05])
+        conn = self.make_connection(data, read_buffer_size=3)
+
+        assert conn.read_varint() == 1
+        assert conn.read_varint() == 16384
+        assert conn.read_varint() == -1
+        assert conn.read_varint() == 5
+        conn.socket._recv.assert_read_everything()
+
+    def test_read_varint_out_of_range(self):
+        conn = self.make_connection(bytearray([0x80, 0x80, 0x80, 0x80, 0x10]))
+
+        with pytest.raises(IOError):
+            conn.read_varint()
+
+    def test_read_ascii(self):
+        data = bytearray(b"hostname\x00A Minecraft Server\x00\x00foo")
+        conn = self.make_connection(data, read_buffer_size=5)
+
+        assert conn.read_ascii() == "hostname"
+        assert conn.read_ascii() == "A Minecraft Server"
+        assert conn.read_ascii() == ""
+        assert conn.read(3) == b"foo"
+        conn.socket._recv.assert_read_everything()
+
+    def test_read_bytearray(self):
+        data = bytearray([11]) + b"hello\x00world"
+        conn = self.make_connection(data, read_buffer_size=64)
+
+        assert conn.read_bytearray() == b"hello\x00world"
+        conn.socket._recv.assert_called_once()
+
+    def test_invalid_buffer_size(self):
+        with pytest.raises(ValueError):
+            self.make_connection(read_buffer_size=0)
+
+    def test_read_some(self):
+        data = bytearray(b"0123456789")
+        conn = self.make_connection(data, read_buffer_size=8)
+
+        assert conn.read(2) == b"01"
+        # Only the already buffered data is returned, without receiving more
+        assert conn.read_some(100) == b"234567"
+        assert conn.read_some(1) == b"8"
+        assert conn.read_some(100) == b"9"
+        with pytest.raises(IOError, match="did not respond"):
+            conn.read_some(1)
+
+
 class TestTCPAsyncConnection:
     def make_connection(
         self,
@@ -156,6 +429,39 @@ class TestTCPAsyncConnection:
 
         conn.writer._write.assert_has_data(data)
 
+    async def test_write_drains(self):
+        conn = self.make_connection()
+
+        await conn.write(bytearray(b"foo"))
+        await conn.write(bytearray(b"bar"))
+
+        assert conn.writer._drain.await_count == 2
+
+    async def test_cork(self):
+        """Writes within a cork context should only be drained once."""
+        conn = self.make_connection()
+
+        async with conn.cork():
+            await conn.write(bytearray(b"foo"))
+            async with conn.cork():
+                await conn.write(bytearray(b"bar"))
+            conn.writer._drain.assert_not_awaited()
+
+        conn.writer._drain.assert_awaited_once()
+        conn.writer._write.assert_has_data(bytearray(b"foobar"))
+
+    async def test_manual_flush(self):
+        conn = self.make_connection()
+        conn.autoflush = False
+
+        await conn.write(bytearray(b"foo"))
+        async with conn.cork():
+            await conn.write(bytearray(b"bar"))
+        conn.writer._drain.assert_not_awaited()
+
+        await conn.flush()
+        conn.writer._drain.assert_awaited_once()
+
     async def test_socket_close(self):
         conn = self.make_connection()
 
@@ -175,3 +481,125 @@ class TestTCPAsyncConnection:
         with pytest.raises(OSError):
             async with conn as _:
                 pass
+
+
+class TestTCPAsyncConnectionStreamReader:
+    """Tests for :class:`~mcproto.connection.TCPAsyncConnection`, using a real :class:`~asyncio.StreamReader`."""
+
+    def make_connection(self, read_data: bytes = b"", eof: bool = True, timeout: float = 3):
+        reader = asyncio.StreamReader()
+        reader.feed_data(read_data)
+        if eof:
+            reader.feed_eof()
+
+        return TCPAsyncConnection(reader, MockStreamWriter(), timeout)
+
+    async def test_read_buffered(self, monkeypatch: pytest.MonkeyPatch):
+        """Reading already buffered data shouldn't set up any timeouts."""
+        wait_for_mock = MagicMock(side_effect=AssertionError("wait_for shouldn't be called"))
+        monkeypatch.setattr(asyncio, "wait_for", wait_for_mock)
+        conn = self.make_connection(bytes([0x80, 0x80, 0x01, 0x05]) + b"hello")
+
+        assert await conn.read_varint() == 16384
+        assert await conn.read_bytearray() == b"hello"
+
+    async def test_read_not_buffered(self):
+        """Reading data which isn't yet buffered should wait for it."""
+        conn = self.make_connection(eof=False)
+
+        async def feed() -> None:
+            await asyncio.sleep(0)
+            conn.reader.feed_data(bytes([0x80]))
+            await asyncio.sleep(0)
+            conn.reader.feed_data(bytes([0x01, 0x03]) + b"foo")
+
+        task = asyncio.create_task(feed())
+        assert await conn.read_varint() == 128
+        assert await conn.read_bytearray() == b"foo"
+        await task
+
+    async def test_read_varint_out_of_range(self):
+        conn = self.make_connection(bytes([0x80, 0x80, 0x80, 0x80, 0x10]))
+
+        with pytest.raises(IOError):
+            await conn.read_varint()
+
+    async def test_read_buffer(self):
+        conn = self.make_connection(bytes([5]) + b"hello")
+
+        buf = await conn.read_buffer()
+
+        assert isinstance(buf, Buffer)
+        assert buf == b"hello"
+
+    async def test_read_buffer_incomplete(self):
+        conn = self.make_connection(bytes([5]) + b"he")
+
+        with pytest.raises(IOError, match="got 2 bytes, but expected 5 bytes"):
+            await conn.read_buffer()
+
+    async def test_read_some(self):
+        """Reading some data should return the already buffered data, or wait for at least some data."""
+        conn = self.make_connection(b"hello", eof=False)
+
+        assert await conn.read_some(3) == b"hel"
+        assert await conn.read_some(100) == b"lo"
+
+        asyncio.get_running_loop().call_soon(conn.reader.feed_data, b"world")
+        assert await conn.read_some(100) == b"world"
+
+        conn.reader.feed_eof()
+        with pytest.raises(IOError, match="did not respond"):
+            await conn.read_some(1)
+
+    async def test_read_more_data_than_sent(self):
+        conn = self.make_connection(b"test")
+
+        with pytest.raises(IOError, match="stopped responding"):
+            await conn.read(10)
+
+    async def test_read_timeout(self):
+        conn = self.make_connection(eof=False, timeout=0.01)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await conn.read(1)
+
+    async def test_deadline(self):
+        """All reads within the deadline context should share a single deadline."""
+        conn = self.make_connection(b"a", eof=False, timeout=3)
+
+        with pytest.raises(asyncio.TimeoutError), conn.deadline(0.01):
+            assert await conn.read(1) == b"a"
+            await conn.read(1)
+
+        # Deadline is gone once the context is exited
+        assert conn._deadline is None
+
+    async def test_write_backpressure(self):
+        """Writing should wait for the write buffer to drain, once it goes over the high water mark."""
+        sock, peer = socket.socketpair()
+        peer.setblocking(False)
+        reader, writer = await asyncio.open_connection(sock=sock)
+        conn = TCPAsyncConnection(reader, writer, 3, write_high_water=1024, write_low_water=0, autoflush=False)
+
+        try:
+            # Write more data than the socket buffers can hold, without the peer reading anything
+            data = b"x" * 1024 * 1024
+            await conn.write(data)
+            assert conn.write_buffer_size > 1024
+
+            flush_task = asyncio.create_task(conn.flush())
+            await asyncio.sleep(0.01)
+            assert not flush_task.done()
+
+            # Once the peer reads all of the data, the flush can finish
+            loop = asyncio.get_running_loop()
+            received = 0
+            while received < len(data):
+                received += len(await loop.sock_recv(peer, 65536))
+
+            await asyncio.wait_for(flush_task, timeout=1)
+            assert conn.write_buffer_size == 0
+        finally:
+            await conn.close()
+            peer.close()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import socket
+
+import pytest
+
+from mcproto.connection import TCPAsyncConnection, TCPSyncConnection
+from mcproto.encryption import AESCipher, CIPHER_BACKENDS, EncryptedAsyncConnection, EncryptedSyncConnection
+
+BACKEND_MODULES = {"cryptography": "cryptography", "pycryptodome": "Crypto"}
+INSTALLED_BACKENDS = [name for name, module in BACKEND_MODULES.items() if importlib.util.find_spec(module) is not None]
+
+pytestmark = pytest.mark.skipif(not INSTALLED_BACKENDS, reason="No cipher backend is installed.")
+
+SHARED_SECRET = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+
+
+@pytest.mark.parametrize("backend", INSTALLED_BACKENDS)
+def test_backend_cfb8(backend: str):
+    """Cipher backends should implement AES-128/CFB8 (NIST SP 800-38A, F.3.7 and F.3.8)."""
+    encrypt, decrypt = CIPHER_BACKENDS[backend](SHARED_SECRET, bytes(range(16)))
+    plaintext = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d")
+    ciphertext = bytes.fromhex("3b79424c9c0dd436bace9e0ed4586a4f32b9")
+
+    # The cipher is a stream, so the data can be processed in arbitrary chunks
+    assert encrypt(plaintext[:5]) + encrypt(plaintext[5:]) == ciphertext
+    assert decrypt(ciphertext[:11]) + decrypt(ciphertext[11:]) == plaintext
+
+
+def test_cipher_round_trip():
+    """Data encrypted by one side should be decrypted by the other side, using the same shared secret."""
+    client, server = AESCipher(SHARED_SECRET), AESCipher(SHARED_SECRET)
+    assert client.backend == INSTALLED_BACKENDS[0]
+
+    for data in (b"hello", b"", bytes(range(256)) * 10):
+        assert server.decrypt(client.encrypt(data)) == data
+        assert client.decrypt(server.encrypt(data)) == data
+
+
+def test_cipher_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown cipher backend"):
+        AESCipher(SHARED_SECRET, backend="foo")
+
+
+class CountingCipher(AESCipher):
+    """Cipher keeping track of the amount of encrypt/decrypt calls."""
+
+    __slots__ = ("encrypt_calls", "decrypt_calls")
+
+    def __init__(self, shared_secret: bytes):
+        super().__init__(shared_secret)
+        self.encrypt_calls = 0
+        self.decrypt_calls = 0
+
+    def encrypt(self, data: bytes) -> bytes:
+        self.encrypt_calls += 1
+        return super().encrypt(data)
+
+    def decrypt(self, data: bytes) -> bytes:
+        self.decrypt_calls += 1
+        return super().decrypt(data)
+
+
+def test_encrypted_sync_connection_write():
+    """Data written through an encrypted connection should be sent encrypted, all corked writes at once."""
+    sock, peer = socket.socketpair()
+    cipher = CountingCipher(SHARED_SECRET)
+    with EncryptedSyncConnection(TCPSyncConnection(sock), cipher) as conn, peer:
+        conn.write(b"hello")
+        with conn.cork():
+            conn.write(b" ")
+            conn.write(bytearray(b"world"))
+            # Written data is held back until the cork context is exited
+            assert conn._write_buffer
+
+        assert cipher.encrypt_calls == 2
+        data = peer.recv(1024)
+        assert data != b"hello world"
+        assert AESCipher(SHARED_SECRET).decrypt(data) == b"hello world"
+
+
+def test_encrypted_sync_connection_cork_exception():
+    """Data written within a failed cork context should be discarded, without affecting the cipher stream."""
+    sock, peer = socket.socketpair()
+    with EncryptedSyncConnection(TCPSyncConnection(sock), AESCipher(SHARED_SECRET)) as conn, peer:
+        conn.write(b"hello")
+        with pytest.raises(ZeroDivisionError), conn.cork():
+            conn.write(b"partial")
+            raise ZeroDivisionError
+        conn.write(b" world")
+
+        data = peer.recv(1024)
+        assert AESCipher(SHARED_SECRET).decrypt(data) == b"hello world"
+
+
+@pytest.mark.parametrize("read_buffer_size", [None, 16, 4096])
+def test_encrypted_sync_connection_read(read_buffer_size: "int | None"):
+    """Data read through an encrypted connection should be decrypted, in as few batches as possible."""
+    sock, peer = socket.socketpair()
+    cipher = CountingCipher(SHARED_SECRET)
+    conn = EncryptedSyncConnection(TCPSyncConnection(sock, read_buffer_size=read_buffer_size), cipher)
+    with conn, peer:
+        peer.sendall(AESCipher(SHARED_SECRET).encrypt(b"\xac\x02\x05hello" + b"x" * 100 + b"\x03bar" + b"foo"))
+
+        assert conn.read_varint() == 300
+        assert conn.read_utf() == "hello"
+        assert conn.read(100) == b"x" * 100
+        assert conn.read_buffer() == b"bar"
+        assert conn.read_some(100) == b"foo"
+        if read_buffer_size != 16:
+            # All of the data was already available, so it was decrypted at once
+            assert cipher.decrypt_calls == 1
+
+
+async def test_encrypted_async_connection():
+    """Data should be sent encrypted and read back decrypted through async encrypted connections."""
+    sock, peer = socket.socketpair()
+    reader, writer = await asyncio.open_connection(sock=sock)
+    peer_reader, peer_writer = await asyncio.open_connection(sock=peer)
+    conn = EncryptedAsyncConnection(TCPAsyncConnection(reader, writer, 3), AESCipher(SHARED_SECRET))
+    cipher = CountingCipher(SHARED_SECRET)
+    peer_conn = EncryptedAsyncConnection(TCPAsyncConnection(peer_reader, peer_writer, 3), cipher)
+
+    async with conn, peer_conn:
+        await conn.write_varint(300)
+        async with conn.cork():
+            await conn.write_utf("hello")
+            await conn.write_bytearray(b"x" * 100)
+            await conn.write_bytearray(b"bar")
+
+        assert await peer_conn.read_varint() == 300
+        assert await peer_conn.read_utf() == "hello"
+        assert await peer_conn.read_bytearray() == b"x" * 100
+        assert await peer_conn.read_buffer() == b"bar"
+        # The data was received in (at most) 2 chunks, one for each encrypted write
+        assert cipher.decrypt_calls <= 2
+
+
+async def test_encrypted_async_connection_cork_exception():
+    """Data written within a failed cork context should be discarded, without affecting the cipher stream."""
+    sock, peer = socket.socketpair()
+    reader, writer = await asyncio.open_connection(sock=sock)
+    peer_reader, peer_writer = await asyncio.open_connection(sock=peer)
+    conn = EncryptedAsyncConnection(TCPAsyncConnection(reader, writer, 3), AESCipher(SHARED_SECRET))
+    peer_conn = EncryptedAsyncConnection(TCPAsyncConnection(peer_reader, peer_writer, 3), AESCipher(SHARED_SECRET))
+
+    async with conn, peer_conn:
+        with pytest.raises(ZeroDivisionError):
+            async with conn.cork():
+                await conn.write_utf("partial")
+                raise ZeroDivisionError
+        await conn.write_utf("hello")
+
+        assert await peer_conn.read_utf() == "hello"
+
+
+def test_encrypted_connection_make_client():
+    """Encrypted connections can't be created directly, only by wrapping an existing connection."""
+    with pytest.raises(TypeError, match="Wrap an already established connection"):
+        EncryptedSyncConnection.make_client(("localhost", 25565), 1)
+
+
+async def test_encrypted_async_connection_make_client():
+    with pytest.raises(TypeError, match="Wrap an already established connection"):
+        await EncryptedAsyncConnection.make_client(("localhost", 25565), 1)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules which are costly to import, and are only needed for some of the functionality, so they shouldn't
+# get imported until that functionality is used
+LAZY_MODULES = [
+    "asyncio",
+    "asyncio_dgram",
+    "concurrent.futures",
+    "importlib.metadata",
+    "pkgutil",
+    "semantic_version",
+    "mcproto.packets.login.login",
+]
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run([sys.executable, *args], capture_output=True, check=True, text=True)  # noqa: S603
+
+
+def test_lazy_imports():
+    """Importing the packets package and building a packet map shouldn't import unrelated modules."""
+    code = (
+        "import sys;"
+        "from mcproto.packets import GameState, PacketDirection, generate_packet_map;"
+        "from mcproto.packets.status.ping import PingPong;"
+        "generate_packet_map(PacketDirection.CLIENTBOUND, GameState.STATUS);"
+        f"print([name for name in {LAZY_MODULES!r} if name in sys.modules])"
+    )
+    assert _run_python("-c", code).stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize(
+    ("module_name", "expected_modules"),
+    [
+        (
+            "mcproto.packets.status.ping",
+            [
+                "mcproto",
+                "mcproto.buffer",
+                "mcproto.packets",
+                "mcproto.packets.packet",
+                "mcproto.packets.status",
+                "mcproto.packets.status.ping",
+                "mcproto.protocol",
+                "mcproto.protocol.base_io",
+                "mcproto.protocol.schema",
+                "mcproto.utils",
+                "mcproto.utils.abc",
+            ],
+        ),
+        ("mcproto.utils.deprecation", ["mcproto", "mcproto.utils", "mcproto.utils.deprecation"]),
+    ],
+)
+def test_imported_modules(module_name: str, expected_modules: list[str]):
+    """Importing a single module should only import the mcproto modules it really depends on.
+
+    This checks the imported modules, rather than measuring the import time, which would be flaky.
+    """
+    code = f"import sys, {module_name}; print(sorted(name for name in sys.modules if name.startswith('mcproto')))"
+    assert _run_python("-c", code).stdout.strip() == repr(expected_modules)
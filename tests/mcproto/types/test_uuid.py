@@ -32,3 +32,10 @@ def test_serialize(data: str, expected_bytes: list[int]):
 def test_deserialize(input_bytes: list[int], data: str):
     uuid = UUID.deserialize(Buffer(input_bytes))
     assert str(uuid) == data
+
+
+def test_serialize_into():
+    """Serializing into an existing buffer should append to it, without touching the existing data."""
+    buf = Buffer(b"\x01\x02")
+    UUID("12345678-1234-5678-1234-567812345678").serialize_into(buf)
+    assert buf == bytearray.fromhex("0102") + bytearray.fromhex("12345678123456781234567812345678")
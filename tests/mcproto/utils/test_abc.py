@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import ClassVar
+
+import pytest
+
+from mcproto.utils.abc import RequiredParamsABCMixin
+
+
+class Base(RequiredParamsABCMixin):
+    _REQUIRED_CLASS_VARS: ClassVar[Sequence[str]] = ["FOO"]
+    _REQUIRED_CLASS_VARS_NO_MRO: ClassVar[Sequence[str]] = ["__slots__"]
+
+    __slots__ = ()
+
+
+class Concrete(Base):
+    FOO: ClassVar[int] = 1
+
+    __slots__ = ("x",)
+
+    def __init__(self, x: int):
+        self.x = x
+
+
+def test_instantiation():
+    assert Concrete(5).x == 5
+
+
+def test_missing_class_var():
+    with pytest.raises(TypeError, match="without defining 'FOO' classvar"):
+        Base()
+
+
+def test_missing_required_class_vars():
+    class NoRequired(RequiredParamsABCMixin):
+        __slots__ = ()
+
+    with pytest.raises(TypeError, match="without defining '_REQUIRED_CLASS_VARS' classvar"):
+        NoRequired()
+    with pytest.raises(TypeError, match="without defining '_REQUIRED_CLASS_VARS' classvar"):
+        RequiredParamsABCMixin()
+
+
+def test_missing_no_mro_class_var():
+    """Class vars required without MRO need to be defined on the class itself, even if a parent has them."""
+
+    class Unslotted(Concrete):
+        pass
+
+    with pytest.raises(TypeError, match=r"'__slots__' classvar explicitly \(__slots__ found in a subclass"):
+        Unslotted(5)
+
+    class Slotted(Unslotted):
+        __slots__ = ()
+
+    assert Slotted(5).x == 5
+
+
+def test_check_done_on_class_creation():
+    """The required class vars are checked once, on class creation, not on each instantiation."""
+
+    class Abstract(Base):
+        __slots__ = ()
+
+    Abstract.FOO = 1  # type: ignore
+    with pytest.raises(TypeError, match="without defining 'FOO' classvar"):
+        Abstract()